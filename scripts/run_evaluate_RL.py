@@ -1,5 +1,11 @@
 import sys
+import os
+import io
+import csv
 import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
 from pathlib import Path
 import numpy as np
 import time
@@ -12,10 +18,15 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from src.core.vehicle import Vehicle
 from src.learning.environment import AutonomousCarEnv
+from src.learning.numpy_policy import NumpyPolicy, export_policy
 from src.core.map import Map2D, CircleObstacle, RectangleObstacle, PolygonObstacle
 from src.utils.config_loader import ConfigLoader
 from src.simulation.renderer import Renderer 
+from src.simulation.recorder import TrajectoryRecorder, STATE_COLUMNS
 from src.planning.a_star import AStarPlanner
+from src.core.occupancy_grid import OccupancyGrid
+from src.utils.stats import wilson_interval, mean_interval
+from src.utils.sequential import StoppingRule, run_sequential, completed_future
 from src.control.pid_controller import PIDController
 
 class FogOfWarDriver:
@@ -28,12 +39,19 @@ class FogOfWarDriver:
         self.internal_map.set_start(*env.map_env.start)
         self.internal_map.set_goal(*self.final_goal)
         
+        # Lidar-built map: fixed-size log-odds grid, inflated by the same
+        # clearance the obstacle-based map used (0.25 m hit + safety margin).
+        # The planner searches its free mask directly.
+        self.occupancy = OccupancyGrid(
+            self.internal_map.width, self.internal_map.height, resolution=1.0,
+            inflation=self.internal_map.safety_margin + 0.25
+        )
+        self.planner = AStarPlanner(self.internal_map, occupancy=self.occupancy)
+        
         self.current_path_points = []
         self.current_wp_idx = 0
         self.replan_cooldown = 0
         self.replan_interval = 1
-        
-        self.detected_obstacles_cache = [] 
 
     def update(self, lidar_data: np.ndarray =None):
         vehicle_pos = self.env.vehicle.get_position()
@@ -56,33 +74,18 @@ class FogOfWarDriver:
         self._update_env_goal_for_rl(vehicle_pos)
 
     def _update_map_from_lidar(self, lidar_data: np.ndarray=None):
-        if lidar_data is None:
-            lidar_data, _ = self.env._get_observation()
-        
         pos = self.env.vehicle.get_position()
-        theta = self.env.vehicle.state.theta
-        num_rays = self.env.num_lidar_rays
+        angles = self.env.get_lidar_angles()
         max_range = self.env.lidar_range
-        
-        for i in range(num_rays):
-            dist_norm = lidar_data[i]
-            
-            if dist_norm < 1.0: 
-                real_dist = dist_norm * max_range
-                angle = theta + (2 * np.pi * i / num_rays)
-                
-                ox = pos[0] + real_dist * np.cos(angle)
-                oy = pos[1] + real_dist * np.sin(angle)
-                
-                if self._is_new_obstacle(ox, oy):
-                    self.internal_map.add_obstacle(CircleObstacle(ox, oy, radius=0.25))
-                    self.detected_obstacles_cache.append((ox, oy))
 
-    def _is_new_obstacle(self, x, y):
-        for (cx, cy) in self.detected_obstacles_cache:
-            if np.hypot(cx - x, cy - y) < 2.0:
-                return False
-        return True
+        if lidar_data is None:
+            # Same sensor model as the env, without building a full observation
+            lidar_data = self.env.map_env.raycast(
+                np.array(pos, dtype=float), angles, max_range,
+                method=self.env.lidar_method, resolution=self.env.lidar_resolution
+            ) / max_range
+        
+        self.occupancy.update(pos, angles, np.asarray(lidar_data) * max_range, max_range)
 
     def _is_path_blocked(self):
         if not self.current_path_points: return True
@@ -90,14 +93,12 @@ class FogOfWarDriver:
         check_range = min(len(self.current_path_points), self.current_wp_idx + 3)
         for i in range(self.current_wp_idx, check_range):
             p = self.current_path_points[i]
-            if self.internal_map.is_collision(p.x, p.y):
+            if self.occupancy.is_blocked(p.x, p.y):
                 return True
         return False
 
     def _replan(self, start_pos):
-        planner = AStarPlanner(self.internal_map, grid_resolution=1.0)
-        
-        path_obj = planner.plan(start_pos, self.final_goal, info=False)
+        path_obj = self.planner.plan(start_pos, self.final_goal, info=False)
         
         if path_obj:
             self.current_path_points = path_obj.points
@@ -142,13 +143,38 @@ def load_map(config: ConfigLoader) -> Map2D:
 
         return map_env
 
-def evaluate_episode(model, env: AutonomousCarEnv, render: bool = False, deterministic: bool = True) -> dict:
+def make_episode_recorder(env: AutonomousCarEnv) -> TrajectoryRecorder:
+    """Recorder with the vehicle state columns plus reward and LIDAR readings."""
+    recorder = TrajectoryRecorder(capacity=env.max_steps if env.max_steps < 100000 else 4096)
+    recorder.add_column('reward')
+    recorder.add_column('lidar', (env.num_lidar_rays,))
+    return recorder
+
+def episode_metadata(env: AutonomousCarEnv, driver: 'FogOfWarDriver') -> dict:
+    """Everything replay needs to draw an evaluated episode."""
+    return {
+        'source': 'rl_eval',
+        'dt': env.vehicle.dt,
+        'map': env.map_env.to_dict(),
+        'path': [(p.x, p.y) for p in driver.current_path_points],
+        'vehicle': vars(env.vehicle.config),
+        'lidar_angles': env.get_lidar_angles().tolist(),
+        'lidar_range': env.lidar_range,
+    }
+
+def evaluate_episode(model, env: AutonomousCarEnv, render: bool = False, deterministic: bool = True,
+                     recorder: TrajectoryRecorder = None, seed: int = None,
+                     random_heading: bool = False) -> dict:
     """
     Evaluate one episode using Hybrid Logic (A* + RL) without rendering.
+    
+    If recorder is given, every step (state, action, waypoint, reward,
+    LIDAR) is appended to it; see make_episode_recorder().
+    seed and random_heading are passed to env.reset().
     """
     driver = FogOfWarDriver(env)
 
-    obs, info = env.reset()
+    obs, info = env.reset(seed=seed, options={'random_heading': True} if random_heading else None)
     
     driver.update()
     
@@ -171,7 +197,7 @@ def evaluate_episode(model, env: AutonomousCarEnv, render: bool = False, determi
         lidar_data = info['lidar_data']
         
         episode_reward += reward
-        steps += 1
+        steps = env.steps  # vehicle updates (action_repeat per step)
         vehicle_corners = env.vehicle.get_corners()
         pos = env.vehicle.get_position()
         if (env.map_env.is_collision(vehicle_corners[0][0], vehicle_corners[0][1]) 
@@ -189,6 +215,25 @@ def evaluate_episode(model, env: AutonomousCarEnv, render: bool = False, determi
 
         if steps >= env.max_steps:
             done = True
+        
+        if recorder is not None:
+            state = env.vehicle.state
+            action_arr = np.asarray(action, dtype=float).reshape(-1)
+            waypoint = (None, None)
+            if driver.current_path_points and driver.current_wp_idx < len(driver.current_path_points):
+                wp = driver.current_path_points[driver.current_wp_idx]
+                waypoint = (wp.x, wp.y)
+            recorder.record(
+                step=steps - 1, time=steps * env.vehicle.dt,
+                x=state.x, y=state.y, theta=state.theta,
+                velocity=state.velocity, steering_angle=state.steering_angle,
+                acceleration_cmd=action_arr[0], steering_cmd=action_arr[1],
+                target_x=waypoint[0], target_y=waypoint[1],
+                reward=reward, lidar=lidar_data
+            )
+            if done:
+                recorder.add_event('goal_reached' if is_success else
+                                   ('collision' if steps < env.max_steps else 'timeout'))
             
         if render:
             env.render()
@@ -199,6 +244,7 @@ def evaluate_episode(model, env: AutonomousCarEnv, render: bool = False, determi
         'time': time.time() - start_time,
         'distance_to_goal': dist_to_final,
         'success': is_success,
+        'metadata': episode_metadata(env, driver) if recorder is not None else None,
     }
 
 def visualize_episode_with_renderer(model, env: AutonomousCarEnv, config: ConfigLoader):
@@ -237,7 +283,7 @@ def visualize_episode_with_renderer(model, env: AutonomousCarEnv, config: Config
     show_path = True
     show_internal_map = True
     
-    renderer.trajectory = [] 
+    renderer.clear_trajectory()
     
     running = True
     lidar_data, obs = env._get_observation()
@@ -273,7 +319,7 @@ def visualize_episode_with_renderer(model, env: AutonomousCarEnv, config: Config
             lidar_data = info['lidar_data']
             
             episode_reward += reward
-            steps += 1
+            steps = env.steps
             if terminated:
                 print(f"\nCRASH! Vehicle collided at step {steps}. Reward: {episode_reward:.2f}")
                 done = True
@@ -290,20 +336,16 @@ def visualize_episode_with_renderer(model, env: AutonomousCarEnv, config: Config
         frame_counter += 1
         if frame_counter % render_every_n_frames == 0:
             # DRAWING
-            renderer.clear()
-            renderer.draw_grid()
-            
             if env.map_env:
-                renderer.draw_map(env.map_env)
-                renderer.draw_start_goal(env.map_env.start, driver.final_goal)
+                renderer.draw_background(env.map_env, env.map_env.start, driver.final_goal)
+            else:
+                renderer.draw_background()
                 
             if show_internal_map:
-                for obs_obj in driver.internal_map.obstacles:
-                    if hasattr(obs_obj, 'radius'):
-                        cx, cy = renderer.world_to_screen(obs_obj.x, obs_obj.y)
-                        scale = (renderer.scale_x + renderer.scale_y) / 2
-                        rad = int(obs_obj.radius * scale)
-                        pygame.draw.circle(renderer.screen, (255, 50, 50), (cx, cy), rad, 1)
+                scale = (renderer.scale_x + renderer.scale_y) / 2
+                rad = max(int(driver.occupancy.resolution / 2 * scale), 1)
+                for cx, cy in renderer.world_to_screen_array(driver.occupancy.occupied_cells()):
+                    pygame.draw.circle(renderer.screen, (255, 50, 50), (int(cx), int(cy)), rad, 1)
 
             if show_path and driver.current_path_points:
                 points = [(p.x, p.y) for p in driver.current_path_points]
@@ -326,6 +368,11 @@ def visualize_episode_with_renderer(model, env: AutonomousCarEnv, config: Config
                 color=(0, 255, 255), 
                 alpha=40
             )
+            renderer.draw_lidar_rays(
+                env.vehicle.get_position(),
+                env.get_lidar_angles(),
+                lidar_data * env.lidar_range
+            )
             renderer.draw_trajectory()
             if env.vehicle:
                 renderer.draw_vehicle(env.vehicle)
@@ -342,13 +389,127 @@ def visualize_episode_with_renderer(model, env: AutonomousCarEnv, config: Config
 
     renderer.close()
 
-def evaluate_multiple_episodes(model, env: AutonomousCarEnv, n_episodes: int = 10) -> dict:
-    """Evaluate multiple episodes for statistics."""
+def visualize_episode_with_render_process(model, env: AutonomousCarEnv, config: ConfigLoader):
+    """
+    Same episode as visualize_episode_with_renderer, drawn by a separate process.
+
+    The loop only publishes each step into a shared-memory ring buffer, so
+    model.predict, mapping and replanning never wait for a frame; the render
+    process draws the newest state and drops the rest. Steps are paced at
+    the render frame rate (one step per frame, as in the in-process view).
+    """
+    from src.simulation.render_process import RenderProcess
+
+    sim_params = config.get_simulation_params()
+    target_fps = 60
+    driver = FogOfWarDriver(env)
+    view = RenderProcess(
+        env.map_env,
+        env.vehicle.config,
+        screen_width=sim_params.get('screen_width', 1200),
+        screen_height=sim_params.get('screen_height', 800),
+        caption="RL Agent (render process)",
+        target_fps=target_fps,
+        trail_length=sim_params.get('trail_length', 1000),
+        info_fields=('Reward', 'Real Dist'),
+        status_labels=('running', 'paused', 'done'),
+        num_rays=env.num_lidar_rays,
+        lidar_range=env.lidar_range,
+        path_color=(255, 255, 0),
+        target_color=(0, 255, 0)
+    )
+
+    print("Controls: SPACE=Pause, G=Grid, T=Trajectory, P=Path, I=Info, ESC=Quit")
+
+    obs, info = env.reset()
+    driver.update()
+    lidar_data, obs = env._get_observation()
+
+    done = False
+    episode_reward = 0
+    steps = 0
+    paused = False
+    running = True
+    shown_path = None
+    shown_map_version = -1
+    dist_to_final = float(np.linalg.norm(env.vehicle.get_position() - np.array(driver.final_goal)))
+
+    view.start()
+    next_tick = time.perf_counter()
+    while running:
+        for command in view.poll_commands():
+            if command == 'quit':
+                running = False
+            elif command == 'pause':
+                paused = not paused
+                print("Paused" if paused else "Resumed")
+
+        if not running or not view.is_open:
+            break
+        if not paused and not done:
+            lidar_data, obs = env._get_observation()
+            driver.update(lidar_data)
+            action, _ = model.predict(obs, deterministic=True)
+            obs, reward, terminated, truncated, info = env.step(action)
+            lidar_data = info['lidar_data']
+
+            episode_reward += reward
+            steps = env.steps
+            if terminated:
+                print(f"\nCRASH! Vehicle collided at step {steps}. Reward: {episode_reward:.2f}")
+                done = True
+            dist_to_final = float(np.linalg.norm(env.vehicle.get_position() - np.array(driver.final_goal)))
+            if dist_to_final < 3.0:
+                print(f"\nVICTORY! Reached Goal. Reward: {episode_reward:.2f}, Steps: {steps}")
+                done = True
+            elif steps >= env.max_steps:
+                done = True
+
+        # Overlays only travel when they change
+        if driver.current_path_points is not shown_path:
+            shown_path = driver.current_path_points
+            view.set_path([(p.x, p.y) for p in shown_path] if shown_path else None)
+        if driver.occupancy.version != shown_map_version:
+            shown_map_version = driver.occupancy.version
+            cells = driver.occupancy.occupied_cells()
+            view.set_circles(np.column_stack([cells, np.full(len(cells), driver.occupancy.resolution / 2)]))
+
+        target = None
+        if driver.current_path_points and driver.current_wp_idx < len(driver.current_path_points):
+            wp = driver.current_path_points[driver.current_wp_idx]
+            target = (wp.x, wp.y)
+        view.publish(steps, steps * env.vehicle.dt, env.vehicle.state,
+                     status=2 if done else int(paused), target=target,
+                     info=(episode_reward, dist_to_final),
+                     lidar=lidar_data * env.lidar_range)
+
+        next_tick += 1.0 / target_fps
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_tick = time.perf_counter()
+
+    view.close()
+
+def evaluate_multiple_episodes(model, env: AutonomousCarEnv, n_episodes: int = 10,
+                               record_dir: str = None) -> dict:
+    """
+    Evaluate multiple episodes for statistics.
+    
+    If record_dir is given, each episode is saved as a trajectory log
+    (episode_XXX.npz) that run_replay.py can play back.
+    """
     print(f"\nEvaluating over {n_episodes} episodes...")
     all_stats = []
+    recorder = make_episode_recorder(env) if record_dir else None
     
     for episode in range(n_episodes):
-        stats = evaluate_episode(model, env, render=False)
+        if recorder is not None:
+            recorder.clear()
+        stats = evaluate_episode(model, env, render=False, recorder=recorder)
+        if recorder is not None:
+            recorder.save(str(Path(record_dir) / f"episode_{episode:03d}.npz"), stats.pop('metadata'))
         all_stats.append(stats)
         print(f"  Ep {episode+1}: Reward={stats['reward']:.2f}, Steps={stats['steps']}, Success={'✓' if stats['success'] else '✗'}")
     
@@ -371,13 +532,317 @@ def print_evaluation_summary(stats: dict):
     print(f"Reward: {stats['mean_reward']:.2f} ± {stats['std_reward']:.2f}")
     print("=" * 70)
 
+def make_env(config: ConfigLoader, map_env: Map2D) -> AutonomousCarEnv:
+    """Evaluation env on map_env with the vehicle and sensor settings of config."""
+    sim_params = config.get_simulation_params()
+    vehicle = Vehicle(
+        config.get_vehicle_config(),
+        dt=sim_params.get('dt', 0.1),
+        integrator=sim_params.get('integrator', 'euler'),
+        substeps=sim_params.get('substeps', 1)
+    )
+    return AutonomousCarEnv(
+        map_env=map_env,
+        vehicle=vehicle,
+        max_steps=config.get("environment.max_steps", 10000),
+        num_lidar_rays=config.get("environment.num_lidar_rays", 16),
+        render_mode=None,
+        lidar_method=config.get("environment.lidar_method", "exact"),
+        lidar_resolution=config.get("environment.lidar_resolution", 0.5),
+        action_repeat=config.get("environment.action_repeat", 1)
+    )
+
+def load_model(model_path: str, algorithm: str):
+    """
+    Load a trained model on the CPU.
+
+    An .npz (see export_policy) is loaded as a NumpyPolicy, which needs
+    no torch; anything else as a Stable-Baselines3 model.
+    """
+    if Path(model_path).suffix == '.npz':
+        return NumpyPolicy.load(model_path)
+    if algorithm == 'ppo':
+        from stable_baselines3 import PPO
+        return PPO.load(model_path, device='cpu')
+    elif algorithm == 'sac':
+        from stable_baselines3 import SAC
+        return SAC.load(model_path, device='cpu')
+    raise ValueError(f"Unknown algorithm: {algorithm}")
+
+def collect_maps(paths) -> list:
+    """Map YAML files from a list of files and directories (default: maps/yaml)."""
+    maps = []
+    for p in paths or [Path(__file__).resolve().parent.parent / "maps" / "yaml"]:
+        p = Path(p)
+        if p.is_dir():
+            maps.extend(sorted(str(f) for f in p.glob("*.yaml")))
+        else:
+            maps.append(str(p))
+    return maps
+
+@dataclass
+class EvalJob:
+    """One episode of a parallel evaluation."""
+    map_file: str
+    seed: int
+    episode: int
+
+    @property
+    def episode_seed(self) -> int:
+        # Independent stream per (seed, episode)
+        return int(np.random.SeedSequence([self.seed, self.episode]).generate_state(1)[0])
+
+# Per worker process: model, config and one env per map (see _init_eval_worker)
+_EVAL_WORKER = {}
+
+def _init_eval_worker(model_path: str, algorithm: str, config_path: str, options: dict):
+    if Path(model_path).suffix != '.npz':
+        # One torch thread per worker: the pool provides the parallelism
+        import torch
+        torch.set_num_threads(1)
+    _EVAL_WORKER['model'] = load_model(model_path, algorithm)
+    _EVAL_WORKER['config'] = ConfigLoader(config_path)
+    _EVAL_WORKER['options'] = options
+    _EVAL_WORKER['envs'] = {}
+
+def _run_eval_job(job: EvalJob) -> dict:
+    options = _EVAL_WORKER['options']
+    row = {'map': job.map_file, 'seed': job.seed, 'episode': job.episode}
+    try:
+        entry = _EVAL_WORKER['envs'].get(job.map_file)
+        if entry is None:
+            map_env = Map2D.load_from_yaml(job.map_file)
+            env = make_env(_EVAL_WORKER['config'], map_env)
+            recorder = make_episode_recorder(env) if options.get('record_dir') else None
+            # The driver moves map_env.goal along its path; keep the real one
+            entry = _EVAL_WORKER['envs'][job.map_file] = (env, map_env.goal, recorder)
+        env, goal, recorder = entry
+        env.map_env.set_goal(*goal)
+
+        episode_seed = job.episode_seed
+        np.random.seed(episode_seed % 2**32)
+        if not options.get('deterministic', True):
+            import torch
+            torch.manual_seed(episode_seed)
+        if recorder is not None:
+            recorder.clear()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = evaluate_episode(_EVAL_WORKER['model'], env,
+                                     deterministic=options.get('deterministic', True),
+                                     recorder=recorder, seed=episode_seed,
+                                     random_heading=options.get('random_heading', False))
+        if recorder is not None:
+            name = f"{Path(job.map_file).stem}_s{job.seed}_e{job.episode:03d}.npz"
+            recorder.save(str(Path(options['record_dir']) / name), stats.pop('metadata'))
+        stats.pop('metadata', None)
+        row.update(stats)
+        row['error'] = ''
+    except Exception as e:
+        row.update({'reward': float('nan'), 'steps': 0, 'success': False,
+                    'error': f"{type(e).__name__}: {e}"})
+    return row
+
+def evaluate_parallel(model_path: str, algorithm: str, config_path: str, maps: list,
+                      episodes: int = 10, seeds: int = 1, workers: int = 0,
+                      deterministic: bool = True, random_heading: bool = False,
+                      record_dir: str = None) -> list:
+    """
+    Evaluate every (map, seed, episode) job in a process pool.
+
+    Each worker loads the model once (single-threaded torch) and keeps one
+    env per map it has seen, so a job only pays for its episode. Episodes
+    start at heading 0 like training; they differ only through the
+    per-episode seed, i.e. with a stochastic policy or random_heading. With
+    a deterministic policy and random_heading off, every episode on a map is
+    the same rollout, so only one is run per map (with a warning).
+
+    Args:
+        model_path: Saved PPO/SAC model
+        algorithm: "ppo" or "sac"
+        config_path: RL config (vehicle, sensors)
+        maps: Map YAML files
+        episodes: Episodes per (map, seed)
+        seeds: Number of seeds per map (0..N-1)
+        workers: Worker processes (0 = all cores, 1 = current process)
+        deterministic: Deterministic policy actions
+        random_heading: Random initial heading per episode (default: heading 0)
+        record_dir: Save one trajectory log per episode here
+
+    Returns:
+        Result rows (map, seed, episode, reward, steps, success, ...) in job order
+    """
+    if deterministic and not random_heading and seeds * episodes > 1:
+        print("Warning: deterministic policy with fixed heading repeats one rollout; "
+              "running 1 episode per map (use --stochastic or --random-heading to sample)")
+        seeds, episodes = 1, 1
+    jobs = [EvalJob(str(m), seed, episode)
+            for m in maps for seed in range(seeds) for episode in range(episodes)]
+    options = {'deterministic': deterministic, 'random_heading': random_heading,
+               'record_dir': record_dir}
+    init_args = (model_path, algorithm, config_path, options)
+    if workers is None or workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, max(len(jobs), 1))
+    print(f"\nEvaluating {len(jobs)} episodes ({len(maps)} maps x {seeds} seeds x "
+          f"{episodes} episodes) on {workers} workers...")
+
+    rows = [None] * len(jobs)
+    if workers == 1:
+        _init_eval_worker(*init_args)
+        for i, job in enumerate(jobs):
+            rows[i] = _run_eval_job(job)
+            _print_eval_progress(i + 1, len(jobs), rows[i])
+        return rows
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_eval_worker,
+                             initargs=init_args) as pool:
+        futures = {pool.submit(_run_eval_job, job): i for i, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            rows[i] = future.result()
+            _print_eval_progress(done, len(jobs), rows[i])
+    return rows
+
+def evaluate_adaptive(model_path: str, algorithm: str, config_path: str, maps: list,
+                      rule: StoppingRule, workers: int = 0, deterministic: bool = True,
+                      random_heading: bool = False, record_dir: str = None) -> list:
+    """
+    Like evaluate_parallel, but each map gets only as many episodes as its
+    stopping rule needs (between rule.min_trials and rule.max_trials).
+
+    Episode i of a map always uses EvalJob(map, 0, i), so the kept
+    episodes do not depend on the worker count. A deterministic policy
+    with a fixed heading runs one episode per map, as in evaluate_parallel.
+
+    Returns:
+        Kept result rows, grouped by map
+    """
+    if deterministic and not random_heading and rule.max_trials > 1:
+        print("Warning: deterministic policy with fixed heading repeats one rollout; "
+              "running 1 episode per map (use --stochastic or --random-heading to sample)")
+        rule = replace(rule, min_trials=1, max_trials=1)
+    options = {'deterministic': deterministic, 'random_heading': random_heading,
+               'record_dir': record_dir}
+    init_args = (model_path, algorithm, config_path, options)
+    if workers is None or workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, max(len(maps) * rule.max_trials, 1))
+    print(f"\nAdaptive evaluation on {len(maps)} maps: stop when the {rule.metric} interval "
+          f"is <= {rule.width} wide ({rule.min_trials}-{rule.max_trials} episodes per map, "
+          f"{workers} workers)...")
+
+    completed = []
+    max_total = len(maps) * rule.max_trials
+
+    def report(map_file, row):
+        completed.append(row)
+        _print_eval_progress(len(completed), f"<={max_total}", row)
+
+    if workers == 1:
+        _init_eval_worker(*init_args)
+        kept = run_sequential(maps, lambda m, i: completed_future(_run_eval_job, EvalJob(m, 0, i)),
+                              rule, on_result=report)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_eval_worker,
+                                 initargs=init_args) as pool:
+            kept = run_sequential(maps, lambda m, i: pool.submit(_run_eval_job, EvalJob(m, 0, i)),
+                                  rule, max_in_flight=2 * workers, on_result=report)
+
+    rows = [row for m in maps for row in kept[m]]
+    print(f"Kept {len(rows)} of {len(completed)} episodes run (max {max_total})")
+    return rows
+
+def _print_eval_progress(done: int, total, row: dict):
+    status = "error" if row.get('error') else ('✓' if row['success'] else '✗')
+    print(f"  [{done}/{total}] {Path(row['map']).stem} seed={row['seed']} ep={row['episode']}: "
+          f"Reward={row['reward']:.2f}, Steps={row['steps']}, Success={status}")
+
+def summarize_by_map(rows: list, confidence: float = 0.95) -> dict:
+    """
+    Per-map success rate (Wilson interval), mean reward and mean steps
+    (Student-t intervals). Errored episodes are counted separately.
+
+    Returns:
+        Dictionary map -> {episodes, errors, success_rate, success_ci,
+        reward, reward_ci, steps, steps_ci}
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(row['map'], []).append(row)
+
+    summary = {}
+    for map_file, group in groups.items():
+        valid = [r for r in group if not r.get('error')]
+        successes = sum(bool(r['success']) for r in valid)
+        reward, reward_lo, reward_hi = mean_interval([r['reward'] for r in valid], confidence)
+        steps, steps_lo, steps_hi = mean_interval([r['steps'] for r in valid], confidence)
+        summary[map_file] = {
+            'episodes': len(valid),
+            'errors': len(group) - len(valid),
+            'success_rate': successes / len(valid) if valid else float('nan'),
+            'success_ci': wilson_interval(successes, len(valid), confidence),
+            'reward': reward,
+            'reward_ci': (reward_lo, reward_hi),
+            'steps': steps,
+            'steps_ci': (steps_lo, steps_hi),
+        }
+    return summary
+
+def print_map_summary(summary: dict, confidence: float = 0.95):
+    print("\n" + "=" * 70)
+    print(f"EVALUATION SUMMARY PER MAP ({confidence * 100:.0f}% intervals)")
+    print("=" * 70)
+    print(f"{'Map':<14} {'Eps':>4} {'Success':>20} {'Reward':>24} {'Steps':>18}")
+    for map_file, s in summary.items():
+        success = (f"{s['success_rate'] * 100:5.1f}% [{s['success_ci'][0] * 100:3.0f},"
+                   f"{s['success_ci'][1] * 100:4.0f}]")
+        reward = f"{s['reward']:8.1f} [{s['reward_ci'][0]:6.0f},{s['reward_ci'][1]:6.0f}]"
+        steps = f"{s['steps']:6.0f} [{s['steps_ci'][0]:4.0f},{s['steps_ci'][1]:5.0f}]"
+        errors = f"  ({s['errors']} errors)" if s['errors'] else ""
+        print(f"{Path(map_file).stem:<14} {s['episodes']:>4} {success:>20} {reward:>24} {steps:>18}{errors}")
+    print("=" * 70)
+
+def write_eval_results(rows: list, output_path: str):
+    """Write one CSV row per episode."""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fields = ['map', 'seed', 'episode', 'success', 'reward', 'steps', 'distance_to_goal', 'time', 'error']
+    with open(output_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Results saved to {output_path}")
+
 def main():
     parser = argparse.ArgumentParser(description='Evaluate trained RL agent')
-    parser.add_argument('--model', type=str, default='trained_models/ppo/ppo_final.zip', help='Path to trained model')
+    parser.add_argument('--model', type=str, default='trained_models/ppo/ppo_final.zip',
+                        help='Path to trained model (.zip, or .npz exported with --export-numpy)')
     parser.add_argument('--config', type=str, default='config/RL_config.yaml', help='Config path')
     parser.add_argument('--algorithm', type=str, default='ppo', choices=['ppo', 'sac'])
     parser.add_argument('--episodes', type=int, default=10, help='Number of evaluation episodes')
     parser.add_argument('--visualize', action='store_true', help='Visualize with Renderer')
+    parser.add_argument('--render-process', action='store_true', help='With --visualize, draw in a separate process')
+    parser.add_argument('--record', type=str, default=None, help='Directory to save per-episode trajectory logs (.npz)')
+    parser.add_argument('--maps', type=str, nargs='*', default=None,
+                        help='Evaluate on these map files/directories in parallel (no value = maps/yaml)')
+    parser.add_argument('--seeds', type=int, default=1, help='With --maps: seeds per map (episodes per seed = --episodes)')
+    parser.add_argument('--workers', type=int, default=0, help='With --maps: worker processes (0 = all cores)')
+    parser.add_argument('--stochastic', action='store_true', help='Sample actions instead of deterministic ones')
+    parser.add_argument('--random-heading', action='store_true',
+                        help='With --maps: random start heading per episode (default: heading 0, as in training; '
+                             'episodes then differ only through the seed with --stochastic)')
+    parser.add_argument('--output', type=str, default=None, help='With --maps: per-episode results CSV')
+    parser.add_argument('--export-numpy', type=str, nargs='?', const='', default=None,
+                        help='Export the model to a NumPy .npz (default: next to the model) and exit')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='With --maps: stop each map once its interval is narrow enough (--max-episodes = maximum)')
+    parser.add_argument('--max-episodes', type=int, default=200, help='Adaptive: maximum episodes per map')
+    parser.add_argument('--ci-metric', type=str, default='wilson', choices=['wilson', 'bayes', 'reward'],
+                        help='Adaptive: success-rate interval (wilson, bayes) or mean-reward CI')
+    parser.add_argument('--ci-width', type=float, default=0.2,
+                        help='Adaptive: target interval width (success fraction, or reward units)')
+    parser.add_argument('--min-episodes', type=int, default=5, help='Adaptive: episodes before the first check')
     
     args = parser.parse_args()
     config = ConfigLoader(args.config)
@@ -391,30 +856,51 @@ def main():
             print(f"Error: Model not found at {args.model}")
             return 1
         
-        map_env = load_map(config)
+        if args.export_numpy is not None:
+            export_policy(args.model, args.export_numpy or None, args.algorithm)
+            return 0
         
-        vehicle = Vehicle(config.get_vehicle_config())
+        if args.stochastic and Path(args.model).suffix == '.npz':
+            print("Error: NumPy policies are deterministic only (drop --stochastic)")
+            return 1
         
-        env = AutonomousCarEnv(
-            map_env=map_env,
-            vehicle=vehicle,
-            max_steps=10000,
-            num_lidar_rays=16,
-            render_mode=None 
-        )
+        if args.maps is not None and not args.visualize:
+            if args.adaptive:
+                rule = StoppingRule(
+                    metric='mean' if args.ci_metric == 'reward' else args.ci_metric,
+                    width=args.ci_width,
+                    field='reward' if args.ci_metric == 'reward' else 'success',
+                    min_trials=args.min_episodes,
+                    max_trials=args.max_episodes
+                )
+                rows = evaluate_adaptive(
+                    args.model, args.algorithm, args.config, collect_maps(args.maps), rule,
+                    workers=args.workers, deterministic=not args.stochastic,
+                    random_heading=args.random_heading, record_dir=args.record
+                )
+            else:
+                rows = evaluate_parallel(
+                    args.model, args.algorithm, args.config, collect_maps(args.maps),
+                    episodes=args.episodes, seeds=args.seeds, workers=args.workers,
+                    deterministic=not args.stochastic, random_heading=args.random_heading,
+                    record_dir=args.record
+                )
+            if args.output:
+                write_eval_results(rows, args.output)
+            print_map_summary(summarize_by_map(rows))
+            return 0
+        
+        env = make_env(config, load_map(config))
         
         print(f"Loading model: {args.model}")
-        if args.algorithm == 'ppo':
-            from stable_baselines3 import PPO
-            model = PPO.load(args.model)
-        elif args.algorithm == 'sac':
-            from stable_baselines3 import SAC
-            model = SAC.load(args.model)
+        model = load_model(args.model, args.algorithm)
             
-        if args.visualize:
+        if args.visualize and args.render_process:
+            visualize_episode_with_render_process(model, env, config)
+        elif args.visualize:
             visualize_episode_with_renderer(model, env, config)
         else:
-            stats = evaluate_multiple_episodes(model, env, n_episodes=args.episodes)
+            stats = evaluate_multiple_episodes(model, env, n_episodes=args.episodes, record_dir=args.record)
             print_evaluation_summary(stats)
             
         env.close()
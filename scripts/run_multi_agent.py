@@ -0,0 +1,107 @@
+import sys
+import argparse
+from pathlib import Path
+import warnings
+
+warnings.filterwarnings(
+    "ignore",
+    category=UserWarning,
+    module="pygame.pkgdata"
+)
+
+
+def setup_pythonpath():
+    """
+    Ensure project root is in PYTHONPATH
+    """
+    project_root = Path(__file__).resolve().parent.parent
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    return project_root
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Multi-Agent Simulator Runner")
+
+    parser.add_argument(
+        "--config",
+        type=str,
+        default='config/default_config.yaml',
+        help="Path to YAML config file"
+    )
+
+    parser.add_argument(
+        "--num-agents",
+        type=int,
+        default=None,
+        help="Fleet size (default: multi_agent.num_agents)"
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed for random start/goal spawning"
+    )
+
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=2000,
+        help="Maximum simulation steps"
+    )
+
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=None,
+        help="Override target FPS"
+    )
+
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run without display and print a summary"
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each phase of the loop and print p50/p95/max at exit"
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    setup_pythonpath()
+
+    from src.utils.config_loader import ConfigLoader
+    from src.simulation.multi_agent import MultiAgentSimulator
+
+    config = ConfigLoader(args.config)
+    if args.profile:
+        config.update("simulation.profile", True)
+
+    sim = MultiAgentSimulator(config=config, num_agents=args.num_agents,
+                              headless=args.headless, seed=args.seed)
+
+    if args.headless:
+        result = sim.run_headless(max_steps=args.max_steps)
+        sim.print_stats()
+        print(f"Wall time: {result.timings['wall_time']:.2f}s "
+              f"(planning {result.timings['planning_wall_time']:.2f}s, "
+              f"{result.timings['agent_steps_per_second']:.0f} agent-steps/s)")
+        return
+
+    if not sim.plan_path():
+        print("Path planning failed")
+        sys.exit(1)
+
+    fps = args.fps or sim.sim_params.get("fps", 60)
+    sim.run(max_steps=args.max_steps, target_fps=fps)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import sys
+import argparse
+from pathlib import Path
+import warnings
+
+warnings.filterwarnings(
+    "ignore",
+    category=UserWarning,
+    module="pygame.pkgdata"
+)
+
+
+def setup_pythonpath():
+    """
+    Ensure project root is in PYTHONPATH
+    """
+    project_root = Path(__file__).resolve().parent.parent
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    return project_root
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Trajectory Replay")
+
+    parser.add_argument(
+        "--log",
+        type=str,
+        required=True,
+        help="Recorded trajectory (.npz from --record)"
+    )
+
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=40,
+        help="Playback frame rate"
+    )
+
+    parser.add_argument(
+        "--video", "--gif",
+        dest="video",
+        type=str,
+        default=None,
+        help="Export to a video (.gif, .mp4 or .avi) instead of interactive replay"
+    )
+
+    parser.add_argument(
+        "--every",
+        type=int,
+        default=2,
+        help="Video: keep one frame out of every N"
+    )
+
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=800,
+        help="Window size in pixels"
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    setup_pythonpath()
+
+    from src.simulation.recorder import TrajectoryLog
+    from src.simulation.replay import ReplayViewer
+
+    log = TrajectoryLog.load(args.log)
+    print(f"Loaded {log}")
+
+    viewer = ReplayViewer(log, screen_width=args.size, screen_height=args.size,
+                          offscreen=bool(args.video))
+
+    if args.video:
+        viewer.save_video(args.video, every=args.every, fps=args.fps)
+    else:
+        viewer.run(fps=args.fps)
+
+
+if __name__ == "__main__":
+    main()
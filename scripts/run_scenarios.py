@@ -0,0 +1,200 @@
+import sys
+import argparse
+from pathlib import Path
+
+
+def setup_pythonpath():
+    """
+    Ensure project root is in PYTHONPATH
+    """
+    project_root = Path(__file__).resolve().parent.parent
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    return project_root
+
+
+def parse_args():
+    parser = argparse.ArgumentParser("Scenario Matrix Runner")
+
+    parser.add_argument(
+        "--config",
+        type=str,
+        default='config/default_config.yaml',
+        help="Base YAML config (planner/controller parameters)"
+    )
+
+    parser.add_argument(
+        "--maps",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Map YAML files or directories (default: maps/yaml)"
+    )
+
+    parser.add_argument(
+        "--planners",
+        type=str,
+        nargs="+",
+        default=["astar", "rrt"],
+        help="Planners: astar rrt rrt_star"
+    )
+
+    parser.add_argument(
+        "--controllers",
+        type=str,
+        nargs="+",
+        default=["pid", "pure_pursuit", "adaptive_pure_pursuit"],
+        help="Controllers: pid pure_pursuit adaptive_pure_pursuit"
+    )
+
+    parser.add_argument(
+        "--seeds",
+        type=int,
+        default=1,
+        help="Number of seeds per combination (0..N-1)"
+    )
+
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Run seeds per combination until its success interval is narrow enough (--max-seeds = maximum)"
+    )
+
+    parser.add_argument(
+        "--max-seeds",
+        type=int,
+        default=100,
+        help="Adaptive: maximum seeds per combination"
+    )
+
+    parser.add_argument(
+        "--ci-metric",
+        type=str,
+        default="wilson",
+        choices=["wilson", "bayes"],
+        help="Adaptive: Wilson score or Beta-posterior interval on the success rate"
+    )
+
+    parser.add_argument(
+        "--ci-width",
+        type=float,
+        default=0.2,
+        help="Adaptive: target interval width"
+    )
+
+    parser.add_argument(
+        "--min-seeds",
+        type=int,
+        default=5,
+        help="Adaptive: seeds before the first check"
+    )
+
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=1000,
+        help="Maximum simulation steps per run"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Worker processes (0 = all cores)"
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="logs/scenarios.csv",
+        help="Output file (.csv, .jsonl or .parquet)"
+    )
+
+    parser.add_argument(
+        "--video-dir",
+        type=str,
+        default=None,
+        help="Render every run off-screen and save one video per scenario here"
+    )
+
+    parser.add_argument(
+        "--video-format",
+        type=str,
+        default="mp4",
+        choices=["mp4", "avi", "gif"],
+        help="Video container"
+    )
+
+    parser.add_argument(
+        "--video-every",
+        type=int,
+        default=2,
+        help="Keep one frame out of every N steps"
+    )
+
+    parser.add_argument(
+        "--video-size",
+        type=int,
+        nargs=2,
+        default=None,
+        metavar=("WIDTH", "HEIGHT"),
+        help="Video resolution (default: screen size from the config)"
+    )
+
+    return parser.parse_args()
+
+
+def collect_maps(paths, project_root):
+    maps = []
+    for p in paths or [project_root / "maps" / "yaml"]:
+        p = Path(p)
+        if p.is_dir():
+            maps.extend(sorted(str(f) for f in p.glob("*.yaml")))
+        else:
+            maps.append(str(p))
+    return maps
+
+
+def main():
+    args = parse_args()
+    project_root = setup_pythonpath()
+
+    from src.simulation.scenarios import (
+        build_scenario_matrix, run_scenario_matrix, run_scenario_matrix_adaptive,
+        write_results, print_matrix_summary
+    )
+    from src.simulation.video import VideoSettings
+    from src.utils.sequential import StoppingRule
+
+    maps = collect_maps(args.maps, project_root)
+    scenarios = build_scenario_matrix(
+        maps=maps,
+        planners=args.planners,
+        controllers=args.controllers,
+        seeds=(0,) if args.adaptive else range(args.seeds),
+        max_steps=args.max_steps
+    )
+
+    video = None
+    if args.video_dir:
+        video = VideoSettings(args.video_dir, args.video_format, args.video_every,
+                              tuple(args.video_size) if args.video_size else None)
+
+    if args.adaptive:
+        print(f"Running {len(scenarios)} scenario cells adaptively "
+              f"({args.min_seeds}-{args.max_seeds} seeds each, {args.ci_metric} width <= {args.ci_width})")
+        rule = StoppingRule(metric=args.ci_metric, width=args.ci_width,
+                            min_trials=args.min_seeds, max_trials=args.max_seeds)
+        rows = run_scenario_matrix_adaptive(args.config, scenarios, rule,
+                                            workers=args.workers, video=video)
+    else:
+        print(f"Running {len(scenarios)} scenarios "
+              f"({len(maps)} maps x {len(args.planners)} planners x "
+              f"{len(args.controllers)} controllers x {args.seeds} seeds)")
+        rows = run_scenario_matrix(args.config, scenarios, workers=args.workers, video=video)
+    write_results(rows, args.output)
+    print_matrix_summary(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -44,6 +44,67 @@ def parse_args():
         help="Override target FPS"
     )
 
+    parser.add_argument(
+        "--steps-per-frame",
+        type=int,
+        default=None,
+        help="Physics steps per rendered frame (faster than real time)"
+    )
+
+    parser.add_argument(
+        "--free-run",
+        action="store_true",
+        help="Run physics as fast as the frame budget allows"
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each phase of the loop and print p50/p95/max at exit"
+    )
+
+    parser.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        help="Record the run to a .npz trajectory log (replay with run_replay.py)"
+    )
+
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run without display (pygame is never initialized unless --video is set)"
+    )
+
+    parser.add_argument(
+        "--render-process",
+        action="store_true",
+        help="Draw the window in a separate process so rendering never slows the simulation"
+    )
+
+    parser.add_argument(
+        "--video",
+        type=str,
+        default=None,
+        help="Stream the run to a video (.mp4, .avi or .gif); off-screen with --headless"
+    )
+
+    parser.add_argument(
+        "--video-every",
+        type=int,
+        default=2,
+        help="Video: keep one frame out of every N steps"
+    )
+
+    parser.add_argument(
+        "--video-size",
+        type=int,
+        nargs=2,
+        default=None,
+        metavar=("WIDTH", "HEIGHT"),
+        help="Video resolution (default: screen size)"
+    )
+
     return parser.parse_args()
 
 
@@ -59,7 +120,15 @@ def main():
     config = ConfigLoader(args.config)
     print(f"Using config: {config}")
 
-    sim = Simulator(config=config)
+    if args.profile:
+        config.update("simulation.profile", True)
+
+    sim = Simulator(config=config, headless=args.headless or args.render_process)
+    if args.record:
+        sim.enable_recording()
+    if args.video:
+        sim.enable_video(args.video, every=args.video_every,
+                         size=tuple(args.video_size) if args.video_size else None)
 
     # Plan path
     if not sim.plan_path():
@@ -69,13 +138,31 @@ def main():
     max_steps = args.max_steps or sim.sim_params.get("max_steps", 1000)
     fps = args.fps or sim.sim_params.get("fps", 60)
 
+    if args.headless:
+        print(f"Running headless simulation: max_steps={max_steps}")
+        result = sim.run_headless(max_steps=max_steps)
+        sim.print_stats()
+        if args.record:
+            sim.save_recording(args.record)
+        sim.stop_video()
+        print(f"Wall time: {result.timings['wall_time']:.3f}s "
+              f"({result.timings['steps_per_second']:.0f} steps/s)")
+        sys.exit(0 if result.success else 1)
+
     print(f"Running simulation: max_steps={max_steps}, fps={fps}")
 
-    sim.run(
+    run = sim.run_render_process if args.render_process else sim.run
+    run(
         max_steps=max_steps,
-        target_fps=fps
+        target_fps=fps,
+        steps_per_frame=args.steps_per_frame,
+        free_run=args.free_run or None
     )
 
+    if args.record:
+        sim.save_recording(args.record)
+    sim.stop_video()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
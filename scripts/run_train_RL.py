@@ -9,14 +9,17 @@ import torch
 
 from stable_baselines3 import PPO, SAC
 from stable_baselines3.common.callbacks import CheckpointCallback, EvalCallback
-from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecMonitor
 from stable_baselines3.common.monitor import Monitor
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 # Giả định các module này đã tồn tại trong project của bạn
 from src.learning.environment import AutonomousCarEnv
+from src.learning.vec_env import AutonomousCarVecEnv
+from src.core.vehicle import Vehicle, VehicleConfig
 from src.core.map import Map2D, CircleObstacle, RectangleObstacle, PolygonObstacle
+from src.core.shared_map import SharedMapArtifacts, SharedMapHandle, attach_map
 from src.utils.config_loader import ConfigLoader
 
 def load_map_from_yaml(yaml_path: Path) -> Map2D:
@@ -60,17 +63,37 @@ def load_map_from_yaml(yaml_path: Path) -> Map2D:
             
     return map_env
 
-def make_env(map_path, env_cfg, rank=0, seed=0):
+def make_env(map_source, env_cfg, rank=0, seed=0, vehicle_config=None, sim_cfg=None):
     """
     Utility function for multiprocessed env.
+
+    map_source là đường dẫn YAML hoặc SharedMapHandle (worker attach zero-copy
+    vào map đã compile sẵn trong shared memory, không parse lại YAML).
+
+    vehicle_config / sim_cfg (dt, integrator, substeps) give every env its own
+    Vehicle with the same dynamics as evaluation (run_evaluate_RL.make_env).
     """
     def _init():
-        current_map = load_map_from_yaml(map_path)
+        if isinstance(map_source, SharedMapHandle):
+            current_map = attach_map(map_source)
+        else:
+            current_map = load_map_from_yaml(map_source)
+        sim = sim_cfg or {}
+        vehicle = Vehicle(
+            vehicle_config or VehicleConfig(),
+            dt=sim.get("dt", 0.1),
+            integrator=sim.get("integrator", "euler"),
+            substeps=sim.get("substeps", 1)
+        )
         env = AutonomousCarEnv(
             map_env=current_map,
+            vehicle=vehicle,
             max_steps=env_cfg.get("max_steps", 1000),
             num_lidar_rays=env_cfg.get("num_lidar_rays", 36), # Tăng lidar rays để nhận diện tốt hơn
-            render_mode=None # Training không cần render
+            render_mode=None, # Training không cần render
+            lidar_method=env_cfg.get("lidar_method", "exact"),
+            lidar_resolution=env_cfg.get("lidar_resolution", 0.5),
+            action_repeat=env_cfg.get("action_repeat", 1)
         )
         # Wrap environment với Monitor để ghi log cho EvalCallback
         log_file = os.path.join(env_cfg.get("log_dir", "logs"), str(rank))
@@ -79,6 +102,69 @@ def make_env(map_path, env_cfg, rank=0, seed=0):
         return env
     return _init
 
+def make_vec_env(map_path, env_cfg, train_cfg, seed=0, vehicle_config=None, sim_cfg=None):
+    """
+    Create the training VecEnv selected by training.vec_env.
+
+    vehicle_config and sim_cfg (the config's vehicle and simulation
+    sections) set the vehicle dynamics of every env.
+
+    Returns:
+        (vec_env, shared_artifacts) - shared_artifacts is None unless the
+        map was published to shared memory for subprocess workers; the
+        caller must close it after the env.
+    """
+    n_envs = train_cfg.get("n_envs", 1)
+    if n_envs <= 0:
+        n_envs = os.cpu_count() or 1
+    vec_env_type = train_cfg.get("vec_env", "dummy").lower()
+    sim_cfg = sim_cfg or {}
+
+    if vec_env_type == "native":
+        if env_cfg.get("action_repeat", 1) != 1:
+            raise ValueError("environment.action_repeat is not supported by the native vec_env")
+        # Tất cả các xe chạy song song trên cùng một map, tính toán theo batch
+        env = AutonomousCarVecEnv(
+            map_env=load_map_from_yaml(map_path),
+            num_envs=n_envs,
+            vehicle_config=vehicle_config,
+            max_steps=env_cfg.get("max_steps", 1000),
+            num_lidar_rays=env_cfg.get("num_lidar_rays", 36),
+            lidar_method=env_cfg.get("lidar_method", "exact"),
+            lidar_resolution=env_cfg.get("lidar_resolution", 0.5),
+            dt=sim_cfg.get("dt", 0.1),
+            integrator=sim_cfg.get("integrator", "euler"),
+            substeps=sim_cfg.get("substeps", 1)
+        )
+        env.seed(seed)
+        log_file = os.path.join(env_cfg.get("log_dir", "logs"), "native")
+        return VecMonitor(env, log_file), None
+    elif vec_env_type == "dummy":
+        return DummyVecEnv([make_env(map_path, env_cfg, rank=rank, seed=seed,
+                                     vehicle_config=vehicle_config, sim_cfg=sim_cfg)
+                            for rank in range(n_envs)]), None
+    elif vec_env_type == "subproc":
+        # Compile map một lần vào shared memory, các worker chỉ attach
+        # (occupancy grid only when the "grid" LIDAR reads it)
+        shared = SharedMapArtifacts(
+            load_map_from_yaml(map_path),
+            resolution=env_cfg.get("lidar_resolution", 0.5),
+            occupancy=env_cfg.get("lidar_method", "exact") == "grid"
+        )
+        try:
+            env = SubprocVecEnv(
+                [make_env(shared.handle, env_cfg, rank=rank, seed=seed,
+                          vehicle_config=vehicle_config, sim_cfg=sim_cfg)
+                 for rank in range(n_envs)],
+                start_method=train_cfg.get("start_method", "forkserver")
+            )
+        except BaseException:
+            shared.close()
+            raise
+        return env, shared
+    else:
+        raise ValueError(f"Unknown vec_env type: {vec_env_type}")
+
 def create_model(vec_env, train_cfg, model_cfg, algo, device):
     policy_kwargs = dict(net_arch=[dict(pi=[256, 256], vf=[256, 256])]) # Mạng sâu hơn chút cho bài toán control
 
@@ -130,6 +216,8 @@ def main():
         env_cfg = config.get("environment", {})
         map_cfg = config.get("map", {})
         model_cfg = config.get("model", {})
+        vehicle_config = config.get_vehicle_config()
+        sim_cfg = config.get_simulation_params()
         
         algo = train_cfg.get("algorithm", "ppo").lower()
         base_save_dir = Path(train_cfg.get("save_dir", "trained_models")) / algo
@@ -166,64 +254,70 @@ def main():
             print("-"*50)
             
             # 1. Tạo môi trường Training
-            # Sử dụng DummyVecEnv cho đơn giản, có thể dùng SubprocVecEnv nếu muốn train song song
-            train_env = DummyVecEnv([make_env(map_file, env_cfg, rank=0)])
-            
-            # 2. Tạo môi trường Evaluation (Quan trọng: Dùng cùng map để test khả năng học)
-            # Trong thực tế, có thể bạn muốn eval trên map khác để test độ tổng quát, 
-            # nhưng với Curriculum, ta cần chắc chắn nó qua được bài này đã.
-            eval_env = DummyVecEnv([make_env(map_file, env_cfg, rank=100)])
-
-            # 3. Khởi tạo hoặc Load Model
-            if model is None:
-                print(f"Initializing new {algo.upper()} model...")
-                model = create_model(train_env, train_cfg, model_cfg, algo, device)
-            else:
-                print("Transferring existing agent to new environment...")
-                model.set_env(train_env)
-                # Reset num_timesteps=False để Tensorboard vẽ đồ thị liên tục qua các phase
-            
-            # 4. Callbacks
-            # Lưu checkpoint định kỳ
-            checkpoint_callback = CheckpointCallback(
-                save_freq=train_cfg.get("save_freq", 10000),
-                save_path=str(base_save_dir / "checkpoints"),
-                name_prefix=f"{algo}_{scenario_name}"
-            )
-            
-            # Đánh giá model định kỳ và lưu model tốt nhất (BEST MODEL)
-            eval_callback = EvalCallback(
-                eval_env,
-                best_model_save_path=str(base_save_dir / "best_model" / scenario_name),
-                log_path=str(log_dir / "eval" / scenario_name),
-                eval_freq=train_cfg.get("eval_freq", 5000),
-                deterministic=True,
-                render=False,
-                n_eval_episodes=5
-            )
-
-            # 5. Start Training
+            # training.vec_env: "dummy" (mỗi env một Python object) hoặc "native" (batch N xe)
+            train_env, shared_map = make_vec_env(map_file, env_cfg, train_cfg,
+                                                 vehicle_config=vehicle_config, sim_cfg=sim_cfg)
+            eval_env = None
+            # Đóng env và giải phóng shared memory (/dev/shm) dù phase kết thúc thế nào
             try:
-                model.learn(
-                    total_timesteps=timesteps_per_map,
-                    callback=[checkpoint_callback, eval_callback],
-                    reset_num_timesteps=False, # Quan trọng để log liên tục
-                    progress_bar=True,
-                    tb_log_name=f"{algo}_{scenario_name}"
+                # 2. Tạo môi trường Evaluation (Quan trọng: Dùng cùng map để test khả năng học)
+                # Trong thực tế, có thể bạn muốn eval trên map khác để test độ tổng quát, 
+                # nhưng với Curriculum, ta cần chắc chắn nó qua được bài này đã.
+                eval_env = DummyVecEnv([make_env(map_file, env_cfg, rank=100,
+                                                 vehicle_config=vehicle_config, sim_cfg=sim_cfg)])
+
+                # 3. Khởi tạo hoặc Load Model
+                if model is None:
+                    print(f"Initializing new {algo.upper()} model...")
+                    model = create_model(train_env, train_cfg, model_cfg, algo, device)
+                else:
+                    print("Transferring existing agent to new environment...")
+                    model.set_env(train_env)
+                    # Reset num_timesteps=False để Tensorboard vẽ đồ thị liên tục qua các phase
+            
+                # 4. Callbacks
+                # Lưu checkpoint định kỳ
+                checkpoint_callback = CheckpointCallback(
+                    save_freq=train_cfg.get("save_freq", 10000),
+                    save_path=str(base_save_dir / "checkpoints"),
+                    name_prefix=f"{algo}_{scenario_name}"
                 )
-            except KeyboardInterrupt:
-                print("Training interrupted by user. Saving current model...")
-                model.save(base_save_dir / f"{algo}_interrupted.zip")
-                return 0
-
-            # 6. Save Final Model của Phase này
-            phase_save_path = base_save_dir / f"{algo}_finished_{scenario_name}.zip"
-            model.save(phase_save_path)
-            print(f"✓ Completed Phase {i+1}. Model saved to {phase_save_path}")
             
-            # Đóng env để giải phóng resource
-            train_env.close()
-            eval_env.close()
+                # Đánh giá model định kỳ và lưu model tốt nhất (BEST MODEL)
+                eval_callback = EvalCallback(
+                    eval_env,
+                    best_model_save_path=str(base_save_dir / "best_model" / scenario_name),
+                    log_path=str(log_dir / "eval" / scenario_name),
+                    eval_freq=train_cfg.get("eval_freq", 5000),
+                    deterministic=True,
+                    render=False,
+                    n_eval_episodes=5
+                )
+
+                # 5. Start Training
+                try:
+                    model.learn(
+                        total_timesteps=timesteps_per_map,
+                        callback=[checkpoint_callback, eval_callback],
+                        reset_num_timesteps=False, # Quan trọng để log liên tục
+                        progress_bar=True,
+                        tb_log_name=f"{algo}_{scenario_name}"
+                    )
+                except KeyboardInterrupt:
+                    print("Training interrupted by user. Saving current model...")
+                    model.save(base_save_dir / f"{algo}_interrupted.zip")
+                    return 0
+
+                # 6. Save Final Model của Phase này
+                phase_save_path = base_save_dir / f"{algo}_finished_{scenario_name}.zip"
+                model.save(phase_save_path)
+                print(f"✓ Completed Phase {i+1}. Model saved to {phase_save_path}")
+            finally:
+                train_env.close()
+                if eval_env is not None:
+                    eval_env.close()
+                if shared_map is not None:
+                    shared_map.close()
 
         print("\n" + "="*70)
         print("ALL TRAINING PHASES COMPLETED SUCCESSFULLY")
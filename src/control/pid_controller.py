@@ -68,6 +68,20 @@ class PIDController:
         self.integral_error_long = 0.0
         self.prev_error_long = 0.0
 
+    def get_state(self) -> dict:
+        """Integrator and previous-error terms (see set_state)."""
+        return {
+            'integral_error_lat': self.integral_error_lat,
+            'prev_error_lat': self.prev_error_lat,
+            'integral_error_long': self.integral_error_long,
+            'prev_error_long': self.prev_error_long,
+        }
+
+    def set_state(self, state: dict):
+        """Restore terms captured by get_state()."""
+        for key, value in state.items():
+            setattr(self, key, value)
+
     def control(self, vehicle: Vehicle, 
                 target_point: Tuple[float, float],
                 target_speed: float,
@@ -219,6 +233,7 @@ class PathFollowingPID:
         self.dt = dt
         self.path: Optional[PlannedPath] = None
         self.current_path_distance = 0.0
+        self.target_point: Optional[Tuple[float, float]] = None
     
     def set_path(self, path: PlannedPath):
         """Set the path to follow."""
@@ -226,6 +241,22 @@ class PathFollowingPID:
         self.current_path_distance = 0.0
         self.pid.reset()
     
+    def get_state(self) -> dict:
+        """Internal tracking state, excluding vehicle and path."""
+        return {
+            'current_path_distance': self.current_path_distance,
+            'target_speed': self.target_speed,
+            'target_point': self.target_point,
+            'pid': self.pid.get_state(),
+        }
+    
+    def set_state(self, state: dict):
+        """Restore state captured by get_state() (path must already be set)."""
+        self.current_path_distance = state['current_path_distance']
+        self.target_speed = state['target_speed']
+        self.target_point = state['target_point']
+        self.pid.set_state(state['pid'])
+    
     def control(self) -> Tuple[float, float]:
         """
         Compute control commands to follow path.
@@ -238,6 +269,7 @@ class PathFollowingPID:
         
         # Find target point on path
         target_point = self._find_target_point()
+        self.target_point = target_point
         
         # Adjust speed based on path curvature (optional)
         target_speed = self._compute_target_speed(target_point)
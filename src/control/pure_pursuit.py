@@ -48,11 +48,27 @@ class PurePursuitController:
         
         self.path: Optional[PlannedPath] = None
         self.current_target_idx = 0
+        self.target_point: Optional[Tuple[float, float]] = None
 
     def set_path(self, path: PlannedPath):
         self.path = path
         self.current_target_idx = 0
 
+    def get_state(self) -> dict:
+        """Internal tracking state, excluding vehicle and path."""
+        # target_speed is included because the adaptive variant mutates it
+        return {
+            'current_target_idx': self.current_target_idx,
+            'target_speed': self.target_speed,
+            'target_point': self.target_point,
+        }
+
+    def set_state(self, state: dict):
+        """Restore state captured by get_state() (path must already be set)."""
+        self.current_target_idx = state['current_target_idx']
+        self.target_speed = state['target_speed']
+        self.target_point = state['target_point']
+
     def control(self) -> Tuple[float, float]:
         """
         Compute control commands using Pure Pursuit.
@@ -71,6 +87,7 @@ class PurePursuitController:
 
         if lookahead_point is None:
             lookahead_point = self.path.points[-1].to_tuple()
+        self.target_point = lookahead_point
 
         steering_angle = self._compute_steering_angle(lookahead_point, lookahead)
 
@@ -1,6 +1,6 @@
 import numpy as np
 import yaml
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -21,6 +21,14 @@ class Obstacle:
     
     def distance_to_point(self, x: float, y: float) -> float:
         raise NotImplementedError
+
+    def contains_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Vectorized contains_point over arrays of coordinates."""
+        raise NotImplementedError
+
+    def distance_to_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Vectorized distance_to_point over arrays of coordinates."""
+        raise NotImplementedError
     
 
 @dataclass
@@ -67,6 +75,25 @@ class RectangleObstacle(Obstacle):
         dist_y = local_y - closest_y
 
         return np.sqrt(dist_x**2 + dist_y**2)
+
+    def _to_local(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        dx = np.asarray(xs, dtype=float) - self.x
+        dy = np.asarray(ys, dtype=float) - self.y
+        if self.angle != 0:
+            cos_a = np.cos(-self.angle)
+            sin_a = np.sin(-self.angle)
+            return cos_a * dx - sin_a * dy, sin_a * dx + cos_a * dy
+        return dx, dy
+
+    def contains_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        local_x, local_y = self._to_local(xs, ys)
+        return (np.abs(local_x) <= self.width/2) & (np.abs(local_y) <= self.height/2)
+
+    def distance_to_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        local_x, local_y = self._to_local(xs, ys)
+        dist_x = local_x - np.clip(local_x, -self.width/2, self.width/2)
+        dist_y = local_y - np.clip(local_y, -self.height/2, self.height/2)
+        return np.sqrt(dist_x**2 + dist_y**2)
     
     def get_corners(self) -> np.ndarray:
         hw, hh = self.width/2, self.height/2
@@ -105,6 +132,16 @@ class CircleObstacle(Obstacle):
         dy = y - self.y
         dist_to_center = np.sqrt(dx**2 + dy**2)
         return max(0, dist_to_center - self.radius)
+
+    def contains_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        dx = np.asarray(xs, dtype=float) - self.x
+        dy = np.asarray(ys, dtype=float) - self.y
+        return dx**2 + dy**2 <= self.radius**2
+
+    def distance_to_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        dx = np.asarray(xs, dtype=float) - self.x
+        dy = np.asarray(ys, dtype=float) - self.y
+        return np.maximum(0.0, np.sqrt(dx**2 + dy**2) - self.radius)
     
 
 @dataclass
@@ -146,6 +183,44 @@ class PolygonObstacle(Obstacle):
             min_dist = min(min_dist, dist)
         
         return min_dist
+
+    def contains_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Crossing-number test, same edge rules as contains_point."""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        inside = np.zeros(np.broadcast(xs, ys).shape, dtype=bool)
+
+        n = len(self.vertices)
+        for i in range(n):
+            p1x, p1y = self.vertices[i]
+            p2x, p2y = self.vertices[(i + 1) % n]
+            if p1y == p2y:
+                # Horizontal edges never satisfy min(y) < y < max(y)
+                continue
+            crosses = (ys > min(p1y, p2y)) & (ys < max(p1y, p2y)) & (xs < max(p1x, p2x))
+            x_inner = p1x + (ys - p1y) * (p2x - p1x) / (p2y - p1y)
+            inside ^= crosses & (xs <= x_inner)
+        return inside
+
+    def distance_to_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        min_dist = np.full(np.broadcast(xs, ys).shape, np.inf)
+
+        n = len(self.vertices)
+        for i in range(n):
+            v1 = self.vertices[i]
+            v2 = self.vertices[(i + 1) % n]
+            seg_x, seg_y = v2[0] - v1[0], v2[1] - v1[1]
+            px, py = xs - v1[0], ys - v1[1]
+            seg_len_sq = seg_x**2 + seg_y**2
+            if seg_len_sq < 1e-10:
+                t = 0.0
+            else:
+                t = np.clip((px * seg_x + py * seg_y) / seg_len_sq, 0, 1)
+            min_dist = np.minimum(min_dist, np.hypot(px - t * seg_x, py - t * seg_y))
+
+        return np.where(self.contains_points(xs, ys), 0.0, min_dist)
     
     @staticmethod
     def _point_to_segment_distance(point, seg_start, seg_end):
@@ -171,14 +246,26 @@ class Map2D:
         self.start: Optional[Tuple[float, float]] = None
         self.goal: Optional[Tuple[float, float]] = None
 
+        # Bumped on every obstacle change; derived data is cached per version
+        self.version = 0
+        self._ray_geometry = None
+        self._ray_geometry_version = -1
+        self._occupancy_grids: Dict[float, np.ndarray] = {}
+        self._distance_fields: Dict[float, np.ndarray] = {}
+        self._occupancy_grids_version = -1
+        self._bounds = None
+        self._bounds_version = -1
+
     def add_obstacle(self, obstacle: Obstacle):
         """Add obstacle to map."""
         self.obstacles.append(obstacle)
+        self.version += 1
 
     def remove_obstacle(self, index: int):
         """Remove obstacle by index."""
         if 0 <= index < len(self.obstacles):
             self.obstacles.pop(index)
+            self.version += 1
         
     def set_start(self, x: float, y: float):
         """Set start position."""
@@ -215,6 +302,339 @@ class Map2D:
                     return True
         
         return False
+
+    def is_collision_batch(self, xs: np.ndarray, ys: np.ndarray,
+                           safety_margin: Optional[float] = None) -> np.ndarray:
+        """
+        Vectorized version of is_collision.
+        
+        Args:
+            xs, ys: Arrays of point coordinates (any matching shape)
+            safety_margin: None for Planner. Not None for Controller
+            
+        Returns:
+            Boolean array, True where a collision is detected
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        if safety_margin is None:
+            safety_margin = self.safety_margin
+
+        collision = ~((xs >= 0) & (xs <= self.width) & (ys >= 0) & (ys <= self.height))
+        for obstacle in self.obstacles:
+            if safety_margin > 0:
+                collision |= obstacle.distance_to_points(xs, ys) < safety_margin
+            else:
+                collision |= obstacle.contains_points(xs, ys)
+        
+        return collision
+    
+    def _get_ray_geometry(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Obstacle geometry flattened into arrays for raycasting.
+        
+        Returns:
+            circles (M, 3) as [x, y, radius], segments (K, 4) as
+            [x1, y1, x2, y2] (rectangle edges, polygon edges, then the 4 map
+            borders) and the index of the first edge of each rectangle/polygon
+        """
+        if self._ray_geometry is not None and self._ray_geometry_version == self.version:
+            return self._ray_geometry
+        
+        circles = []
+        segments = []
+        starts = []
+        n_edges = 0
+        for obstacle in self.obstacles:
+            if isinstance(obstacle, CircleObstacle):
+                circles.append((obstacle.x, obstacle.y, obstacle.radius))
+                continue
+            if isinstance(obstacle, RectangleObstacle):
+                vertices = obstacle.get_corners()
+            elif isinstance(obstacle, PolygonObstacle):
+                vertices = obstacle.vertices
+            else:
+                continue
+            vertices = np.asarray(vertices, dtype=float)
+            segments.append(np.hstack([vertices, np.roll(vertices, -1, axis=0)]))
+            starts.append(n_edges)
+            n_edges += len(vertices)
+        
+        w, h = self.width, self.height
+        segments.append(np.array([
+            [0, 0, w, 0], [w, 0, w, h], [w, h, 0, h], [0, h, 0, 0]
+        ], dtype=float))
+        
+        self._ray_geometry = (
+            np.array(circles, dtype=float).reshape(-1, 3),
+            np.vstack(segments),
+            np.array(starts, dtype=np.intp)
+        )
+        self._ray_geometry_version = self.version
+        return self._ray_geometry
+
+    def get_obstacle_bounds(self) -> np.ndarray:
+        """
+        Axis-aligned bounding boxes of all obstacles, cached per map version.
+        
+        Returns:
+            (N, 4) array of [xmin, ymin, xmax, ymax], in obstacle order
+        """
+        if self._bounds is not None and self._bounds_version == self.version:
+            return self._bounds
+        
+        bounds = np.empty((len(self.obstacles), 4))
+        for i, obstacle in enumerate(self.obstacles):
+            if isinstance(obstacle, CircleObstacle):
+                bounds[i] = (obstacle.x - obstacle.radius, obstacle.y - obstacle.radius,
+                             obstacle.x + obstacle.radius, obstacle.y + obstacle.radius)
+            else:
+                if isinstance(obstacle, RectangleObstacle):
+                    vertices = obstacle.get_corners()
+                else:
+                    vertices = np.asarray(obstacle.vertices, dtype=float)
+                bounds[i, :2] = vertices.min(axis=0)
+                bounds[i, 2:] = vertices.max(axis=0)
+        
+        self._bounds = bounds
+        self._bounds_version = self.version
+        return bounds
+
+    def query_bbox(self, xmin: float, ymin: float, xmax: float, ymax: float) -> np.ndarray:
+        """
+        Obstacles whose bounding box intersects a rectangle.
+        
+        Args:
+            xmin, ymin, xmax, ymax: Query rectangle (world coordinates)
+            
+        Returns:
+            Indices into self.obstacles
+        """
+        bounds = self.get_obstacle_bounds()
+        hit = ((bounds[:, 0] <= xmax) & (bounds[:, 2] >= xmin) &
+               (bounds[:, 1] <= ymax) & (bounds[:, 3] >= ymin))
+        return np.flatnonzero(hit)
+
+    def _origins_inside(self, origins: np.ndarray, circles: np.ndarray,
+                        segments: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """Point-in-obstacle test for ray origins using the cached edge arrays."""
+        x = origins[:, 0, None]
+        y = origins[:, 1, None]
+        inside = ~((x[:, 0] >= 0) & (x[:, 0] <= self.width) &
+                   (y[:, 0] >= 0) & (y[:, 0] <= self.height))
+        
+        if len(circles) > 0:
+            inside |= ((x - circles[:, 0])**2 + (y - circles[:, 1])**2 <= circles[:, 2]**2).any(axis=1)
+        
+        if len(starts) > 0:
+            # Crossing number per obstacle, same edge rules as PolygonObstacle.contains_point
+            edges = segments[:-4]
+            y1, y2 = edges[:, 1], edges[:, 3]
+            x1, x2 = edges[:, 0], edges[:, 2]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x_inner = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+            crosses = ((y > np.minimum(y1, y2)) & (y < np.maximum(y1, y2)) &
+                       (x < np.maximum(x1, x2)) & (x <= x_inner))
+            parity = np.add.reduceat(crosses.astype(np.int32), starts, axis=1) % 2
+            inside |= parity.any(axis=1)
+        
+        return inside
+
+    def get_occupancy_grid(self, resolution: float = 0.5) -> np.ndarray:
+        """
+        Occupancy bitmap of the map, cached per map version and resolution.
+        
+        Cells are indexed grid[ix, iy] (same layout as AStarPlanner) and are
+        occupied when their center lies inside an obstacle.
+        
+        Args:
+            resolution: Cell size (meters)
+            
+        Returns:
+            Boolean array of shape (ceil(width / res), ceil(height / res))
+        """
+        self._check_grid_cache()
+        
+        grid = self._occupancy_grids.get(resolution)
+        if grid is None:
+            nx = int(np.ceil(self.width / resolution))
+            ny = int(np.ceil(self.height / resolution))
+            cx = (np.arange(nx) + 0.5) * resolution
+            cy = (np.arange(ny) + 0.5) * resolution
+            grid = self.is_collision_batch(cx[:, None], cy[None, :], 0)
+            self._occupancy_grids[resolution] = grid
+        return grid
+
+    def get_distance_field(self, resolution: float = 0.5) -> np.ndarray:
+        """
+        Distance (meters) from each cell center to the nearest occupied cell,
+        cached per map version and resolution. Same layout as get_occupancy_grid.
+        """
+        self._check_grid_cache()
+        
+        field = self._distance_fields.get(resolution)
+        if field is None:
+            from scipy.ndimage import distance_transform_edt
+            occupancy = self.get_occupancy_grid(resolution)
+            field = distance_transform_edt(~occupancy) * resolution
+            self._distance_fields[resolution] = field
+        return field
+
+    def _check_grid_cache(self):
+        """Drop cached grids built for an older map version."""
+        if self._occupancy_grids_version != self.version:
+            self._occupancy_grids = {}
+            self._distance_fields = {}
+            self._occupancy_grids_version = self.version
+
+    def raycast(self, origins: np.ndarray, angles: np.ndarray,
+                max_range: float, method: str = "exact",
+                resolution: float = 0.5) -> np.ndarray:
+        """
+        Distance along rays to the first obstacle or map border.
+        
+        Methods:
+            exact: all rays are intersected analytically with all circles
+                and all rectangle/polygon edges at once (NumPy broadcasting)
+            grid: rays are walked through the cached occupancy grid with a
+                vectorized Amanatides-Woo DDA; cost does not depend on the
+                number of obstacles, accuracy is limited by the resolution
+        
+        Args:
+            origins: Ray origins, shape (2,) or (N, 2)
+            angles: Ray angles in radians, shape (R,) shared by all
+                origins or (N, R) per origin
+            max_range: Maximum sensing distance
+            method: "exact" or "grid"
+            resolution: Cell size for the grid method
+            
+        Returns:
+            Hit distances clipped to max_range, shape (R,) for a single
+            origin or (N, R). Origins inside an obstacle return 0.
+        """
+        origins = np.asarray(origins, dtype=float)
+        single = origins.ndim == 1
+        origins = origins.reshape(-1, 2)
+        angles = np.asarray(angles, dtype=float)
+        angles = np.broadcast_to(angles, (len(origins), angles.shape[-1]))
+        
+        if method == "exact":
+            distances = self._raycast_exact(origins, angles, max_range)
+        elif method == "grid":
+            distances = self._raycast_grid(origins, angles, max_range, resolution)
+        else:
+            raise ValueError(f"Unknown raycast method: {method}")
+        
+        return distances[0] if single else distances
+
+    def _raycast_grid(self, origins: np.ndarray, angles: np.ndarray,
+                      max_range: float, resolution: float) -> np.ndarray:
+        """Vectorized DDA over the occupancy grid for (N, R) rays."""
+        grid = self.get_occupancy_grid(resolution)
+        nx, ny = grid.shape
+        
+        ox = np.broadcast_to(origins[:, 0, None], angles.shape).ravel()
+        oy = np.broadcast_to(origins[:, 1, None], angles.shape).ravel()
+        dx = np.cos(angles).ravel()
+        dy = np.sin(angles).ravel()
+        
+        ix = np.floor(ox / resolution).astype(np.intp)
+        iy = np.floor(oy / resolution).astype(np.intp)
+        step_x = np.where(dx >= 0, 1, -1)
+        step_y = np.where(dy >= 0, 1, -1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_delta_x = np.where(dx != 0, resolution / np.abs(dx), np.inf)
+            t_delta_y = np.where(dy != 0, resolution / np.abs(dy), np.inf)
+            t_max_x = np.where(dx != 0, ((ix + (step_x > 0)) * resolution - ox) / dx, np.inf)
+            t_max_y = np.where(dy != 0, ((iy + (step_y > 0)) * resolution - oy) / dy, np.inf)
+        
+        distances = np.full(ix.shape, float(max_range))
+        t_entry = np.zeros(ix.shape)
+        active = np.arange(len(ix))
+        
+        # A ray crosses at most one cell per axis per step
+        for _ in range(2 * int(np.ceil(max_range / resolution)) + 2):
+            cx, cy = ix[active], iy[active]
+            outside = (cx < 0) | (cx >= nx) | (cy < 0) | (cy >= ny)
+            hit = outside.copy()
+            hit[~outside] = grid[cx[~outside], cy[~outside]]
+            
+            hit_rays = active[hit]
+            distances[hit_rays] = np.minimum(t_entry[hit_rays], max_range)
+            active = active[~hit & (t_entry[active] < max_range)]
+            if len(active) == 0:
+                break
+            
+            # Advance each active ray into its next cell
+            use_x = t_max_x[active] < t_max_y[active]
+            ax, ay = active[use_x], active[~use_x]
+            t_entry[ax] = t_max_x[ax]
+            ix[ax] += step_x[ax]
+            t_max_x[ax] += t_delta_x[ax]
+            t_entry[ay] = t_max_y[ay]
+            iy[ay] += step_y[ay]
+            t_max_y[ay] += t_delta_y[ay]
+        
+        return distances.reshape(angles.shape)
+
+    def _raycast_exact(self, origins: np.ndarray, angles: np.ndarray,
+                       max_range: float) -> np.ndarray:
+        """Analytic ray-obstacle intersection for (N, R) rays."""
+        circles, segments, starts = self._get_ray_geometry()
+        inside = self._origins_inside(origins, circles, segments, starts)
+        
+        ox = origins[:, 0, None, None]
+        oy = origins[:, 1, None, None]
+        dx = np.cos(angles)[:, :, None]
+        dy = np.sin(angles)[:, :, None]
+        
+        distances = np.full(angles.shape, float(max_range))
+        
+        # Only geometry within max_range of some origin can be hit
+        lo = origins.min(axis=0) - max_range
+        hi = origins.max(axis=0) + max_range
+        circles = circles[
+            (circles[:, 0] + circles[:, 2] >= lo[0]) & (circles[:, 0] - circles[:, 2] <= hi[0]) &
+            (circles[:, 1] + circles[:, 2] >= lo[1]) & (circles[:, 1] - circles[:, 2] <= hi[1])
+        ]
+        segments = segments[
+            (np.maximum(segments[:, 0], segments[:, 2]) >= lo[0]) &
+            (np.minimum(segments[:, 0], segments[:, 2]) <= hi[0]) &
+            (np.maximum(segments[:, 1], segments[:, 3]) >= lo[1]) &
+            (np.minimum(segments[:, 1], segments[:, 3]) <= hi[1])
+        ]
+        
+        # Ray-circle: solve |o + t*d - c|^2 = r^2 for the nearest t >= 0
+        if len(circles) > 0:
+            fx = ox - circles[:, 0]
+            fy = oy - circles[:, 1]
+            b = fx * dx + fy * dy
+            c = fx**2 + fy**2 - circles[:, 2]**2
+            disc = b**2 - c
+            with np.errstate(invalid='ignore'):
+                t = -b - np.sqrt(disc)
+            t = np.where((disc >= 0) & (t >= 0), t, np.inf)
+            distances = np.minimum(distances, t.min(axis=2))
+        
+        # Ray-segment: o + t*d = p + u*s with t >= 0 and 0 <= u <= 1
+        if len(segments) > 0:
+            sx = segments[:, 2] - segments[:, 0]
+            sy = segments[:, 3] - segments[:, 1]
+            px = segments[:, 0] - ox
+            py = segments[:, 1] - oy
+            t_num = px * sy - py * sx  # independent of the ray direction
+            denom = dx * sy - dy * sx
+            u_num = px * dy - py * dx
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = t_num / denom
+                u = u_num / denom
+            valid = (t >= 0) & (u >= 0) & (u <= 1) & (np.abs(denom) > 1e-12)
+            distances = np.minimum(distances, np.where(valid, t, np.inf).min(axis=2))
+        
+        distances[inside] = 0.0
+        
+        return distances
     
     def is_path_collision_free(self, x1: float, y1: float,
                               x2: float, y2: float,
@@ -250,8 +670,8 @@ class Map2D:
         
         return min_dist
     
-    def save_to_yaml(self, filename: str):
-        """Save map to YAML file."""
+    def to_dict(self) -> dict:
+        """Serialize map to a plain dictionary (YAML/JSON friendly)."""
         data = {
             "width": self.width,
             "height": self.height,
@@ -284,6 +704,12 @@ class Map2D:
                     "vertices": obs.vertices.tolist()
                 })
         
+        return data
+    
+    def save_to_yaml(self, filename: str):
+        """Save map to YAML file."""
+        data = self.to_dict()
+        
         with open(filename, 'w') as f:
             # sort_keys=False giúp giữ nguyên thứ tự các key như trong dictionary
             yaml.dump(data, f, default_flow_style=False, sort_keys=False)
@@ -298,6 +724,11 @@ class Map2D:
             data = full_data["map"]
         else:
             data = full_data
+        return cls.from_dict(data)
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Map2D':
+        """Build map from a dictionary as produced by to_dict()."""
         safety = data.get("safety_margin", 0.0)
         map_obj = cls(data["width"], data["height"], safety_margin=safety)
         
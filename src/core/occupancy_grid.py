@@ -0,0 +1,185 @@
+import numpy as np
+from typing import Tuple
+
+
+class OccupancyGrid:
+    """
+    Fixed-size log-odds occupancy grid built from range scans.
+
+    Cells are indexed grid[ix, iy] (same layout as Map2D.get_occupancy_grid
+    and AStarPlanner). A scan adds hit_log_odds to the cell of every ray
+    that returned before max range and miss_log_odds to the cells the rays
+    passed through, all with vectorized cell marking. A cell is occupied
+    while its log-odds is above zero.
+
+    Occupied cells are dilated by `inflation` (the planner's clearance)
+    incrementally: every cell keeps a count of occupied cells within the
+    inflation radius, and only cells whose occupancy flipped in a scan
+    stamp their disk in or out. `free` (True = traversable) is updated in
+    place, so a planner holding a reference to it always sees the latest
+    map without rebuilding anything.
+    """
+
+    def __init__(self, width: float, height: float,
+                 resolution: float = 0.5,
+                 inflation: float = 0.0,
+                 hit_log_odds: float = 0.85,
+                 miss_log_odds: float = -0.4,
+                 min_log_odds: float = -2.0,
+                 max_log_odds: float = 3.5):
+        """
+        Initialize an empty (unknown = free) grid.
+
+        Args:
+            width, height: World size (meters)
+            resolution: Cell size (meters)
+            inflation: Clearance around occupied cells (meters)
+            hit_log_odds: Log-odds added to a cell a ray ended in
+            miss_log_odds: Log-odds added to a cell a ray passed through
+                (0 = never clear cells)
+            min_log_odds, max_log_odds: Clamping bounds, so a cell can
+                change state again after a few contrary readings
+        """
+        if resolution <= 0:
+            raise ValueError(f"Invalid resolution: {resolution}")
+        self.width = width
+        self.height = height
+        self.resolution = float(resolution)
+        self.inflation = float(inflation)
+        self.hit_log_odds = hit_log_odds
+        self.miss_log_odds = miss_log_odds
+        self.min_log_odds = min_log_odds
+        self.max_log_odds = max_log_odds
+
+        self.nx = int(np.ceil(width / self.resolution))
+        self.ny = int(np.ceil(height / self.resolution))
+        self.log_odds = np.zeros((self.nx, self.ny), dtype=np.float32)
+        self.occupied = np.zeros((self.nx, self.ny), dtype=bool)
+        self.free = np.ones((self.nx, self.ny), dtype=bool)
+        self._blocking = np.zeros((self.nx, self.ny), dtype=np.int32)
+        self.version = 0
+
+        # Cell offsets of the inflation disk
+        r = int(np.ceil(self.inflation / self.resolution))
+        dx, dy = np.meshgrid(np.arange(-r, r + 1), np.arange(-r, r + 1), indexing="ij")
+        inside = np.hypot(dx, dy) * self.resolution < max(self.inflation, 1e-9)
+        self._disk_x = dx[inside]
+        self._disk_y = dy[inside]
+
+    def reset(self):
+        """Forget everything (all cells unknown)."""
+        self.log_odds[:] = 0.0
+        self.occupied[:] = False
+        self.free[:] = True
+        self._blocking[:] = 0
+        self.version += 1
+
+    def world_to_cell(self, x, y) -> Tuple[np.ndarray, np.ndarray]:
+        """Cell indices of world point(s) (not clipped to the grid)."""
+        ix = np.floor(np.asarray(x) / self.resolution).astype(np.int64)
+        iy = np.floor(np.asarray(y) / self.resolution).astype(np.int64)
+        return ix, iy
+
+    def _in_bounds(self, ix: np.ndarray, iy: np.ndarray) -> np.ndarray:
+        return (ix >= 0) & (ix < self.nx) & (iy >= 0) & (iy < self.ny)
+
+    def update(self, origin: Tuple[float, float], angles: np.ndarray,
+               distances: np.ndarray, max_range: float) -> int:
+        """
+        Integrate one range scan.
+
+        Args:
+            origin: Sensor position (x, y)
+            angles: (R,) absolute ray angles
+            distances: (R,) measured distances (meters); max_range = no hit
+            max_range: Sensor range (meters)
+
+        Returns:
+            Number of cells whose occupancy changed
+        """
+        ox, oy = float(origin[0]), float(origin[1])
+        angles = np.asarray(angles, dtype=float)
+        distances = np.asarray(distances, dtype=float)
+        cos_a, sin_a = np.cos(angles), np.sin(angles)
+
+        # Hit cells: one per ray that returned
+        hit = distances < max_range
+        hx, hy = self.world_to_cell(ox + distances[hit] * cos_a[hit],
+                                    oy + distances[hit] * sin_a[hit])
+        keep = self._in_bounds(hx, hy)
+        hit_cells = np.unique(hx[keep] * self.ny + hy[keep])
+
+        touched = hit_cells
+        if self.miss_log_odds != 0.0:
+            # Traversed cells: samples every half cell, stopping one cell short of the return
+            step = 0.5 * self.resolution
+            along = np.arange(0.0, max_range, step)[None, :]
+            passed = along < (distances - self.resolution)[:, None]
+            mx, my = self.world_to_cell(ox + along * cos_a[:, None], oy + along * sin_a[:, None])
+            passed &= self._in_bounds(mx, my)
+            miss_cells = np.unique(mx[passed] * self.ny + my[passed])
+            miss_cells = miss_cells[~np.isin(miss_cells, hit_cells, assume_unique=True)]
+            self.log_odds.flat[miss_cells] += self.miss_log_odds
+            touched = np.concatenate([hit_cells, miss_cells])
+
+        self.log_odds.flat[hit_cells] += self.hit_log_odds
+        self.log_odds.flat[touched] = np.clip(self.log_odds.flat[touched],
+                                              self.min_log_odds, self.max_log_odds)
+
+        now_occupied = self.log_odds.flat[touched] > 0.0
+        changed = now_occupied != self.occupied.flat[touched]
+        if not changed.any():
+            return 0
+
+        added = touched[changed & now_occupied]
+        removed = touched[changed & ~now_occupied]
+        self.occupied.flat[added] = True
+        self.occupied.flat[removed] = False
+        self._stamp(added, 1)
+        self._stamp(removed, -1)
+        self.version += 1
+        return len(added) + len(removed)
+
+    def _stamp(self, cells: np.ndarray, sign: int):
+        """Add (or remove) the inflation disk of each cell and refresh `free` under it."""
+        if len(cells) == 0:
+            return
+        cx, cy = np.divmod(cells, self.ny)
+        tx = (cx[:, None] + self._disk_x[None, :]).ravel()
+        ty = (cy[:, None] + self._disk_y[None, :]).ravel()
+        keep = self._in_bounds(tx, ty)
+        tx, ty = tx[keep], ty[keep]
+        np.add.at(self._blocking, (tx, ty), sign)
+        self.free[tx, ty] = self._blocking[tx, ty] == 0
+
+    def is_occupied(self, x: float, y: float) -> bool:
+        """True if the cell containing (x, y) is occupied (no inflation)."""
+        ix, iy = self.world_to_cell(x, y)
+        return bool(self._in_bounds(ix, iy) and self.occupied[ix, iy])
+
+    def is_blocked(self, x: float, y: float) -> bool:
+        """True if (x, y) is outside the grid or within `inflation` of an occupied cell."""
+        ix, iy = self.world_to_cell(x, y)
+        return not (self._in_bounds(ix, iy) and self.free[ix, iy])
+
+    def is_blocked_batch(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Vectorized is_blocked over arrays of points."""
+        ix, iy = self.world_to_cell(xs, ys)
+        inside = self._in_bounds(ix, iy)
+        blocked = np.ones(np.broadcast(ix, iy).shape, dtype=bool)
+        blocked[inside] = ~self.free[ix[inside], iy[inside]]
+        return blocked
+
+    def occupied_cells(self) -> np.ndarray:
+        """(K, 2) world centers of the occupied cells."""
+        ix, iy = np.nonzero(self.occupied)
+        return (np.column_stack([ix, iy]) + 0.5) * self.resolution
+
+    @property
+    def probability(self) -> np.ndarray:
+        """Occupancy probability of every cell."""
+        return 1.0 / (1.0 + np.exp(-self.log_odds))
+
+    def __repr__(self) -> str:
+        return (f"OccupancyGrid({self.nx}x{self.ny} cells @ {self.resolution}m, "
+                f"{int(self.occupied.sum())} occupied)")
@@ -0,0 +1,181 @@
+import numpy as np
+from multiprocessing import shared_memory
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.core.map import Map2D, CircleObstacle, PolygonObstacle, RectangleObstacle
+
+
+# Obstacle kind codes of the "obstacle_order" table
+_RECTANGLE, _CIRCLE, _POLYGON = 0, 1, 2
+
+
+@dataclass
+class SharedMapHandle:
+    """
+    Picklable description of a map published in shared memory.
+
+    Only block names, shapes and dtypes travel to the workers; the arrays
+    themselves are attached zero-copy with attach_map().
+    """
+    width: float
+    height: float
+    safety_margin: float
+    start: Optional[Tuple[float, float]]
+    goal: Optional[Tuple[float, float]]
+    resolution: float
+    # array name -> (shared memory block name, shape, dtype)
+    arrays: Dict[str, Tuple[str, Tuple[int, ...], str]] = field(default_factory=dict)
+
+
+class SharedMapArtifacts:
+    """
+    Owner of the shared memory blocks holding a compiled map.
+
+    Compiled artifacts:
+        - obstacle parameter arrays (rectangles, circles, polygon vertices)
+          and the original obstacle order as (kind, index) rows
+        - raycast geometry (circles, edge segments, edge group starts)
+        - optionally the occupancy grid and distance field at `resolution`
+
+    The owning process must call close() (or use it as a context manager)
+    to unlink the blocks once all workers are done.
+    """
+
+    def __init__(self, map_env: Map2D, resolution: float = 0.5,
+                 occupancy: bool = True, distance_field: bool = False):
+        """
+        Compile map_env and copy every artifact into shared memory once.
+
+        Args:
+            map_env: Map to publish
+            resolution: Occupancy grid / distance field cell size
+            occupancy: Publish the occupancy grid (needed by the "grid"
+                raycast method; the "exact" method never reads it)
+            distance_field: Also publish the distance field (only worth it
+                when workers call get_distance_field())
+        """
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.handle = SharedMapHandle(
+            width=map_env.width,
+            height=map_env.height,
+            safety_margin=map_env.safety_margin,
+            start=map_env.start,
+            goal=map_env.goal,
+            resolution=resolution
+        )
+
+        circles, segments, starts = map_env._get_ray_geometry()
+        rectangles, polygons, order = [], [], []
+        n_circles = 0
+        for o in map_env.obstacles:
+            if isinstance(o, RectangleObstacle):
+                order.append((_RECTANGLE, len(rectangles)))
+                rectangles.append((o.x, o.y, o.width, o.height, o.angle))
+            elif isinstance(o, CircleObstacle):
+                # Same order as the circles of the raycast geometry
+                order.append((_CIRCLE, n_circles))
+                n_circles += 1
+            elif isinstance(o, PolygonObstacle):
+                order.append((_POLYGON, len(polygons)))
+                polygons.append(np.asarray(o.vertices, dtype=float))
+        polygon_offsets = np.cumsum([0] + [len(v) for v in polygons])
+
+        artifacts = {
+            "rectangles": np.array(rectangles, dtype=float).reshape(-1, 5),
+            "polygon_vertices": np.vstack(polygons) if polygons else np.zeros((0, 2)),
+            "polygon_offsets": polygon_offsets.astype(np.intp),
+            "obstacle_order": np.array(order, dtype=np.intp).reshape(-1, 2),
+            "circles": circles,
+            "segments": segments,
+            "segment_starts": starts,
+        }
+        if occupancy:
+            artifacts["occupancy"] = map_env.get_occupancy_grid(resolution)
+        if distance_field:
+            artifacts["distance_field"] = map_env.get_distance_field(resolution)
+        for name, array in artifacts.items():
+            self._publish(name, np.ascontiguousarray(array))
+
+    def _publish(self, name: str, array: np.ndarray):
+        # SharedMemory does not accept size 0
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        view[...] = array
+        self._blocks.append(block)
+        self.handle.arrays[name] = (block.name, array.shape, array.dtype.str)
+
+    def close(self):
+        """Release and unlink all shared memory blocks."""
+        for block in self._blocks:
+            block.close()
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+
+    def __enter__(self) -> 'SharedMapArtifacts':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    try:
+        # Python >= 3.13: the owner alone is responsible for unlinking
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def attach_map(handle: SharedMapHandle) -> Map2D:
+    """
+    Build a Map2D backed by the shared artifacts described by handle.
+
+    No YAML is parsed and nothing published is rebuilt: obstacle objects
+    are thin wrappers around values read from the shared arrays, added in
+    the source map's order, and the raycast geometry cache (plus the
+    occupancy grid and distance field, if published) point straight at
+    the shared buffers (read-only).
+    """
+    blocks = []
+    arrays = {}
+    for name, (block_name, shape, dtype) in handle.arrays.items():
+        block = _attach_block(block_name)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        blocks.append(block)
+        arrays[name] = array
+
+    map_env = Map2D(handle.width, handle.height, safety_margin=handle.safety_margin)
+    map_env.start = handle.start
+    map_env.goal = handle.goal
+
+    offsets = arrays["polygon_offsets"]
+    for kind, i in arrays["obstacle_order"]:
+        if kind == _RECTANGLE:
+            x, y, width, height, angle = arrays["rectangles"][i]
+            map_env.add_obstacle(RectangleObstacle(x, y, width, height, angle))
+        elif kind == _CIRCLE:
+            x, y, radius = arrays["circles"][i]
+            map_env.add_obstacle(CircleObstacle(x, y, radius))
+        else:
+            map_env.add_obstacle(PolygonObstacle(vertices=arrays["polygon_vertices"][offsets[i]:offsets[i + 1]]))
+
+    # Seed the per-version caches with the shared arrays
+    map_env._ray_geometry = (arrays["circles"], arrays["segments"], arrays["segment_starts"])
+    map_env._ray_geometry_version = map_env.version
+    if "occupancy" in arrays:
+        map_env._occupancy_grids = {handle.resolution: arrays["occupancy"]}
+    if "distance_field" in arrays:
+        map_env._distance_fields = {handle.resolution: arrays["distance_field"]}
+    map_env._occupancy_grids_version = map_env.version
+
+    # Keep the blocks alive as long as the map
+    map_env._shared_blocks = blocks
+    return map_env
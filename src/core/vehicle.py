@@ -1,3 +1,4 @@
+import math
 import numpy as np
 from typing import Tuple, Optional
 from dataclasses import dataclass
@@ -20,6 +21,133 @@ class VehicleState:
     velocity: float = 0.0 # foward verlocity
     steering_angle: float = 0.0 # current steering angle
 
+INTEGRATORS = ("euler", "midpoint", "rk4", "arc")
+
+
+def wrap_angle(angle):
+    """Wrap angle(s) to [-pi, pi]."""
+    return np.arctan2(np.sin(angle), np.cos(angle))
+
+
+def _velocity_profile(velocity, acceleration, t, min_velocity, max_velocity):
+    """Velocity after accelerating for t seconds, saturated at the limits."""
+    return np.clip(velocity + acceleration * t, min_velocity, max_velocity)
+
+
+def _travel_distance(velocity, acceleration, h, min_velocity, max_velocity):
+    """
+    Exact distance covered in h seconds under constant (saturating) acceleration.
+
+    The speed ramps linearly until it hits a velocity limit at time tc and
+    stays there for the rest of the step.
+    """
+    v_limit = np.where(acceleration > 0, max_velocity, min_velocity)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tc = np.where(acceleration != 0, (v_limit - velocity) / acceleration, h)
+    tc = np.clip(tc, 0.0, h)
+    v_end = _velocity_profile(velocity, acceleration, h, min_velocity, max_velocity)
+    return velocity * tc + 0.5 * acceleration * tc**2 + v_end * (h - tc)
+
+
+def integrate_bicycle(x, y, theta, velocity,
+                      acceleration, steering_angle,
+                      dt: float, wheelbase: float,
+                      min_velocity: float, max_velocity: float,
+                      integrator: str = "euler", substeps: int = 1):
+    """
+    Advance the kinematic bicycle model by dt seconds.
+
+    Works on scalars or on equally shaped arrays (one entry per vehicle).
+    Acceleration and steering are held constant over dt, which is split
+    into `substeps` internal steps.
+
+    Integrators:
+        euler: explicit Euler, position advanced with the old heading
+        midpoint: 2nd order Runge-Kutta
+        rk4: classic 4th order Runge-Kutta
+        arc: exact constant-curvature arc update
+
+    Returns:
+        (x, y, theta, velocity) after dt
+    """
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator: {integrator}")
+
+    h = dt / max(int(substeps), 1)
+    curvature = np.tan(steering_angle) / wheelbase
+
+    for _ in range(max(int(substeps), 1)):
+        if integrator == "euler":
+            new_velocity = _velocity_profile(velocity, acceleration, h, min_velocity, max_velocity)
+            moving = np.abs(new_velocity) >= 1e-3
+            new_theta = wrap_angle(theta + new_velocity * curvature * h)
+            new_x = x + new_velocity * np.cos(theta) * h
+            new_y = y + new_velocity * np.sin(theta) * h
+
+            x = np.where(moving, new_x, x)
+            y = np.where(moving, new_y, y)
+            theta = np.where(moving, new_theta, theta)
+            velocity = new_velocity
+
+        elif integrator == "arc":
+            ds = _travel_distance(velocity, acceleration, h, min_velocity, max_velocity)
+            d_theta = curvature * ds
+            # chord length of the arc; np.sinc(z) = sin(pi z) / (pi z)
+            chord = ds * np.sinc(d_theta / (2 * np.pi))
+            x = x + chord * np.cos(theta + d_theta / 2)
+            y = y + chord * np.sin(theta + d_theta / 2)
+            theta = wrap_angle(theta + d_theta)
+            velocity = _velocity_profile(velocity, acceleration, h, min_velocity, max_velocity)
+
+        else:
+            v_mid = _velocity_profile(velocity, acceleration, h / 2, min_velocity, max_velocity)
+            v_end = _velocity_profile(velocity, acceleration, h, min_velocity, max_velocity)
+
+            if integrator == "midpoint":
+                theta_mid = theta + 0.5 * h * velocity * curvature
+                x = x + h * v_mid * np.cos(theta_mid)
+                y = y + h * v_mid * np.sin(theta_mid)
+                theta = theta + h * v_mid * curvature
+            else:  # rk4
+                k1 = theta
+                k2 = theta + 0.5 * h * velocity * curvature
+                k3 = theta + 0.5 * h * v_mid * curvature
+                k4 = theta + h * v_mid * curvature
+                x = x + h / 6 * (velocity * np.cos(k1) + 2 * v_mid * np.cos(k2)
+                                 + 2 * v_mid * np.cos(k3) + v_end * np.cos(k4))
+                y = y + h / 6 * (velocity * np.sin(k1) + 2 * v_mid * np.sin(k2)
+                                 + 2 * v_mid * np.sin(k3) + v_end * np.sin(k4))
+                theta = theta + h / 6 * curvature * (velocity + 4 * v_mid + v_end)
+
+            theta = wrap_angle(theta)
+            velocity = v_end
+
+    return x, y, theta, velocity
+
+
+def _euler_step_scalar(x: float, y: float, theta: float, velocity: float,
+                       acceleration: float, steering_angle: float,
+                       dt: float, wheelbase: float,
+                       min_velocity: float, max_velocity: float):
+    """
+    Single explicit Euler step on Python floats.
+
+    Same update as integrate_bicycle(..., integrator="euler", substeps=1)
+    but with the math module, which avoids the NumPy call overhead on the
+    default per-step path of a single vehicle.
+    """
+    new_velocity = min(max(velocity + acceleration * dt, min_velocity), max_velocity)
+    if abs(new_velocity) < 1e-3:
+        return x, y, theta, new_velocity
+
+    curvature = math.tan(steering_angle) / wheelbase
+    new_theta = theta + new_velocity * curvature * dt
+    new_theta = math.atan2(math.sin(new_theta), math.cos(new_theta))
+    new_x = x + new_velocity * math.cos(theta) * dt
+    new_y = y + new_velocity * math.sin(theta) * dt
+    return new_x, new_y, new_theta, new_velocity
+
+
 class Vehicle:
     """
     2D Vehicle with bicycle kinematics model.
@@ -32,16 +160,27 @@ class Vehicle:
     Control: [acceleration, steering_angle]
     """
 
-    def __init__(self, config: Optional[VehicleConfig] = None):
+    def __init__(self, config: Optional[VehicleConfig] = None,
+                 dt: float = 0.1,
+                 integrator: str = "euler",
+                 substeps: int = 1):
         """
         Initialize vehicle.
         
         Args:
             config: Vehicle configuration. Uses default if None.
+            dt: Time step for simulation (seconds)
+            integrator: "euler", "midpoint", "rk4" or "arc" (exact constant-curvature)
+            substeps: Number of internal integration steps per update
         """
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator: {integrator}")
+
         self.config = config or VehicleConfig()
         self.state = VehicleState()
-        self.dt = 0.1 # time step for simulation (seconds)
+        self.dt = dt # time step for simulation (seconds)
+        self.integrator = integrator
+        self.substeps = max(int(substeps), 1)
 
     def reset(self, x: float = 0.0, y: float = 0.0, theta: float = 0.0):
         self.state = VehicleState(x=x, y=y, theta=theta)
@@ -61,6 +200,27 @@ class Vehicle:
             steering_angle: Desired steering angle (radians)
         """
 
+        max_reverse_speed = self.config.max_velocity / 2.0
+
+        if self.integrator == "euler" and self.substeps == 1:
+            # Scalar fast path for the default configuration
+            acceleration = min(max(float(acceleration), self.config.max_deceleration),
+                               self.config.max_acceleration)
+            steering_angle = min(max(float(steering_angle), -self.config.max_steering_angle),
+                                 self.config.max_steering_angle)
+            (self.state.x, self.state.y,
+             self.state.theta, self.state.velocity) = _euler_step_scalar(
+                float(self.state.x), float(self.state.y),
+                float(self.state.theta), float(self.state.velocity),
+                acceleration, steering_angle,
+                dt=self.dt,
+                wheelbase=self.config.wheelbase,
+                min_velocity=-max_reverse_speed,
+                max_velocity=self.config.max_velocity
+            )
+            self.state.steering_angle = steering_angle
+            return
+
         acceleration = np.clip(
             acceleration, 
             self.config.max_deceleration, 
@@ -72,25 +232,21 @@ class Vehicle:
             self.config.max_steering_angle
         )
 
-        new_velocity = self.state.velocity + acceleration * self.dt
-        max_reverse_speed = self.config.max_velocity / 2.0 
-        new_velocity = np.clip(new_velocity, -max_reverse_speed, self.config.max_velocity)
-
-        if abs(new_velocity) >= 1e-3:
-            theta_dot = (new_velocity / self.config.wheelbase) * np.tan(steering_angle)
-
-            new_theta = self.state.theta + theta_dot * self.dt
-            new_theta = np.arctan2(np.sin(new_theta), np.cos(new_theta)) # [-pi, pi]
-
-            new_x = self.state.x + new_velocity * np.cos(self.state.theta) * self.dt
-            new_y = self.state.y + new_velocity * np.sin(self.state.theta) * self.dt
-        else:
-            new_x, new_y, new_theta = self.state.x, self.state.y, self.state.theta
+        new_x, new_y, new_theta, new_velocity = integrate_bicycle(
+            self.state.x, self.state.y, self.state.theta, self.state.velocity,
+            acceleration, steering_angle,
+            dt=self.dt,
+            wheelbase=self.config.wheelbase,
+            min_velocity=-max_reverse_speed,
+            max_velocity=self.config.max_velocity,
+            integrator=self.integrator,
+            substeps=self.substeps
+        )
 
-        self.state.x = new_x
-        self.state.y = new_y
-        self.state.theta = new_theta
-        self.state.velocity = new_velocity
+        self.state.x = float(new_x)
+        self.state.y = float(new_y)
+        self.state.theta = float(new_theta)
+        self.state.velocity = float(new_velocity)
         self.state.steering_angle = steering_angle
 
     def get_position(self) -> Tuple[float, float]:
@@ -30,36 +30,61 @@ class AutonomousCarEnv(gym.Env):
         - Goal reached: +large reward
         - Time penalty: small negative per step
         - Smooth control: penalty for large actions
+
+    Action repeat:
+        With action_repeat = k, one step applies the action for k vehicle
+        updates. Collision and goal are checked after every update, and the
+        step ends early on the update where either happens. LIDAR and the
+        observation are computed once, at the end of the step. A step that
+        ends on a collision or the goal returns exactly the terminal reward
+        (-50 / +50), as with k = 1. Otherwise the reward is the sum of the
+        per-update rewards: progress, time and speed terms are exact, and
+        the safety term of every update uses the final LIDAR scan. `steps` and `max_steps` count vehicle updates, so an
+        episode keeps the same time budget for any k.
     """
 
     metadata = {'render_mode': {'human', 'rgb_array'}, 'render_fps': 60}
 
     def __init__(self, 
                  map_env: Optional[Map2D] = None,
-                 vehicle: Vehicle = Vehicle(),
+                 vehicle: Optional[Vehicle] = None,
                  max_steps: int = 1000,
                  num_lidar_rays: int = 16,
                  lidar_range: float = 20.0,
-                 render_mode: Optional[str] = None):
+                 render_mode: Optional[str] = None,
+                 lidar_method: str = "exact",
+                 lidar_resolution: float = 0.5,
+                 action_repeat: int = 1):
         """
         Initialize environment.
         
         Args:
             map_env: Map environment (creates default if None)
+            vehicle: Vehicle driven by this env (a new default Vehicle if None;
+                never share one instance between envs)
             max_steps: Maximum steps per episode
             num_lidar_rays: Number of LIDAR sensor rays
             lidar_range: Maximum LIDAR sensing distance
             render_mode: 'human' or 'rgb_array'
+            lidar_method: "exact" (analytic) or "grid" (DDA over occupancy grid)
+            lidar_resolution: Occupancy grid cell size for the "grid" method
+            action_repeat: Vehicle updates per step with the same action
         """
         super().__init__()
 
+        if action_repeat < 1:
+            raise ValueError(f"Invalid action_repeat: {action_repeat}")
+
         self.map_env = map_env or self._create_default_map()
         self.max_steps = max_steps
         self.num_lidar_rays = num_lidar_rays
         self.lidar_range = lidar_range
+        self.lidar_method = lidar_method
+        self.lidar_resolution = lidar_resolution
         self.render_mode = render_mode
+        self.action_repeat = int(action_repeat)
 
-        self.vehicle = vehicle
+        self.vehicle = vehicle if vehicle is not None else Vehicle()
 
         self.steps = 0
         self.prev_distance_to_goal = 0.0
@@ -86,6 +111,7 @@ class AutonomousCarEnv(gym.Env):
         self._lidar_cache_position = None
 
         self.renderer = None
+        self.rasterizer = None
     
     def _create_default_map(self) -> Map2D:
         map_env = Map2D(width=100, height=100)
@@ -153,48 +179,64 @@ class AutonomousCarEnv(gym.Env):
         acceleration = action[0] * self.vehicle.config.max_acceleration
         steering = action[1] * self.vehicle.config.max_steering_angle
         
-        # Update vehicle
-        self.vehicle.update(acceleration, steering)
-        
-        # Get observation
-        lidar_data, observation = self._get_observation()
-        
-        # Check termination conditions
         terminated = False
         truncated = False
         is_collision = False
         is_goal_reached = False
+        reward = 0.0
+        substeps = 0
 
-        vehicle_corners = self.vehicle.get_corners()
-        for corner in vehicle_corners:
-            if self.map_env.is_collision(corner[0], corner[1], 0):
-                is_collision = True
-                terminated = True
+        for _ in range(self.action_repeat):
+            # Update vehicle
+            self.vehicle.update(acceleration, steering)
+            self.steps += 1
+            substeps += 1
+
+            is_collision = self._check_collision()
+            terminated = is_collision
+        
+            # Check về đích
+            if self.map_env.goal:
+                distance_to_goal = self.vehicle.distance_to(*self.map_env.goal)
+                if distance_to_goal < 3.0:
+                    is_goal_reached = True
+
+            # Check max steps
+            if self.steps >= self.max_steps:
+                truncated = True
+
+            if is_collision or is_goal_reached or truncated or substeps == self.action_repeat:
+                break
+            # Intermediate update: everything but the LIDAR safety term
+            reward += self._calculate_reward(action, None, False, False)
         
-        # Check về đích
-        if self.map_env.goal:
-            distance_to_goal = self.vehicle.distance_to(*self.map_env.goal)
-            if distance_to_goal < 3.0:
-                is_goal_reached = True
+        # Get observation (LIDAR only once per step)
+        lidar_data, observation = self._get_observation()
 
         # Calculate reward
-        reward = self._calculate_reward(action, lidar_data, is_collision, is_goal_reached)
-
-        # Check max steps
-        self.steps += 1
-        if self.steps >= self.max_steps:
-            truncated = True
+        if is_collision or is_goal_reached:
+            # Terminal step: the same terminal reward as a single update
+            reward = self._calculate_reward(action, lidar_data, is_collision, is_goal_reached)
+        else:
+            reward += self._calculate_reward(action, lidar_data, False, False)
+            reward += (substeps - 1) * self._safety_penalty(lidar_data)
         
         # Update state
         self.total_reward += reward
         self.prev_action = action
         
-        info = self._get_info()
-
         info = self._get_info()
         info['lidar_data'] = lidar_data
+        info['substeps'] = substeps
         
         return observation, reward, terminated, truncated, info
+
+    def _check_collision(self) -> bool:
+        """True if any corner of the vehicle is inside an obstacle."""
+        for corner in self.vehicle.get_corners():
+            if self.map_env.is_collision(corner[0], corner[1], 0):
+                return True
+        return False
     
     def _get_observation(self) -> np.ndarray:
         """
@@ -247,6 +289,10 @@ class AutonomousCarEnv(gym.Env):
         observation = np.concatenate([vehicle_state, goal_info, lidar_data])
         return lidar_data, observation
 
+    def get_lidar_angles(self) -> np.ndarray:
+        """World-frame angles of the LIDAR rays for the current heading."""
+        return self.vehicle.state.theta + np.linspace(0, 2*np.pi, self.num_lidar_rays, endpoint=False)
+
     def _get_lidar_readings(self) -> np.ndarray:
         pos = self.vehicle.get_position()
         theta = self.vehicle.state.theta
@@ -255,31 +301,29 @@ class AutonomousCarEnv(gym.Env):
             if (np.allclose(pos, cached_pos, atol=0.01) and 
                 np.isclose(theta, cached_theta, atol=0.01)):
                 return self._lidar_cache
-        readings = np.ones(self.num_lidar_rays, dtype=np.float32)
-        
-        ray_angles = theta + np.linspace(0, 2*np.pi, self.num_lidar_rays, endpoint=False)
-        
-        step_size = 1.0 
-        max_steps = int(self.lidar_range / step_size)
-        cos_angles = np.cos(ray_angles)
-        sin_angles = np.sin(ray_angles)
-        for i, angle in enumerate(ray_angles):
-            cos_a, sin_a = cos_angles[i], sin_angles[i]
-            for step in range(1, max_steps + 1):
-                dist = step * step_size
-                rx = pos[0] + dist * cos_a
-                ry = pos[1] + dist * sin_a
-                
-                if self.map_env.is_collision(rx, ry, 0):
-                    readings[i] = dist / self.lidar_range
-                    break
+        ray_angles = self.get_lidar_angles()
+        
+        # Hit distances for all rays in one call, normalized to [0, 1]
+        distances = self.map_env.raycast(
+            np.array(pos, dtype=float), ray_angles, self.lidar_range,
+            method=self.lidar_method, resolution=self.lidar_resolution
+        )
+        readings = (distances / self.lidar_range).astype(np.float32)
         self._lidar_cache = readings.copy()
         pos_array = np.array(pos) if not isinstance(pos, np.ndarray) else pos
         self._lidar_cache_position = (pos_array.copy(), theta)
         return readings
     
-    def _calculate_reward(self, action: np.ndarray, lidar_data: np.ndarray, 
+    def _safety_penalty(self, lidar_data: np.ndarray) -> float:
+        """Penalty for being close to obstacles (normalized LIDAR readings)."""
+        min_lidar = np.min(lidar_data)
+        if min_lidar < 0.4:
+            return -10.0 * (0.4 - min_lidar) # Giống Code 1
+        return 0.0
+
+    def _calculate_reward(self, action: np.ndarray, lidar_data: Optional[np.ndarray], 
                          is_collision: bool, is_goal_reached: bool) -> float:
+        """Reward of one vehicle update; lidar_data None skips the safety term."""
         # Quay về các trọng số cơ bản giống Code 1
         reward = 0.0
         
@@ -299,9 +343,8 @@ class AutonomousCarEnv(gym.Env):
             self.prev_distance_to_goal = current_distance
 
         # 3. SAFETY PENALTY (Nhẹ nhàng thôi)
-        min_lidar = np.min(lidar_data)
-        if min_lidar < 0.4:
-             reward -= 10.0 * (0.4 - min_lidar) # Giống Code 1
+        if lidar_data is not None:
+            reward += self._safety_penalty(lidar_data)
 
         # 4. TIME PENALTY (Để khuyến khích đi nhanh một cách tự nhiên)
         reward -= 0.5 
@@ -359,12 +402,7 @@ class AutonomousCarEnv(gym.Env):
             if event.type == pygame.QUIT:
                 self.close()
         
-        self.renderer.clear()
-        self.renderer.draw_grid()
-        self.renderer.draw_map(self.map_env)
-        
-        if self.map_env.start and self.map_env.goal:
-            self.renderer.draw_start_goal(self.map_env.start, self.map_env.goal)
+        self.renderer.draw_background(self.map_env, self.map_env.start, self.map_env.goal)
         
         self.renderer.draw_vehicle(self.vehicle)
         
@@ -375,40 +413,31 @@ class AutonomousCarEnv(gym.Env):
         self.renderer.update()
     
     def _render_rgb_array(self):
-        """Render as RGB array."""
-        if self.renderer is None:
-            from src.simulation.renderer import Renderer
-            self.renderer = Renderer(
-                screen_width=400,
-                screen_height=400,
-                world_width=self.map_env.width,
-                world_height=self.map_env.height
+        """Render as RGB array (pure NumPy, no pygame)."""
+        if self.rasterizer is None or self.rasterizer.map_env is not self.map_env:
+            from src.simulation.raster import FrameRasterizer
+            self.rasterizer = FrameRasterizer(
+                self.map_env, width=400, height=400,
+                vehicle_config=self.vehicle.config
             )
         
-        self.renderer.clear()
-        self.renderer.draw_map(self.map_env)
-        self.renderer.draw_vehicle(self.vehicle)
-        
-        import pygame
-        # Convert pygame surface to RGB array
-        img = pygame.surfarray.array3d(self.renderer.screen)
-        img = np.transpose(img, (1, 0, 2))
-        
-        return img
+        state = self.vehicle.state
+        frame = self.rasterizer.render(
+            state.x, state.y, state.theta,
+            lidar_angles=self.get_lidar_angles(),
+            lidar_distances=self._get_lidar_readings() * self.lidar_range
+        )
+        return frame.copy()
     
     def _draw_lidar_rays(self):
         """Draw LIDAR sensor rays."""
-        pos = self.vehicle.get_position()
-        theta = self.vehicle.state.theta
-        
         lidar_readings = self._get_lidar_readings()
         
-        for i in range(self.num_lidar_rays):
-            ray_angle = theta + (2 * np.pi * i / self.num_lidar_rays)
-            distance = lidar_readings[i] * self.lidar_range
-            
-            end_x = pos[0] + distance * np.cos(ray_angle)
-            end_y = pos[1] + distance * np.sin(ray_angle)
+        self.renderer.draw_lidar_rays(
+            self.vehicle.get_position(),
+            self.get_lidar_angles(),
+            lidar_readings * self.lidar_range
+        )
     
     def close(self):
         """Clean up resources."""
@@ -0,0 +1,226 @@
+import numpy as np
+from typing import List, Optional, Tuple
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+
+# Activation modules (class name) -> NumPy implementation key
+ACTIVATIONS = {
+    "Tanh": "tanh",
+    "ReLU": "relu",
+    "ELU": "elu",
+    "LeakyReLU": "leaky_relu",
+    "Identity": "identity",
+}
+
+
+def _activate(x: np.ndarray, name: str) -> np.ndarray:
+    if name == "tanh":
+        return np.tanh(x, out=x)
+    if name == "relu":
+        return np.maximum(x, 0.0, out=x)
+    if name == "elu":
+        return np.where(x > 0, x, np.expm1(np.minimum(x, 0.0))).astype(x.dtype)
+    if name == "leaky_relu":
+        return np.where(x > 0, x, 0.01 * x).astype(x.dtype)
+    if name == "identity":
+        return x
+    raise ValueError(f"Unknown activation: {name}")
+
+
+class NumpyPolicy:
+    """
+    Deterministic actor of a trained Stable-Baselines3 MlpPolicy in plain NumPy.
+
+    Weights are exported once from a saved PPO/SAC zip (export_policy(),
+    which needs torch) into an .npz; loading and running the .npz only
+    needs NumPy. The forward pass is batched (float32 matmuls) and
+    reproduces model.predict(obs, deterministic=True):
+        PPO: Gaussian mean, clipped to the action bounds
+        SAC: tanh-squashed mean, rescaled to the action bounds
+
+    predict() has the same signature as the SB3 method, so it can replace
+    the model in the evaluation loops.
+    """
+
+    def __init__(self, weights: List[np.ndarray], biases: List[np.ndarray],
+                 activations: List[str], output: str,
+                 low: np.ndarray, high: np.ndarray, obs_shape: Tuple[int, ...]):
+        """
+        Initialize policy.
+
+        Args:
+            weights: Per layer (in, out) matrices
+            biases: Per layer (out,) vectors
+            activations: Activation after each hidden layer (len(weights) - 1)
+            output: "clip" (PPO) or "tanh" (SAC squashing)
+            low, high: Action bounds
+            obs_shape: Observation shape of one env
+        """
+        if len(activations) != len(weights) - 1:
+            raise ValueError("Need one activation per hidden layer")
+        if output not in ("clip", "tanh"):
+            raise ValueError(f"Unknown output mode: {output}")
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activations = list(activations)
+        self.output = output
+        self.low = np.asarray(low, dtype=np.float32)
+        self.high = np.asarray(high, dtype=np.float32)
+        self.obs_shape = tuple(int(d) for d in obs_shape)
+        self.obs_dim = int(np.prod(self.obs_shape))
+
+    @classmethod
+    def load(cls, path: str) -> 'NumpyPolicy':
+        """Load an .npz written by export_policy()."""
+        with np.load(path, allow_pickle=False) as data:
+            n = int(data["num_layers"])
+            return cls(
+                weights=[data[f"w{i}"] for i in range(n)],
+                biases=[data[f"b{i}"] for i in range(n)],
+                activations=[str(a) for a in data["activations"]],
+                output=str(data["output"]),
+                low=data["low"],
+                high=data["high"],
+                obs_shape=tuple(data["obs_shape"])
+            )
+
+    def save(self, path: str):
+        """Write the weights as an .npz (no pickled objects)."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        arrays = {f"w{i}": w for i, w in enumerate(self.weights)}
+        arrays.update({f"b{i}": b for i, b in enumerate(self.biases)})
+        np.savez(
+            path,
+            num_layers=len(self.weights),
+            activations=np.array(self.activations, dtype=str),
+            output=np.array(self.output),
+            low=self.low,
+            high=self.high,
+            obs_shape=np.array(self.obs_shape),
+            **arrays
+        )
+
+    def forward(self, obs: np.ndarray) -> np.ndarray:
+        """
+        Deterministic actions for a batch of observations.
+
+        Args:
+            obs: (N, *obs_shape) observations
+
+        Returns:
+            (N, action_dim) float32 actions within the action bounds
+        """
+        x = np.asarray(obs, dtype=np.float32).reshape(-1, self.obs_dim)
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w
+            x += b
+            if i < last:
+                x = _activate(x, self.activations[i])
+
+        if self.output == "tanh":
+            np.tanh(x, out=x)
+            return self.low + 0.5 * (x + 1.0) * (self.high - self.low)
+        return np.clip(x, self.low, self.high, out=x)
+
+    def predict(self, observation: np.ndarray, state=None, episode_start=None,
+                deterministic: bool = True) -> Tuple[np.ndarray, None]:
+        """
+        SB3-compatible predict (deterministic only).
+
+        Args:
+            observation: One observation or a (N, *obs_shape) batch
+
+        Returns:
+            (actions, None); actions has no batch axis for a single observation
+        """
+        if not deterministic:
+            raise ValueError("NumpyPolicy only supports deterministic actions")
+        observation = np.asarray(observation)
+        actions = self.forward(observation)
+        if observation.shape == self.obs_shape:
+            return actions[0], None
+        return actions, None
+
+    def __repr__(self) -> str:
+        sizes = [self.weights[0].shape[0]] + [w.shape[1] for w in self.weights]
+        return f"NumpyPolicy({'-'.join(map(str, sizes))}, {self.output})"
+
+
+def _collect_mlp(modules) -> Tuple[List[np.ndarray], List[np.ndarray], List[str]]:
+    """Linear weights/biases and the activation after each of them, in order."""
+    import torch.nn as nn
+
+    weights, biases, activations = [], [], []
+    for module in modules:
+        if isinstance(module, nn.Linear):
+            weights.append(module.weight.detach().cpu().numpy().T)
+            biases.append(module.bias.detach().cpu().numpy())
+            activations.append("identity")
+        elif type(module).__name__ in ACTIVATIONS:
+            if not weights:
+                raise ValueError("Activation before the first linear layer")
+            activations[-1] = ACTIVATIONS[type(module).__name__]
+        else:
+            raise ValueError(f"Unsupported layer: {type(module).__name__}")
+    return weights, biases, activations
+
+
+def export_policy(model_path: str, output_path: Optional[str] = None,
+                  algorithm: str = "ppo") -> NumpyPolicy:
+    """
+    Extract the deterministic actor of a saved SB3 model into an .npz.
+
+    Only MlpPolicy with a flatten feature extractor is supported (no gSDE,
+    no image inputs). Requires stable-baselines3 and torch; the result does
+    not.
+
+    Args:
+        model_path: Saved model (.zip)
+        output_path: .npz to write (default: model path with .npz suffix)
+        algorithm: "ppo" or "sac"
+
+    Returns:
+        The exported NumpyPolicy
+    """
+    from stable_baselines3.common.torch_layers import FlattenExtractor
+
+    if algorithm == "ppo":
+        from stable_baselines3 import PPO
+        model = PPO.load(model_path, device="cpu")
+        policy = model.policy
+        extractor = policy.pi_features_extractor
+        hidden = list(policy.mlp_extractor.policy_net)
+        head = [policy.action_net]
+        output = "tanh" if policy.squash_output else "clip"
+        if policy.use_sde:
+            raise ValueError("gSDE policies are not supported")
+    elif algorithm == "sac":
+        from stable_baselines3 import SAC
+        model = SAC.load(model_path, device="cpu")
+        actor = model.policy.actor
+        extractor = actor.features_extractor
+        hidden = list(actor.latent_pi)
+        head = [actor.mu]
+        output = "tanh"
+        if actor.use_sde:
+            raise ValueError("gSDE policies are not supported")
+    else:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+    if not isinstance(extractor, FlattenExtractor):
+        raise ValueError(f"Unsupported features extractor: {type(extractor).__name__}")
+
+    weights, biases, activations = _collect_mlp(hidden + head)
+    if activations[-1] != "identity":
+        raise ValueError("Unexpected activation after the action layer")
+
+    space = model.action_space
+    result = NumpyPolicy(weights, biases, activations[:-1], output,
+                         space.low, space.high, model.observation_space.shape)
+    output_path = output_path or str(Path(model_path).with_suffix(".npz"))
+    result.save(output_path)
+    print(f"Exported {result} to {output_path}")
+    return result
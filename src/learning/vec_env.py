@@ -0,0 +1,338 @@
+import numpy as np
+from gymnasium import spaces
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv, VecEnvIndices, VecEnvObs, VecEnvStepReturn
+
+from src.core.vehicle import VehicleConfig, integrate_bicycle
+from src.core.map import Map2D
+
+
+class AutonomousCarVecEnv(VecEnv):
+    """
+    Native vectorized version of AutonomousCarEnv.
+
+    Steps N cars on the same map in lockstep. Vehicle dynamics, LIDAR,
+    collision checks, rewards and auto-resets are computed on arrays of
+    shape (num_envs, ...) instead of one Python env per car.
+
+    Observations, actions and rewards follow AutonomousCarEnv exactly,
+    so policies trained on either are interchangeable.
+    """
+
+    def __init__(self,
+                 map_env: Map2D,
+                 num_envs: int = 8,
+                 vehicle_config: Optional[VehicleConfig] = None,
+                 max_steps: int = 1000,
+                 num_lidar_rays: int = 16,
+                 lidar_range: float = 20.0,
+                 dt: float = 0.1,
+                 integrator: str = "euler",
+                 substeps: int = 1,
+                 random_heading: bool = False,
+                 lidar_method: str = "exact",
+                 lidar_resolution: float = 0.5,
+                 render_mode: Optional[str] = None,
+                 render_size: Tuple[int, int] = (400, 400)):
+        """
+        Initialize vectorized environment.
+
+        Args:
+            map_env: Map shared by all cars
+            num_envs: Number of cars stepped in lockstep
+            vehicle_config: Vehicle configuration (uses default if None)
+            max_steps: Maximum steps per episode
+            num_lidar_rays: Number of LIDAR sensor rays
+            lidar_range: Maximum LIDAR sensing distance
+            dt, integrator, substeps: Vehicle integration settings
+            random_heading: Randomize initial heading on reset
+            lidar_method: "exact" (analytic) or "grid" (DDA over occupancy grid)
+            lidar_resolution: Occupancy grid cell size for the "grid" method
+            render_mode: None or 'rgb_array' (frames from get_images())
+            render_size: (width, height) of each car's frame
+        """
+        self.map_env = map_env
+        self.vehicle_config = vehicle_config or VehicleConfig()
+        self.max_steps = max_steps
+        self.num_lidar_rays = num_lidar_rays
+        self.lidar_range = lidar_range
+        self.dt = dt
+        self.integrator = integrator
+        self.substeps = substeps
+        self.random_heading = random_heading
+        self.lidar_method = lidar_method
+        self.lidar_resolution = lidar_resolution
+        self.render_mode = render_mode
+        self.render_size = render_size
+        self._rasterizer = None
+
+        action_space = spaces.Box(low=-1.0, high=1.0, shape=(2,), dtype=np.float32)
+        obs_dim = 7 + 4 + self.num_lidar_rays
+        observation_space = spaces.Box(low=-np.inf, high=np.inf, shape=(obs_dim,), dtype=np.float32)
+        super().__init__(num_envs, observation_space, action_space)
+
+        # Batched vehicle state
+        self.x = np.zeros(num_envs)
+        self.y = np.zeros(num_envs)
+        self.theta = np.zeros(num_envs)
+        self.velocity = np.zeros(num_envs)
+        self.steering = np.zeros(num_envs)
+
+        # Batched episode state
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.total_reward = np.zeros(num_envs)
+        self.prev_distance_to_goal = np.zeros(num_envs)
+
+        self._actions: Optional[np.ndarray] = None
+        self._rng = np.random.default_rng()
+
+        # Constant geometry
+        self._ray_offsets = np.linspace(0, 2*np.pi, self.num_lidar_rays, endpoint=False)
+        half_length = self.vehicle_config.length / 2
+        half_width = self.vehicle_config.width / 2
+        self._corners_local = np.array([
+            [half_length, half_width],
+            [half_length, -half_width],
+            [-half_length, -half_width],
+            [-half_length, half_width]
+        ])
+
+    # ------------------------------------------------------------------
+    # VecEnv API
+    # ------------------------------------------------------------------
+
+    def reset(self) -> VecEnvObs:
+        seed = self._seeds[0] if self._seeds and self._seeds[0] is not None else None
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        self._reset_seeds()
+
+        self._reset_indices(np.arange(self.num_envs))
+        self.reset_infos = [{} for _ in range(self.num_envs)]
+        lidar, obs = self._get_observation()
+        return obs
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions, dtype=np.float64).reshape(self.num_envs, 2)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        actions = self._actions
+        cfg = self.vehicle_config
+
+        acceleration = np.clip(actions[:, 0] * cfg.max_acceleration,
+                               cfg.max_deceleration, cfg.max_acceleration)
+        steering = np.clip(actions[:, 1] * cfg.max_steering_angle,
+                           -cfg.max_steering_angle, cfg.max_steering_angle)
+
+        # Batched vehicle update
+        self.x, self.y, self.theta, self.velocity = integrate_bicycle(
+            self.x, self.y, self.theta, self.velocity,
+            acceleration, steering,
+            dt=self.dt,
+            wheelbase=cfg.wheelbase,
+            min_velocity=-cfg.max_velocity / 2.0,
+            max_velocity=cfg.max_velocity,
+            integrator=self.integrator,
+            substeps=self.substeps
+        )
+        self.steering = steering
+
+        lidar_data, observation = self._get_observation()
+
+        is_collision = self._check_collisions()
+        distance_to_goal = self._distance_to_goal()
+        is_goal_reached = distance_to_goal < 3.0
+
+        rewards = self._calculate_rewards(lidar_data, is_collision, is_goal_reached, distance_to_goal)
+
+        self.steps += 1
+        self.total_reward += rewards
+
+        terminated = is_collision
+        truncated = self.steps >= self.max_steps
+        dones = terminated | truncated
+
+        infos: List[Dict[str, Any]] = []
+        for i in range(self.num_envs):
+            info = {
+                'steps': int(self.steps[i]),
+                'total_reward': float(self.total_reward[i]),
+                'lidar_data': lidar_data[i],
+            }
+            if self.map_env.goal:
+                info['distance_to_goal'] = float(distance_to_goal[i])
+                info['position'] = (self.x[i], self.y[i])
+            if dones[i]:
+                info['terminal_observation'] = observation[i].copy()
+                info['TimeLimit.truncated'] = bool(truncated[i] and not terminated[i])
+            infos.append(info)
+
+        # Batched auto-reset
+        done_idx = np.flatnonzero(dones)
+        if len(done_idx) > 0:
+            self._reset_indices(done_idx)
+            _, observation[done_idx] = self._get_observation(done_idx)
+
+        return observation, rewards.astype(np.float32), dones, infos
+
+    def close(self) -> None:
+        pass
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        return [getattr(self, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args,
+                   indices: VecEnvIndices = None, **method_kwargs) -> List[Any]:
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class: Type, indices: VecEnvIndices = None) -> List[bool]:
+        return [False for _ in self._get_indices(indices)]
+
+    # ------------------------------------------------------------------
+    # Batched simulation
+    # ------------------------------------------------------------------
+
+    def _reset_indices(self, idx: np.ndarray):
+        """Reset the cars at the given indices to the map start."""
+        if self.map_env.start:
+            start_x, start_y = self.map_env.start
+        else:
+            start_x, start_y = 10, 10
+
+        self.x[idx] = start_x
+        self.y[idx] = start_y
+        if self.random_heading:
+            self.theta[idx] = self._rng.uniform(-np.pi, np.pi, size=len(idx))
+        else:
+            self.theta[idx] = 0.0
+        self.velocity[idx] = 0.0
+        self.steering[idx] = 0.0
+
+        self.steps[idx] = 0
+        self.total_reward[idx] = 0.0
+        self.prev_distance_to_goal[idx] = self._distance_to_goal(idx) if self.map_env.goal else 0.0
+
+    def _distance_to_goal(self, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        idx = slice(None) if idx is None else idx
+        if not self.map_env.goal:
+            return np.full_like(self.x[idx], np.inf)
+        goal_x, goal_y = self.map_env.goal
+        return np.hypot(goal_x - self.x[idx], goal_y - self.y[idx])
+
+    def _get_observation(self, idx: Optional[np.ndarray] = None):
+        """
+        Build observations for the cars at idx (all cars if None).
+
+        Returns:
+            lidar_data (n, num_rays), observation (n, obs_dim)
+        """
+        idx = slice(None) if idx is None else idx
+        x, y, theta = self.x[idx], self.y[idx], self.theta[idx]
+        v, steering = self.velocity[idx], self.steering[idx]
+        cfg = self.vehicle_config
+        width, height = self.map_env.width, self.map_env.height
+
+        n = len(x)
+        observation = np.empty((n, self.observation_space.shape[0]), dtype=np.float32)
+
+        cos_t, sin_t = np.cos(theta), np.sin(theta)
+        observation[:, 0] = x / width
+        observation[:, 1] = y / height
+        observation[:, 2] = v * cos_t / cfg.max_velocity
+        observation[:, 3] = v * sin_t / cfg.max_velocity
+        observation[:, 4] = sin_t
+        observation[:, 5] = cos_t
+        observation[:, 6] = steering / cfg.max_steering_angle
+
+        if self.map_env.goal:
+            goal_x, goal_y = self.map_env.goal
+            dx = goal_x - x
+            dy = goal_y - y
+            angle = np.arctan2(dy, dx) - theta
+            angle = np.arctan2(np.sin(angle), np.cos(angle))
+            observation[:, 7] = dx / width
+            observation[:, 8] = dy / height
+            observation[:, 9] = np.hypot(dx, dy) / np.sqrt(width**2 + height**2)
+            observation[:, 10] = angle / np.pi
+        else:
+            observation[:, 7:11] = 0.0
+
+        lidar_data = self._get_lidar_readings(x, y, theta)
+        observation[:, 11:] = lidar_data
+        return lidar_data, observation
+
+    def _get_lidar_readings(self, x: np.ndarray, y: np.ndarray, theta: np.ndarray) -> np.ndarray:
+        """
+        Batched LIDAR: hit distances for all (car, ray) pairs in one call.
+        """
+        ray_angles = theta[:, None] + self._ray_offsets[None, :]
+        distances = self.map_env.raycast(
+            np.stack([x, y], axis=1), ray_angles, self.lidar_range,
+            method=self.lidar_method, resolution=self.lidar_resolution
+        )
+        return (distances / self.lidar_range).astype(np.float32)
+
+    def _check_collisions(self) -> np.ndarray:
+        """Check all four footprint corners of every car."""
+        cos_t, sin_t = np.cos(self.theta), np.sin(self.theta)
+        local_x = self._corners_local[:, 0][None, :]
+        local_y = self._corners_local[:, 1][None, :]
+        corners_x = self.x[:, None] + local_x * cos_t[:, None] - local_y * sin_t[:, None]
+        corners_y = self.y[:, None] + local_x * sin_t[:, None] + local_y * cos_t[:, None]
+        return self.map_env.is_collision_batch(corners_x, corners_y, 0).any(axis=1)
+
+    def _calculate_rewards(self, lidar_data: np.ndarray,
+                           is_collision: np.ndarray,
+                           is_goal_reached: np.ndarray,
+                           distance_to_goal: np.ndarray) -> np.ndarray:
+        """Batched AutonomousCarEnv._calculate_reward."""
+        terminal = is_collision | is_goal_reached
+        rewards = np.zeros(self.num_envs)
+
+        # Progress reward (prev distance only advances on non-terminal steps)
+        if self.map_env.goal:
+            progress = self.prev_distance_to_goal - distance_to_goal
+            rewards += progress * 2.0
+            self.prev_distance_to_goal = np.where(terminal, self.prev_distance_to_goal, distance_to_goal)
+
+        # Safety penalty
+        min_lidar = lidar_data.min(axis=1)
+        rewards -= np.where(min_lidar < 0.4, 10.0 * (0.4 - min_lidar), 0.0)
+
+        # Time penalty and speed shaping
+        rewards -= 0.5
+        rewards += self.velocity * 0.2
+        rewards -= np.where(self.velocity < 0.1, 1.0, 0.0)
+
+        rewards = np.where(is_goal_reached, 50.0, rewards)
+        rewards = np.where(is_collision, -50.0, rewards)
+        return rewards
+
+    def get_images(self) -> Sequence[Optional[np.ndarray]]:
+        """
+        One RGB frame per car, rasterized in a single batched NumPy pass
+        (no pygame/SDL). The frames are views into a buffer reused by the
+        next call.
+        """
+        if self._rasterizer is None or self._rasterizer.map_env is not self.map_env:
+            from src.simulation.raster import FrameRasterizer
+            self._rasterizer = FrameRasterizer(
+                self.map_env, width=self.render_size[0], height=self.render_size[1],
+                vehicle_config=self.vehicle_config
+            )
+        
+        lidar = self._get_lidar_readings(self.x, self.y, self.theta)
+        frames = self._rasterizer.render_batch(
+            self.x, self.y, self.theta,
+            lidar_angles=self.theta[:, None] + self._ray_offsets[None, :],
+            lidar_distances=lidar * self.lidar_range
+        )
+        return list(frames)
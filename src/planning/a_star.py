@@ -9,13 +9,25 @@ sys.path.append(str(pathlib_Path(__file__).resolve().parents[2]))
 
 from src.planning.base_planner import BasePlanner, PathPoint, Path
 from src.core.map import Map2D
+from src.core.occupancy_grid import OccupancyGrid
 
 class AStarPlanner(BasePlanner):
     def __init__(self, map_env: Map2D, grid_resolution: float = 0.5, 
                  max_iterations: int = 10000, heuristic_weight: float = 1.0,
-                 spacing: float = 3.0):
+                 spacing: float = 3.0, occupancy: Optional[OccupancyGrid] = None):
+        """
+        Args:
+            map_env: Map (bounds, and obstacles unless occupancy is given)
+            grid_resolution: Search grid cell size (ignored with occupancy)
+            max_iterations: Node expansion limit
+            heuristic_weight: Weight of the Euclidean heuristic
+            spacing: Waypoint spacing of the returned path
+            occupancy: Live grid to search instead of rasterizing map_env;
+                its inflated free mask is used by reference, so updates
+                are seen by the next plan() without rebuilding
+        """
         self.map_env = map_env
-        self.grid_resolution = grid_resolution
+        self.grid_resolution = occupancy.resolution if occupancy is not None else grid_resolution
         self.max_iterations = max_iterations
         self.heuristic_weight = heuristic_weight
         self.spacing = spacing
@@ -23,7 +35,12 @@ class AStarPlanner(BasePlanner):
         self.grid_width = int(np.ceil(self.map_env.width / self.grid_resolution))
         self.grid_height = int(np.ceil(self.map_env.height / self.grid_resolution))
 
-        self.occupancy_grid = self._create_occupancy_grid()
+        if occupancy is not None:
+            if occupancy.free.shape != (self.grid_width, self.grid_height):
+                raise ValueError(f"Occupancy grid shape {occupancy.free.shape} does not match map")
+            self.occupancy_grid = occupancy.free
+        else:
+            self.occupancy_grid = self._create_occupancy_grid()
     
     def _create_occupancy_grid(self) -> np.ndarray:
         grid = np.zeros((self.grid_width, self.grid_height), dtype=bool)
@@ -91,6 +91,13 @@ class BasePlanner(ABC):
         self.planning_time: float = 0.0
         self.iterations: int = 0
     
+    def get_progress(self) -> float:
+        """Fraction of the iteration budget used by the current/last plan() call."""
+        max_iterations = getattr(self, 'max_iterations', 0)
+        if not max_iterations:
+            return 0.0
+        return min(self.iterations / max_iterations, 1.0)
+    
     @abstractmethod
     def plan(self, start: Tuple[float, float], goal: Tuple[float, float], **kwargs) -> Optional[Path]:
         """
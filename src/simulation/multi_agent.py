@@ -0,0 +1,449 @@
+import numpy as np
+import contextlib
+import io
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.core.vehicle import Vehicle, integrate_bicycle
+from src.core.spatial_hash import SpatialHash, oriented_boxes_overlap
+from src.planning.base_planner import Path as PlannedPath
+from src.simulation.simulator import Simulator, SimulationState
+from src.utils.config_loader import ConfigLoader
+
+
+class AgentStatus:
+    """Agent lifecycle states."""
+    ACTIVE = "active"
+    ARRIVED = "arrived"
+    COLLIDED = "collided"
+    NO_PATH = "no_path"
+
+
+AGENT_COLORS = [
+    (0, 100, 255), (255, 140, 0), (148, 0, 211), (0, 160, 120),
+    (220, 20, 60), (30, 144, 255), (154, 205, 50), (255, 105, 180),
+]
+
+
+@dataclass
+class Agent:
+    """One vehicle of the fleet with its own route and controller."""
+    vehicle: Vehicle
+    controller: Any
+    start: Tuple[float, float]
+    goal: Tuple[float, float]
+    path: Optional[PlannedPath] = None
+    status: str = AgentStatus.ACTIVE
+    steps: int = 0
+    distance: float = 0.0
+
+
+@dataclass
+class MultiAgentResult:
+    """Outcome of a headless multi-agent run."""
+    num_agents: int
+    arrived: int
+    collided: int
+    vehicle_collisions: int
+    no_path: int
+    steps: int
+    agents: List[Dict[str, Any]] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class MultiAgentSimulator(Simulator):
+    """
+    K vehicles planning and tracking on one Map2D.
+
+    Agent 0 drives the map's start -> goal with the base simulator's
+    vehicle and controller; the others come from `multi_agent.agents` in
+    the config or are spawned at random free positions. Controllers run
+    per agent, dynamics are integrated for all active agents in one
+    vectorized call, and vehicle-vehicle footprint collisions are found
+    with a per-step spatial hash followed by an exact oriented-box test.
+
+    Arrived agents leave the road; collided agents stay as obstacles.
+    """
+
+    def __init__(self, config: Optional[ConfigLoader] = None,
+                 num_agents: Optional[int] = None,
+                 headless: bool = False,
+                 seed: Optional[int] = None):
+        """
+        Initialize multi-agent simulator.
+
+        Args:
+            config: Configuration loader (uses default if None)
+            num_agents: Fleet size (default: multi_agent.num_agents)
+            headless: Never create a Renderer or initialize pygame
+            seed: Seed for random start/goal spawning (default: multi_agent.seed)
+        """
+        super().__init__(config, headless=headless)
+
+        ma_cfg = self.config.get("multi_agent", {})
+        self.num_agents = int(num_agents or ma_cfg.get("num_agents", 8))
+        self.min_separation = ma_cfg.get("min_separation", 8.0)
+        self.goal_threshold = ma_cfg.get("goal_threshold", 2.0)
+        self.rng = np.random.default_rng(ma_cfg.get("seed", 0) if seed is None else seed)
+
+        vehicle_cfg = self.vehicle.config
+        self.half_length = vehicle_cfg.length / 2
+        self.half_width = vehicle_cfg.width / 2
+        bounding_radius = np.hypot(self.half_length, self.half_width)
+        self.spatial_hash = SpatialHash(cell_size=2 * bounding_radius)
+
+        self.agents: List[Agent] = self._spawn_agents(ma_cfg.get("agents", []))
+        self.vehicle_collisions = 0
+        self._sync_arrays_from_vehicles()
+
+    def _spawn_agents(self, agent_cfgs: List[Dict[str, Any]]) -> List[Agent]:
+        """Create agents: map start/goal first, then configured, then random."""
+        agents = [Agent(self.vehicle, self.controller, self.map_env.start, self.map_env.goal)]
+        occupied = [self.map_env.start, self.map_env.goal]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(1, self.num_agents):
+                if i - 1 < len(agent_cfgs):
+                    cfg = agent_cfgs[i - 1]
+                    start, goal = tuple(cfg["start"]), tuple(cfg["goal"])
+                    ctrl_type = cfg.get("controller")
+                else:
+                    start = self._sample_free_position(occupied)
+                    goal = self._sample_free_position(occupied + [start])
+                    ctrl_type = None
+                occupied += [start, goal]
+
+                vehicle = self._load_vehicle()
+                vehicle.reset(start[0], start[1])
+                controller = self._load_controller(vehicle, ctrl_type)
+                agents.append(Agent(vehicle, controller, start, goal))
+
+        print(f"Spawned {len(agents)} agents")
+        return agents
+
+    def _sample_free_position(self, occupied: List[Tuple[float, float]],
+                              max_tries: int = 10000) -> Tuple[float, float]:
+        """Random collision-free position away from other starts/goals."""
+        occupied_arr = np.array(occupied, dtype=float).reshape(-1, 2)
+        for _ in range(max_tries):
+            x = self.rng.uniform(0, self.map_env.width)
+            y = self.rng.uniform(0, self.map_env.height)
+            if self.map_env.is_collision(x, y):
+                continue
+            if len(occupied_arr) and np.min(np.hypot(occupied_arr[:, 0] - x, occupied_arr[:, 1] - y)) < self.min_separation:
+                continue
+            return (float(x), float(y))
+        raise ValueError("Could not find a free spawn position, reduce num_agents or min_separation")
+
+    def _sync_arrays_from_vehicles(self):
+        """Copy per-vehicle states into the batched arrays."""
+        states = [a.vehicle.state for a in self.agents]
+        self.xs = np.array([s.x for s in states])
+        self.ys = np.array([s.y for s in states])
+        self.thetas = np.array([s.theta for s in states])
+        self.velocities = np.array([s.velocity for s in states])
+        self.steerings = np.array([s.steering_angle for s in states])
+
+    def _status_mask(self, status: str) -> np.ndarray:
+        return np.array([a.status == status for a in self.agents])
+
+    def plan_path(self, start: Optional[Tuple[float, float]] = None,
+                  goal: Optional[Tuple[float, float]] = None) -> bool:
+        """
+        Plan a path for every agent.
+
+        Returns:
+            True if at least one agent has a path
+        """
+        if self.planner is None:
+            print("Error: No planner set!")
+            return False
+
+        self.state = SimulationState.PLANNING
+        print(f"\nPlanning paths for {len(self.agents)} agents...")
+        planning_start = time.perf_counter()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for agent in self.agents:
+                with self.profiler.phase("planner"):
+                    agent.path = self.planner.plan(agent.start, agent.goal)
+                self.profiler.count("plans")
+
+                if agent.path is None:
+                    agent.status = AgentStatus.NO_PATH
+                    continue
+                agent.status = AgentStatus.ACTIVE
+                agent.controller.set_path(agent.path)
+
+                # Start facing along the path
+                if len(agent.path.points) > 1:
+                    p0, p1 = agent.path.points[0], agent.path.points[1]
+                    agent.vehicle.reset(agent.start[0], agent.start[1],
+                                        np.arctan2(p1.y - p0.y, p1.x - p0.x))
+
+        self._sync_arrays_from_vehicles()
+        planned = sum(a.path is not None for a in self.agents)
+        print(f"Planned {planned}/{len(self.agents)} paths in {time.perf_counter() - planning_start:.2f}s")
+
+        self.path = self.agents[0].path or next((a.path for a in self.agents if a.path), None)
+        if self.path is None:
+            self.state = SimulationState.FAILED
+            return False
+        return True
+
+    def plan_path_async(self, start: Optional[Tuple[float, float]] = None,
+                        goal: Optional[Tuple[float, float]] = None) -> Optional[Future]:
+        """Replan all agents (synchronously) and return a completed future."""
+        future = Future()
+        future.set_result(self.path if self.plan_path() else None)
+        return future
+
+    def reset(self):
+        """Put every agent back at its start."""
+        super().reset()
+        for agent in self.agents:
+            agent.vehicle.reset(agent.start[0], agent.start[1])
+            agent.steps = 0
+            agent.distance = 0.0
+            agent.status = AgentStatus.ACTIVE if agent.path else AgentStatus.NO_PATH
+            if hasattr(agent.controller, 'reset'):
+                agent.controller.reset()
+            if hasattr(agent.controller, 'current_target_idx'):
+                agent.controller.current_target_idx = 0
+        self.vehicle_collisions = 0
+        self._sync_arrays_from_vehicles()
+
+    def step_simulation(self) -> bool:
+        """
+        Advance every active agent by one step.
+
+        Returns:
+            True while at least one agent is still driving
+        """
+        if self.state != SimulationState.RUNNING:
+            return False
+
+        profiler = self.profiler
+        active_idx = np.flatnonzero(self._status_mask(AgentStatus.ACTIVE))
+        if len(active_idx) == 0:
+            self._finish()
+            return False
+
+        # Per-agent controllers
+        accelerations = np.empty(len(active_idx))
+        steerings = np.empty(len(active_idx))
+        with profiler.phase("control"):
+            for k, i in enumerate(active_idx):
+                accelerations[k], steerings[k] = self.agents[i].controller.control()
+
+        # Batched dynamics
+        with profiler.phase("vehicle.update"):
+            cfg = self.vehicle.config
+            accelerations = np.clip(accelerations, cfg.max_deceleration, cfg.max_acceleration)
+            steerings = np.clip(steerings, -cfg.max_steering_angle, cfg.max_steering_angle)
+            prev_x, prev_y = self.xs[active_idx], self.ys[active_idx]
+            new_x, new_y, new_theta, new_velocity = integrate_bicycle(
+                prev_x, prev_y, self.thetas[active_idx], self.velocities[active_idx],
+                accelerations, steerings,
+                dt=self.vehicle.dt,
+                wheelbase=cfg.wheelbase,
+                min_velocity=-cfg.max_velocity / 2.0,
+                max_velocity=cfg.max_velocity,
+                integrator=self.vehicle.integrator,
+                substeps=self.vehicle.substeps
+            )
+            self.xs[active_idx] = new_x
+            self.ys[active_idx] = new_y
+            self.thetas[active_idx] = new_theta
+            self.velocities[active_idx] = new_velocity
+            self.steerings[active_idx] = steerings
+
+            # Controllers read the scalar Vehicle objects
+            step_distance = np.hypot(new_x - prev_x, new_y - prev_y)
+            for k, i in enumerate(active_idx):
+                agent = self.agents[i]
+                state = agent.vehicle.state
+                state.x = float(new_x[k])
+                state.y = float(new_y[k])
+                state.theta = float(new_theta[k])
+                state.velocity = float(new_velocity[k])
+                state.steering_angle = float(steerings[k])
+                agent.steps += 1
+                agent.distance += float(step_distance[k])
+
+        with profiler.phase("bookkeeping"):
+            # Base statistics (path efficiency, HUD) describe agent 0, like the
+            # path, trajectory and goal flags; the fleet total is in get_stats()
+            self.total_distance = self.agents[0].distance
+            self.last_control = (float(accelerations[0]), float(steerings[0]))
+            if self.agents[0].status == AgentStatus.ACTIVE:
+                self.trajectory.append(self.vehicle.get_position())
+
+        # Map collisions (vehicle center, as in the single-agent simulator)
+        with profiler.phase("is_collision"):
+            hit_map = self.map_env.is_collision_batch(new_x, new_y, 0)
+        for i in active_idx[hit_map]:
+            self.agents[i].status = AgentStatus.COLLIDED
+
+        # Vehicle-vehicle collisions among agents still on the road
+        with profiler.phase("vehicle_collision"):
+            on_road = np.flatnonzero(~self._status_mask(AgentStatus.ARRIVED)
+                                     & ~self._status_mask(AgentStatus.NO_PATH))
+            i, j = self.spatial_hash.candidate_pairs(self.xs[on_road], self.ys[on_road])
+            overlap = oriented_boxes_overlap(
+                self.xs[on_road], self.ys[on_road], self.thetas[on_road],
+                self.half_length, self.half_width, i, j
+            )
+            crashed = np.unique(np.concatenate([on_road[i[overlap]], on_road[j[overlap]]]))
+        for idx in crashed:
+            if self.agents[idx].status == AgentStatus.ACTIVE:
+                self.agents[idx].status = AgentStatus.COLLIDED
+                self.vehicle_collisions += 1
+
+        # Goals
+        for k, i in enumerate(active_idx):
+            agent = self.agents[i]
+            if agent.status == AgentStatus.ACTIVE and \
+                    np.hypot(new_x[k] - agent.goal[0], new_y[k] - agent.goal[1]) < self.goal_threshold:
+                agent.status = AgentStatus.ARRIVED
+
+        with profiler.phase("observers"):
+            for observer in self.observers:
+                observer(self)
+        profiler.count("steps")
+        profiler.count("agent_steps", len(active_idx))
+
+        self.step += 1
+        self.simulation_time += self.dt
+
+        if not self._status_mask(AgentStatus.ACTIVE).any():
+            self._finish()
+            return False
+        return True
+
+    def _finish(self):
+        """Set the overall outcome once no agent is driving."""
+        statuses = [a.status for a in self.agents]
+        self.collision_detected = AgentStatus.COLLIDED in statuses
+        self.goal_reached = all(s == AgentStatus.ARRIVED for s in statuses)
+        self.state = SimulationState.COMPLETED if self.goal_reached else SimulationState.FAILED
+        print(f"\nAll agents stopped at step {self.step}: "
+              f"{statuses.count(AgentStatus.ARRIVED)} arrived, "
+              f"{statuses.count(AgentStatus.COLLIDED)} collided")
+
+    def run_headless(self, max_steps: int = 10000) -> MultiAgentResult:
+        """
+        Run the fleet without any display, as fast as possible.
+
+        Args:
+            max_steps: Maximum simulation steps
+
+        Returns:
+            MultiAgentResult with per-agent outcomes and timings
+        """
+        wall_start = time.perf_counter()
+        planned = self.path is not None or self.plan_path()
+        planning_wall_time = time.perf_counter() - wall_start
+
+        step_start = time.perf_counter()
+        if planned:
+            self.state = SimulationState.RUNNING
+            while self.step < max_steps and self.step_simulation():
+                pass
+        step_wall_time = time.perf_counter() - step_start
+
+        agent_steps = sum(a.steps for a in self.agents)
+        statuses = [a.status for a in self.agents]
+        return MultiAgentResult(
+            num_agents=len(self.agents),
+            arrived=statuses.count(AgentStatus.ARRIVED),
+            collided=statuses.count(AgentStatus.COLLIDED),
+            vehicle_collisions=self.vehicle_collisions,
+            no_path=statuses.count(AgentStatus.NO_PATH),
+            steps=self.step,
+            agents=[{
+                'start': a.start, 'goal': a.goal, 'status': a.status,
+                'steps': a.steps, 'distance': a.distance,
+                'path_length': a.path.length if a.path else 0.0,
+                'controller': a.controller.__class__.__name__,
+            } for a in self.agents],
+            timings={
+                'planning_wall_time': planning_wall_time,
+                'simulation_wall_time': step_wall_time,
+                'wall_time': time.perf_counter() - wall_start,
+                'agent_steps_per_second': agent_steps / step_wall_time if step_wall_time > 0 else 0.0,
+            }
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get simulation statistics, including per-status agent counts."""
+        stats = super().get_stats()
+        statuses = [a.status for a in self.agents]
+        stats.update({
+            'num_agents': len(self.agents),
+            'fleet_distance': sum(a.distance for a in self.agents),
+            'arrived': statuses.count(AgentStatus.ARRIVED),
+            'collided': statuses.count(AgentStatus.COLLIDED),
+            'vehicle_collisions': self.vehicle_collisions,
+            'no_path': statuses.count(AgentStatus.NO_PATH),
+        })
+        return stats
+
+    def print_stats(self):
+        """Print simulation statistics."""
+        super().print_stats()
+        stats = self.get_stats()
+        print(f"Agents: {stats['num_agents']} | arrived: {stats['arrived']} | "
+              f"collided: {stats['collided']} (vehicle-vehicle: {stats['vehicle_collisions']}) | "
+              f"no path: {stats['no_path']}")
+        print(f"Fleet distance: {stats['fleet_distance']:.2f}m")
+
+    def render(self):
+        """Render every agent's path and vehicle."""
+        if self.renderer is None:
+            return
+
+        renderer = self.renderer
+        profiler = self.profiler
+        profiler.count("frames")
+
+        with profiler.phase("render.background"):
+            renderer.follow_target(*self.vehicle.get_position())
+            renderer.draw_background(self.map_env)
+
+        with profiler.phase("render.path"):
+            for k, agent in enumerate(self.agents):
+                if agent.path and agent.status == AgentStatus.ACTIVE:
+                    renderer.draw_path(agent.path, color=AGENT_COLORS[k % len(AGENT_COLORS)])
+
+        with profiler.phase("render.vehicle"):
+            for k, agent in enumerate(self.agents):
+                if agent.status in (AgentStatus.ARRIVED, AgentStatus.NO_PATH):
+                    continue
+                color = (255, 0, 0) if agent.status == AgentStatus.COLLIDED \
+                    else AGENT_COLORS[k % len(AGENT_COLORS)]
+                renderer.draw_vehicle(agent.vehicle, color=color)
+
+        with profiler.phase("render.hud"):
+            statuses = [a.status for a in self.agents]
+            additional_info = {
+                'State': self.state.value,
+                'Active': statuses.count(AgentStatus.ACTIVE),
+                'Arrived': statuses.count(AgentStatus.ARRIVED),
+                'Collided': statuses.count(AgentStatus.COLLIDED),
+                'RTF': f'{self.real_time_factor:.1f}x',
+            }
+            renderer.draw_info_panel(
+                self.vehicle, self.step,
+                self._clock.get_fps() if self._clock else 0.0,
+                additional_info
+            )
+            renderer.draw_controls_help()
+
+        with profiler.phase("render.flip"):
+            renderer.update()
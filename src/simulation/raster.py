@@ -0,0 +1,233 @@
+import numpy as np
+from typing import Optional, Tuple
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.core.map import Map2D
+from src.core.vehicle import VehicleConfig
+
+
+# Same palette as renderer.Color (kept here so this module never imports pygame)
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+LIGHT_GRAY = (200, 200, 200)
+DARK_GRAY = (64, 64, 64)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 100, 255)
+YELLOW = (255, 255, 0)
+LIDAR = (0, 200, 200)
+
+
+class FrameRasterizer:
+    """
+    Pure-NumPy top-down renderer (no pygame, no SDL).
+
+    The static layer (background, obstacles with outlines, optional grid
+    and start/goal markers) is rasterized once per map version by testing
+    pixel centers against the map. Each frame copies it into a
+    preallocated uint8 buffer and draws only the vehicles (oriented
+    boxes, front quarter in yellow) and optionally their LIDAR rays, all
+    vectorized over the batch.
+
+    Uses the same screen mapping as Renderer at its default view:
+    column = x * scale_x, row = height - y * scale_y.
+    """
+
+    def __init__(self, map_env: Map2D,
+                 width: int = 400,
+                 height: int = 400,
+                 vehicle_config: Optional[VehicleConfig] = None,
+                 grid_size: Optional[float] = None,
+                 show_markers: bool = False):
+        """
+        Initialize rasterizer.
+
+        Args:
+            map_env: Map to draw
+            width, height: Frame size (pixels)
+            vehicle_config: Vehicle footprint (uses default if None)
+            grid_size: Grid spacing in meters (None = no grid)
+            show_markers: Draw start (green) and goal (red) markers
+        """
+        self.map_env = map_env
+        self.width = int(width)
+        self.height = int(height)
+        self.vehicle_config = vehicle_config or VehicleConfig()
+        self.grid_size = grid_size
+        self.show_markers = show_markers
+
+        self.scale_x = self.width / map_env.width
+        self.scale_y = self.height / map_env.height
+
+        self.frame = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._batch_frames: Optional[np.ndarray] = None
+        self._static: Optional[np.ndarray] = None
+        self._static_version = -1
+
+        # Pixel offsets of a square window that contains any vehicle footprint
+        cfg = self.vehicle_config
+        radius_px = 0.5 * np.hypot(cfg.length, cfg.width) * max(self.scale_x, self.scale_y)
+        half = int(np.ceil(radius_px)) + 1
+        offsets = np.arange(-half, half + 1)
+        self._window_rows, self._window_cols = np.meshgrid(offsets, offsets, indexing="ij")
+
+    # ------------------------------------------------------------------
+    # Static layer
+    # ------------------------------------------------------------------
+
+    def get_static_layer(self) -> np.ndarray:
+        """(H, W, 3) background with obstacles, rebuilt when the map version changes."""
+        if self._static is None or self._static_version != self.map_env.version:
+            self._static = self._rasterize_static()
+            self._static_version = self.map_env.version
+        return self._static
+
+    def _rasterize_static(self) -> np.ndarray:
+        image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        image[:] = WHITE
+
+        # World coordinates of pixel centers
+        xs = (np.arange(self.width) + 0.5) / self.scale_x
+        ys = (self.height - np.arange(self.height) - 0.5) / self.scale_y
+
+        if self.grid_size:
+            columns = np.flatnonzero(np.diff(np.floor(xs / self.grid_size), prepend=-1) != 0)
+            rows = np.flatnonzero(np.diff(np.floor(ys / self.grid_size), prepend=np.inf) != 0)
+            image[:, columns] = LIGHT_GRAY
+            image[rows, :] = LIGHT_GRAY
+
+        occupied = np.zeros((self.height, self.width), dtype=bool)
+        for obstacle in self.map_env.obstacles:
+            occupied |= obstacle.contains_points(xs[None, :], ys[:, None])
+
+        # Outline: occupied pixels with a free 4-neighbour
+        interior = occupied.copy()
+        interior[1:, :] &= occupied[:-1, :]
+        interior[:-1, :] &= occupied[1:, :]
+        interior[:, 1:] &= occupied[:, :-1]
+        interior[:, :-1] &= occupied[:, 1:]
+        image[occupied] = BLACK
+        image[interior] = DARK_GRAY
+
+        if self.show_markers:
+            for point, color in ((self.map_env.start, GREEN), (self.map_env.goal, RED)):
+                if point is not None:
+                    self._draw_disc(image, point, 8, color)
+        return image
+
+    def _draw_disc(self, image: np.ndarray, point: Tuple[float, float], radius: int,
+                   color: Tuple[int, int, int]):
+        col = int(point[0] * self.scale_x)
+        row = int(self.height - point[1] * self.scale_y)
+        r0, r1 = max(row - radius, 0), min(row + radius + 1, self.height)
+        c0, c1 = max(col - radius, 0), min(col + radius + 1, self.width)
+        rr, cc = np.ogrid[r0:r1, c0:c1]
+        image[r0:r1, c0:c1][(rr - row) ** 2 + (cc - col) ** 2 <= radius ** 2] = color
+
+    # ------------------------------------------------------------------
+    # Frames
+    # ------------------------------------------------------------------
+
+    def render(self, x: float, y: float, theta: float,
+               lidar_angles: Optional[np.ndarray] = None,
+               lidar_distances: Optional[np.ndarray] = None,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Draw one vehicle on the static layer.
+
+        Args:
+            x, y, theta: Vehicle pose
+            lidar_angles: (R,) absolute ray angles (optional)
+            lidar_distances: (R,) hit distances in meters (optional)
+            out: (H, W, 3) uint8 buffer; default is self.frame, which is
+                overwritten by the next call
+
+        Returns:
+            The frame buffer
+        """
+        out = self.frame if out is None else out
+        np.copyto(out, self.get_static_layer())
+        batch = out[None]
+        if lidar_angles is not None and lidar_distances is not None:
+            self._draw_rays(batch, np.array([x]), np.array([y]),
+                            np.asarray(lidar_angles)[None], np.asarray(lidar_distances)[None])
+        self._draw_vehicles(batch, np.array([x]), np.array([y]), np.array([theta]))
+        return out
+
+    def render_batch(self, xs: np.ndarray, ys: np.ndarray, thetas: np.ndarray,
+                     lidar_angles: Optional[np.ndarray] = None,
+                     lidar_distances: Optional[np.ndarray] = None,
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        One frame per vehicle (e.g. for every car of a vectorized env).
+
+        Args:
+            xs, ys, thetas: (N,) vehicle poses
+            lidar_angles: (N, R) absolute ray angles (optional)
+            lidar_distances: (N, R) hit distances in meters (optional)
+            out: (N, H, W, 3) uint8 buffer; default is an internal buffer
+                reused across calls
+
+        Returns:
+            (N, H, W, 3) frames
+        """
+        n = len(xs)
+        if out is None:
+            if self._batch_frames is None or len(self._batch_frames) != n:
+                self._batch_frames = np.empty((n, self.height, self.width, 3), dtype=np.uint8)
+            out = self._batch_frames
+        out[:] = self.get_static_layer()
+        if lidar_angles is not None and lidar_distances is not None:
+            self._draw_rays(out, np.asarray(xs), np.asarray(ys),
+                            np.asarray(lidar_angles), np.asarray(lidar_distances))
+        self._draw_vehicles(out, np.asarray(xs), np.asarray(ys), np.asarray(thetas))
+        return out
+
+    def _draw_vehicles(self, frames: np.ndarray, xs: np.ndarray, ys: np.ndarray,
+                       thetas: np.ndarray):
+        """Rasterize oriented vehicle boxes, one per frame, in a window around each car."""
+        cfg = self.vehicle_config
+        center_cols = np.floor(xs * self.scale_x).astype(np.int64)
+        center_rows = np.floor(self.height - ys * self.scale_y).astype(np.int64)
+
+        # (N, S, S) pixel indices and their world-space centers
+        rows = center_rows[:, None, None] + self._window_rows[None]
+        cols = center_cols[:, None, None] + self._window_cols[None]
+        dx = (cols + 0.5) / self.scale_x - xs[:, None, None]
+        dy = (self.height - rows - 0.5) / self.scale_y - ys[:, None, None]
+
+        cos_t = np.cos(thetas)[:, None, None]
+        sin_t = np.sin(thetas)[:, None, None]
+        local_x = dx * cos_t + dy * sin_t
+        local_y = -dx * sin_t + dy * cos_t
+
+        inside = ((np.abs(local_x) <= cfg.length / 2) & (np.abs(local_y) <= cfg.width / 2) &
+                  (rows >= 0) & (rows < self.height) & (cols >= 0) & (cols < self.width))
+        front = inside & (local_x >= cfg.length / 4)
+
+        batch = np.broadcast_to(np.arange(len(xs))[:, None, None], inside.shape)
+        frames[batch[inside], rows[inside], cols[inside]] = BLUE
+        frames[batch[front], rows[front], cols[front]] = YELLOW
+
+    def _draw_rays(self, frames: np.ndarray, xs: np.ndarray, ys: np.ndarray,
+                   angles: np.ndarray, distances: np.ndarray):
+        """Rasterize rays by sampling about one point per pixel along each ray."""
+        max_distance = float(distances.max()) if distances.size else 0.0
+        samples = int(np.ceil(max_distance * max(self.scale_x, self.scale_y))) + 1
+        if samples < 2:
+            return
+        t = np.linspace(0.0, max_distance, samples)
+
+        # (N, R, K) sample points, kept only up to each ray's hit distance
+        along = t[None, None, :]
+        keep = along <= distances[..., None]
+        px = xs[:, None, None] + along * np.cos(angles)[..., None]
+        py = ys[:, None, None] + along * np.sin(angles)[..., None]
+        cols = np.floor(px * self.scale_x).astype(np.int64)
+        rows = np.floor(self.height - py * self.scale_y).astype(np.int64)
+        keep &= (rows >= 0) & (rows < self.height) & (cols >= 0) & (cols < self.width)
+
+        batch = np.broadcast_to(np.arange(len(xs))[:, None, None], keep.shape)
+        frames[batch[keep], rows[keep], cols[keep]] = LIDAR
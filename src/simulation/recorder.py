@@ -0,0 +1,181 @@
+import numpy as np
+import json
+from typing import Any, Dict, List, Optional, Tuple
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+
+# name -> (per-step shape, dtype)
+STATE_COLUMNS: Dict[str, Tuple[Tuple[int, ...], str]] = {
+    "step": ((), "int32"),
+    "time": ((), "float32"),
+    "x": ((), "float32"),
+    "y": ((), "float32"),
+    "theta": ((), "float32"),
+    "velocity": ((), "float32"),
+    "steering_angle": ((), "float32"),
+    "acceleration_cmd": ((), "float32"),
+    "steering_cmd": ((), "float32"),
+    "target_x": ((), "float32"),
+    "target_y": ((), "float32"),
+}
+
+
+class TrajectoryRecorder:
+    """
+    Columnar per-step log backed by preallocated NumPy arrays.
+
+    Each column is a contiguous array that doubles in size when full, so
+    recording costs one indexed store per column and no Python objects
+    are kept per step. Events (collision, goal, replan, ...) are stored
+    separately as (step, name) pairs.
+    """
+
+    def __init__(self, columns: Optional[Dict[str, Tuple[Tuple[int, ...], str]]] = None,
+                 capacity: int = 1024):
+        """
+        Initialize recorder.
+
+        Args:
+            columns: Column name -> (per-step shape, dtype); defaults to STATE_COLUMNS
+            capacity: Initial number of rows
+        """
+        self.capacity = max(int(capacity), 1)
+        self.size = 0
+        self._columns: Dict[str, np.ndarray] = {}
+        self.events: List[Tuple[int, str]] = []
+
+        for name, (shape, dtype) in (columns or STATE_COLUMNS).items():
+            self.add_column(name, shape, dtype)
+
+    def add_column(self, name: str, shape: Tuple[int, ...] = (), dtype: str = "float32"):
+        """Add a column (e.g. lidar readings with shape (num_rays,))."""
+        if name in self._columns:
+            raise ValueError(f"Column already exists: {name}")
+        column = np.zeros((self.capacity,) + tuple(shape), dtype=dtype)
+        if np.issubdtype(column.dtype, np.floating):
+            column[:self.size] = np.nan
+        self._columns[name] = column
+
+    def record(self, **values: Any):
+        """
+        Append one row.
+
+        Columns not given are stored as NaN (float) or 0 (integer);
+        unknown names raise KeyError.
+        """
+        unknown = set(values) - set(self._columns)
+        if unknown:
+            raise KeyError(f"Unknown columns: {sorted(unknown)}")
+
+        if self.size == self.capacity:
+            self._grow()
+
+        i = self.size
+        for name, column in self._columns.items():
+            value = values.get(name)
+            if value is None:
+                column[i] = np.nan if column.dtype.kind == "f" else 0
+            else:
+                column[i] = value
+
+        self.size += 1
+
+    def add_event(self, name: str, step: Optional[int] = None):
+        """Record an event at step (default: the last recorded row)."""
+        if step is None:
+            if "step" in self._columns and self.size:
+                step = self._columns["step"][self.size - 1]
+            else:
+                step = max(self.size - 1, 0)
+        self.events.append((int(step), name))
+
+    def _grow(self):
+        self.capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty((self.capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self._columns[name] = grown
+
+    def clear(self):
+        """Drop all rows and events (buffers are kept)."""
+        self.size = 0
+        self.events = []
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Views of the recorded rows (no copy)."""
+        return {name: column[:self.size] for name, column in self._columns.items()}
+
+    def save(self, filename: str, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Write the log to a compressed .npz file.
+
+        Args:
+            filename: Output path
+            metadata: JSON-serializable run description (map, path, dt, ...)
+        """
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        event_steps = np.array([s for s, _ in self.events], dtype=np.int32)
+        event_names = np.array([n for _, n in self.events], dtype=str)
+        np.savez_compressed(
+            filename,
+            **{f"col_{name}": column for name, column in self.columns.items()},
+            event_step=event_steps,
+            event_name=event_names,
+            metadata=np.array(json.dumps(metadata or {}))
+        )
+        print(f"Trajectory log saved to {filename} ({self.size} steps)")
+
+
+class TrajectoryLog:
+    """
+    Recorded run loaded for replay or analysis.
+
+    Columns are plain NumPy arrays indexed by frame; nothing is
+    re-simulated.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray],
+                 events: List[Tuple[int, str]],
+                 metadata: Dict[str, Any]):
+        self.columns = columns
+        self.events = events
+        self.metadata = metadata
+        self.num_frames = len(next(iter(columns.values()))) if columns else 0
+
+    @classmethod
+    def load(cls, filename: str) -> 'TrajectoryLog':
+        """Load a log written by TrajectoryRecorder.save()."""
+        with np.load(filename, allow_pickle=False) as data:
+            columns = {key[4:]: data[key] for key in data.files if key.startswith("col_")}
+            events = list(zip(data["event_step"].tolist(), data["event_name"].tolist()))
+            metadata = json.loads(str(data["metadata"]))
+        return cls(columns, events, metadata)
+
+    def __len__(self) -> int:
+        return self.num_frames
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def frame(self, index: int) -> Dict[str, Any]:
+        """All column values at frame index."""
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def events_until(self, index: int) -> List[Tuple[int, str]]:
+        """Events that happened up to and including frame index."""
+        if "step" not in self.columns:
+            return [e for e in self.events if e[0] <= index]
+        step = self.columns["step"][index]
+        return [e for e in self.events if e[0] <= step]
+
+    def __repr__(self) -> str:
+        return f"TrajectoryLog(frames={self.num_frames}, columns={list(self.columns)}, events={len(self.events)})"
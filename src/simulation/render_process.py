@@ -0,0 +1,419 @@
+import numpy as np
+import multiprocessing as mp
+import queue
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.core.map import Map2D
+from src.core.shared_map import _attach_block
+from src.core.vehicle import VehicleConfig, VehicleState
+
+
+# Fixed leading fields of every published record, followed by the
+# caller's info values and the LIDAR distances
+RECORD_FIELDS = ("step", "time", "x", "y", "theta", "velocity", "steering",
+                 "status", "target_x", "target_y")
+
+# Keys handled by the simulation side (forwarded as commands); view keys
+# (G/P/T/I, camera) are handled by the render process itself
+COMMAND_KEYS = {
+    "space": "pause",
+    "r": "reset",
+    "=": "faster",
+    "+": "faster",
+    "[+]": "faster",
+    "-": "slower",
+    "[-]": "slower",
+    "f": "free_run",
+}
+
+
+class FrameRing:
+    """
+    Single-producer ring buffer of fixed-size float64 records in shared memory.
+
+    Layout: one header word holding the sequence number of the newest
+    record, then `slots` rows of [stamp, record...]. The writer stamps a
+    row -1 while filling it and its sequence number when done (a per-slot
+    seqlock), so the reader never blocks the writer: it copies only the
+    newest row, checks the stamp is unchanged after the copy and retries
+    otherwise. Records published between two reads are dropped.
+    """
+
+    def __init__(self, record_size: int, slots: int = 8, name: Optional[str] = None):
+        """
+        Create a ring, or attach to an existing one by name.
+
+        Args:
+            record_size: Values per record
+            slots: Number of rows (>= 2 so the writer never fills the row
+                being read)
+            name: Shared memory block of an existing ring (None = create)
+        """
+        self.record_size = int(record_size)
+        self.slots = max(int(slots), 2)
+        self._owner = name is None
+
+        nbytes = 8 * (1 + self.slots * (self.record_size + 1))
+        if self._owner:
+            self._block = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self._block = _attach_block(name)
+        data = np.ndarray((nbytes // 8,), dtype=np.float64, buffer=self._block.buf)
+        if self._owner:
+            data[:] = 0.0
+        self._head = data[:1]
+        self._rows = data[1:].reshape(self.slots, self.record_size + 1)
+
+        self.write_seq = 0
+        self.read_seq = 0
+        self.dropped = 0
+
+    @property
+    def name(self) -> str:
+        return self._block.name
+
+    def write(self, record: np.ndarray):
+        """Publish one record (never blocks)."""
+        seq = self.write_seq + 1
+        row = self._rows[seq % self.slots]
+        row[0] = -1.0
+        row[1:] = record
+        row[0] = seq
+        self._head[0] = seq
+        self.write_seq = seq
+
+    def read_latest(self, out: np.ndarray, retries: int = 4) -> bool:
+        """
+        Copy the newest record into out.
+
+        Args:
+            out: (record_size,) destination
+            retries: Attempts if the writer overwrites the row mid-copy
+
+        Returns:
+            True if a record newer than the last one read was copied
+        """
+        for _ in range(retries):
+            seq = int(self._head[0])
+            if seq <= self.read_seq:
+                return False
+            row = self._rows[seq % self.slots]
+            if row[0] != seq:
+                continue
+            out[:] = row[1:]
+            if row[0] == seq:
+                self.dropped += seq - self.read_seq - 1
+                self.read_seq = seq
+                return True
+        return False
+
+    def close(self):
+        """Detach, and unlink the block if this side created it."""
+        self._head = None
+        self._rows = None
+        self._block.close()
+        if self._owner:
+            try:
+                self._block.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class RenderProcess:
+    """
+    Draws the simulation in a separate process.
+
+    The simulation calls publish() after each step, which only writes one
+    record into a FrameRing, so physics, control and policy inference are
+    never delayed by rendering. The render process owns the window and a
+    Renderer, draws the newest record at its own frame rate (older ones
+    are dropped) and rebuilds the trail from the poses it sees. Rarely
+    changing overlays (path, detected obstacles) travel through a queue;
+    simulation keys come back through another queue (see poll_commands()).
+
+    Usage:
+        view = RenderProcess(map_env, vehicle_config, info_fields=("Distance",))
+        view.start()
+        while ...:
+            view.publish(step, t, vehicle.state, info=(distance,))
+            for command in view.poll_commands():
+                ...
+        view.wait()
+    """
+
+    def __init__(self, map_env: Map2D,
+                 vehicle_config: Optional[VehicleConfig] = None,
+                 screen_width: int = 1200,
+                 screen_height: int = 800,
+                 caption: str = "Autonomous Car 2D",
+                 target_fps: int = 60,
+                 trail_length: int = 1000,
+                 hud_refresh_rate: float = 10.0,
+                 info_fields: Sequence[str] = (),
+                 status_labels: Sequence[str] = (),
+                 num_rays: int = 0,
+                 lidar_range: float = 0.0,
+                 path_color: Tuple[int, int, int] = (255, 0, 0),
+                 target_color: Tuple[int, int, int] = (255, 165, 0),
+                 slots: int = 8):
+        """
+        Initialize render process (call start() to open the window).
+
+        Args:
+            map_env: Map to draw (sent once as a dict)
+            vehicle_config: Vehicle footprint (uses default if None)
+            screen_width, screen_height: Window size (pixels)
+            caption: Window caption
+            target_fps: Render frame rate
+            trail_length: Trajectory points kept by the renderer
+            hud_refresh_rate: Info panel updates per second
+            info_fields: Names of the extra values passed to publish()
+            status_labels: Labels for the integer status passed to publish()
+            num_rays: LIDAR rays per record (0 = no LIDAR)
+            lidar_range: LIDAR range (meters), for the sensor zone
+            path_color: Color of the path set with set_path()
+            target_color: Color of the target point (lookahead, waypoint)
+            slots: Ring buffer rows
+        """
+        self.info_fields = tuple(info_fields)
+        self.num_rays = int(num_rays)
+        self.record_size = len(RECORD_FIELDS) + len(self.info_fields) + self.num_rays
+        self._record = np.zeros(self.record_size)
+        self._options = {
+            'map': map_env.to_dict(),
+            'vehicle_config': vehicle_config or VehicleConfig(),
+            'screen_width': screen_width,
+            'screen_height': screen_height,
+            'caption': caption,
+            'target_fps': target_fps,
+            'trail_length': trail_length,
+            'hud_refresh_rate': hud_refresh_rate,
+            'info_fields': self.info_fields,
+            'status_labels': tuple(status_labels),
+            'num_rays': self.num_rays,
+            'lidar_range': lidar_range,
+            'path_color': path_color,
+            'target_color': target_color,
+            'slots': slots,
+        }
+        self.ring: Optional[FrameRing] = None
+        self._process = None
+        self._overlays = None
+        self._commands = None
+        self._stop = None
+
+    def start(self):
+        """Create the ring buffer and launch the render process."""
+        # spawn: the child must not inherit SDL or planner threads
+        ctx = mp.get_context("spawn")
+        self.ring = FrameRing(self.record_size, self._options['slots'])
+        self._overlays = ctx.Queue()
+        self._commands = ctx.Queue()
+        self._stop = ctx.Event()
+        self._process = ctx.Process(
+            target=_render_main,
+            args=(self._options, self.ring.name, self._overlays, self._commands, self._stop),
+            daemon=True
+        )
+        self._process.start()
+
+    def publish(self, step: int, simulation_time: float, state: VehicleState,
+                status: int = 0,
+                target: Optional[Tuple[float, float]] = None,
+                info: Sequence[float] = (),
+                lidar: Optional[np.ndarray] = None):
+        """
+        Publish the state of one step (cheap, never blocks).
+
+        Args:
+            step: Simulation step
+            simulation_time: Simulated time (s)
+            state: Vehicle state
+            status: Index into status_labels
+            target: Point to highlight (lookahead, waypoint)
+            info: One value per info_fields entry
+            lidar: (num_rays,) distances in meters, ray i at heading + 2*pi*i/num_rays
+        """
+        record = self._record
+        record[:7] = (step, simulation_time, state.x, state.y, state.theta,
+                      state.velocity, state.steering_angle)
+        record[7] = status
+        record[8:10] = target if target is not None else (np.nan, np.nan)
+        n = len(RECORD_FIELDS)
+        record[n:n + len(self.info_fields)] = info
+        if self.num_rays:
+            record[n + len(self.info_fields):] = lidar if lidar is not None else 0.0
+        self.ring.write(record)
+
+    def set_path(self, points: Optional[np.ndarray]):
+        """Replace the drawn path ((N, 2) world points, None = no path)."""
+        self._overlays.put(('path', None if points is None else np.asarray(points, dtype=float)))
+
+    def set_circles(self, circles: Optional[np.ndarray]):
+        """Replace the outlined circles ((M, 3) x, y, radius), e.g. detected obstacles."""
+        self._overlays.put(('circles', None if circles is None else np.asarray(circles, dtype=float)))
+
+    def clear_trajectory(self):
+        """Drop the trail drawn so far."""
+        self._overlays.put(('clear', None))
+
+    def poll_commands(self) -> List[str]:
+        """Commands from the window since the last call ("pause", "reset", "faster", "slower", "free_run", "quit")."""
+        commands = []
+        while True:
+            try:
+                commands.append(self._commands.get_nowait())
+            except queue.Empty:
+                return commands
+
+    @property
+    def is_open(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def wait(self):
+        """Block until the window is closed."""
+        if self._process is not None:
+            self._process.join()
+        self.close()
+
+    def close(self):
+        """Close the window and release the ring buffer."""
+        if self._process is not None:
+            self._stop.set()
+            self._process.join(timeout=5.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        if self.ring is not None:
+            print(f"Render process: {self.ring.write_seq} states published")
+            self.ring.close()
+            self.ring = None
+
+    def __enter__(self) -> 'RenderProcess':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def _render_main(options: dict, ring_name: str, overlays, commands, stop):
+    """Render process entry point."""
+    import pygame
+    from src.core.vehicle import Vehicle
+    from src.simulation.renderer import Renderer
+
+    map_env = Map2D.from_dict(options['map'])
+    info_fields = options['info_fields']
+    status_labels = options['status_labels']
+    num_rays = options['num_rays']
+    n = len(RECORD_FIELDS)
+    ring = FrameRing(n + len(info_fields) + num_rays, options['slots'], name=ring_name)
+
+    renderer = Renderer(
+        screen_width=options['screen_width'],
+        screen_height=options['screen_height'],
+        world_width=map_env.width,
+        world_height=map_env.height,
+        caption=options['caption'],
+        max_trajectory_length=options['trail_length'],
+        hud_refresh_rate=options['hud_refresh_rate']
+    )
+    vehicle = Vehicle(options['vehicle_config'])
+    ray_offsets = np.linspace(0, 2 * np.pi, num_rays, endpoint=False)
+    record = np.zeros(ring.record_size)
+    received = False
+    path = None
+    circles = None
+    clock = pygame.time.Clock()
+
+    running = True
+    while running and not stop.is_set():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif renderer.handle_camera_event(event):
+                continue
+            elif event.type == pygame.KEYDOWN:
+                name = pygame.key.name(event.key)
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif name in COMMAND_KEYS:
+                    commands.put(COMMAND_KEYS[name])
+                elif event.key == pygame.K_g:
+                    renderer.show_grid = not renderer.show_grid
+                elif event.key == pygame.K_p:
+                    renderer.show_path = not renderer.show_path
+                elif event.key == pygame.K_t:
+                    renderer.show_trajectory = not renderer.show_trajectory
+                elif event.key == pygame.K_i:
+                    renderer.show_info = not renderer.show_info
+
+        # Overlays: keep only the latest of each kind
+        while True:
+            try:
+                kind, data = overlays.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'path':
+                path = data
+            elif kind == 'circles':
+                circles = data
+            elif kind == 'clear':
+                renderer.clear_trajectory()
+
+        # Newest state; everything published since the last frame is skipped
+        if ring.read_latest(record):
+            received = True
+            vehicle.state = VehicleState(*record[2:7])
+            renderer.add_trajectory_point(record[2], record[3])
+
+        renderer.follow_target(*vehicle.get_position())
+        renderer.draw_background(map_env, map_env.start, map_env.goal)
+
+        if circles is not None:
+            scale = (renderer.scale_x + renderer.scale_y) / 2
+            for x, y, radius in circles:
+                pygame.draw.circle(renderer.screen, (255, 50, 50),
+                                   renderer.world_to_screen(x, y), int(radius * scale), 1)
+
+        if renderer.show_path and path is not None and len(path) > 1:
+            pygame.draw.lines(renderer.screen, options['path_color'], False,
+                              renderer.world_to_screen_array(path).tolist(), 2)
+
+        if received:
+            if num_rays:
+                distances = record[n + len(info_fields):]
+                renderer.draw_lidar_zone(vehicle, sensor_range=options['lidar_range'],
+                                         fov_deg=360, alpha=40)
+                renderer.draw_lidar_rays(vehicle.get_position(), record[4] + ray_offsets, distances)
+            renderer.draw_trajectory()
+            renderer.draw_vehicle(vehicle)
+            if not np.isnan(record[8]):
+                renderer.draw_point(record[8], record[9], color=options['target_color'], radius=6)
+
+            additional_info = {}
+            status = int(record[7])
+            if 0 <= status < len(status_labels):
+                additional_info['State'] = status_labels[status]
+            for name, value in zip(info_fields, record[n:n + len(info_fields)]):
+                additional_info[name] = f'{value:.2f}'
+            additional_info['Sim time'] = f'{record[1]:.1f}s'
+            additional_info['Dropped'] = ring.dropped
+            renderer.draw_info_panel(vehicle, int(record[0]), clock.get_fps(), additional_info)
+        else:
+            renderer.draw_trajectory()
+
+        renderer.draw_legend()
+        renderer.draw_controls_help()
+        renderer.update()
+        clock.tick(options['target_fps'])
+
+    commands.put("quit")
+    renderer.close()
+    ring.close()
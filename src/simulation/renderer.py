@@ -1,5 +1,7 @@
+import os
 import pygame
 import numpy as np
+import time
 from typing import Tuple, List, Optional
 import sys
 from pathlib import Path
@@ -25,6 +27,10 @@ class Color:
     PURPLE = (128, 0, 128)
     CYAN = (0, 255, 255)
 
+# Transparent color of the trail surface (never used for drawing)
+_TRAIL_COLORKEY = (1, 2, 3)
+
+
 class Renderer:
     """
     Pygame renderer for autonomous car simulation.
@@ -42,8 +48,25 @@ class Renderer:
                  screen_height: int = 800,
                  world_width: float = 100.0,
                  world_height: float = 100.0,
-                 caption: str = "Autonomous Car 2D"):
-        
+                 caption: str = "Autonomous Car 2D",
+                 max_trajectory_length: int = 1000,
+                 hud_refresh_rate: float = 0.0,
+                 offscreen: bool = False):
+        """
+        Initialize renderer.
+
+        Args:
+            screen_width, screen_height: Window size (pixels)
+            world_width, world_height: Visible world size (meters)
+            caption: Window caption
+            max_trajectory_length: Trajectory points kept in the history
+            hud_refresh_rate: Info panel updates per second (0 = every frame)
+            offscreen: Draw into a plain Surface instead of a window (video
+                export, rgb_array); uses the dummy SDL video driver
+        """
+        
+        if offscreen:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
         pygame.init()
         pygame.font.init()
         
@@ -52,9 +75,13 @@ class Renderer:
         self.world_width = world_width
         self.world_height = world_height
         
-        # Create window
-        self.screen = pygame.display.set_mode((screen_width, screen_height))
-        pygame.display.set_caption(caption)
+        # Create window (or an off-screen surface)
+        self.offscreen = offscreen
+        if offscreen:
+            self.screen = pygame.Surface((screen_width, screen_height))
+        else:
+            self.screen = pygame.display.set_mode((screen_width, screen_height))
+            pygame.display.set_caption(caption)
         
         # Fonts
         self.font_small = pygame.font.SysFont('Arial', 14)
@@ -64,6 +91,24 @@ class Renderer:
         # Coordinate scaling
         self.scale_x = screen_width / world_width
         self.scale_y = screen_height / world_height
+
+        # Camera: zoom 1 centered on the world fits the whole map; zoom, pan
+        # and follow only change scale_* and offset_*
+        self._fit_scale_x = self.scale_x
+        self._fit_scale_y = self.scale_y
+        self.zoom = 1.0
+        self.min_zoom = 0.1
+        self.max_zoom = 50.0
+        self.camera_x = world_width / 2
+        self.camera_y = world_height / 2
+        self.follow = False
+        self.follow_margin = 0.25  # recenter when the target leaves the inner 50%
+        self._drag_start = None
+
+        # Level of detail: obstacles smaller than this (pixels) are drawn as
+        # filled boxes, grid lines are never closer than grid_min_pixels
+        self.lod_pixels = 4
+        self.grid_min_pixels = 8
         
         # Visualization options
         self.show_grid = True
@@ -72,47 +117,245 @@ class Renderer:
         self.show_info = True
         self.show_sensors = True
 
-        self.trajectory : List[Tuple[float, float]] = []
-        self.max_trajectory_length = 1000
+        # Trajectory history: ring buffer of world points. Points are
+        # addressed by their absolute index (number of points added before)
+        self.max_trajectory_length = max(int(max_trajectory_length), 2)
+        self._traj = np.zeros((self.max_trajectory_length, 2))
+        self._traj_total = 0
+        self._traj_count = 0
+
+        # Trail surface, extended with the newest segment each frame and
+        # redrawn only when enough old points have left the ring buffer
+        self._trail: Optional[pygame.Surface] = None
+        self._trail_key = None
+        self._trail_first = 0
+        self._trail_drawn = 0
+        self._trail_rect: Optional[pygame.Rect] = None
+
+        # Reused overlays: text surfaces keyed by (font, color, string),
+        # panel backgrounds keyed by size, and one sensor-zone surface that
+        # only grows
+        self._text_cache = {}
+        self._panels = {}
+        self._lidar_overlay: Optional[pygame.Surface] = None
+        self._lidar_key = None
+
+        # HUD throttling: info panel lines are rebuilt at most
+        # hud_refresh_rate times per second
+        self.hud_refresh_rate = hud_refresh_rate
+        self._hud_lines: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+        self._hud_height = 0
+        self._hud_time = 0.0
 
         self.offset_x = 0
         self.offset_y = 0
 
+        # Static layer (grid, obstacles, start/goal), rebuilt only when the
+        # map version, the markers or the viewport change
+        self._background: Optional[pygame.Surface] = None
+        self._background_key = None
+
     def world_to_screen(self, x: float, y: float) -> Tuple[int, int]:
         """Convert world coordinates to screen coordinates"""
         screen_x = int((x + self.offset_x) * self.scale_x)
         screen_y = int(self.screen_height - (y + self.offset_y) * self.scale_y)
         return (screen_x, screen_y)
     
+    def world_to_screen_array(self, points: np.ndarray) -> np.ndarray:
+        """Vectorized world_to_screen for (N, 2) points; returns (N, 2) int."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        screen = np.empty(points.shape, dtype=np.int64)
+        screen[:, 0] = (points[:, 0] + self.offset_x) * self.scale_x
+        screen[:, 1] = self.screen_height - (points[:, 1] + self.offset_y) * self.scale_y
+        return screen
+
     def screen_to_world(self, screen_x: int, screen_y: int) -> Tuple[float, float]:
         x = screen_x / self.scale_x - self.offset_x
         y = (self.screen_height - screen_y) / self.scale_y - self.offset_y
         return (x, y)
     
+    def set_camera(self, x: Optional[float] = None, y: Optional[float] = None,
+                   zoom: Optional[float] = None):
+        """
+        Move the camera.
+
+        Args:
+            x, y: World point shown at the screen center
+            zoom: Magnification relative to the fit-whole-world view
+        """
+        if x is not None:
+            self.camera_x = x
+        if y is not None:
+            self.camera_y = y
+        if zoom is not None:
+            self.zoom = float(np.clip(zoom, self.min_zoom, self.max_zoom))
+
+        self.scale_x = self._fit_scale_x * self.zoom
+        self.scale_y = self._fit_scale_y * self.zoom
+        self.offset_x = self.screen_width / (2 * self.scale_x) - self.camera_x
+        self.offset_y = self.screen_height / (2 * self.scale_y) - self.camera_y
+
+    def reset_camera(self):
+        """Show the whole world and stop following."""
+        self.follow = False
+        self.set_camera(self.world_width / 2, self.world_height / 2, 1.0)
+
+    def zoom_at(self, factor: float, screen_pos: Optional[Tuple[int, int]] = None):
+        """Zoom by factor, keeping the world point under screen_pos fixed."""
+        screen_pos = screen_pos or (self.screen_width // 2, self.screen_height // 2)
+        before = self.screen_to_world(*screen_pos)
+        self.set_camera(zoom=self.zoom * factor)
+        after = self.screen_to_world(*screen_pos)
+        self.set_camera(self.camera_x + before[0] - after[0],
+                        self.camera_y + before[1] - after[1])
+
+    def pan(self, dx: float, dy: float):
+        """Move the view by (dx, dy) screen pixels (content follows the mouse)."""
+        self.set_camera(self.camera_x - dx / self.scale_x,
+                        self.camera_y + dy / self.scale_y)
+
+    def follow_target(self, x: float, y: float):
+        """
+        Recenter on (x, y) when follow is on and the target leaves the inner
+        part of the view. The dead zone keeps the camera (and so the cached
+        background) still most frames.
+        """
+        if not self.follow:
+            return
+        xmin, ymin, xmax, ymax = self.get_view_bounds()
+        margin_x = (xmax - xmin) * self.follow_margin
+        margin_y = (ymax - ymin) * self.follow_margin
+        if not (xmin + margin_x <= x <= xmax - margin_x and
+                ymin + margin_y <= y <= ymax - margin_y):
+            self.set_camera(x, y)
+
+    def get_view_bounds(self) -> Tuple[float, float, float, float]:
+        """Visible world rectangle (xmin, ymin, xmax, ymax)."""
+        xmin, ymax = self.screen_to_world(0, 0)
+        xmax, ymin = self.screen_to_world(self.screen_width, self.screen_height)
+        return xmin, ymin, xmax, ymax
+
+    def handle_camera_event(self, event) -> bool:
+        """
+        Camera controls: mouse wheel zoom, left-drag pan, C follow, V reset view.
+
+        Returns:
+            True if the event was used by the camera
+        """
+        if event.type == pygame.MOUSEWHEEL:
+            self.zoom_at(1.25 ** event.y, pygame.mouse.get_pos())
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self._drag_start = event.pos
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self._drag_start = None
+        elif event.type == pygame.MOUSEMOTION and self._drag_start is not None:
+            self.follow = False
+            self.pan(*event.rel)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_c:
+            self.follow = not self.follow
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_v:
+            self.reset_camera()
+        else:
+            return False
+        return True
+
     def clear(self, color: Tuple[int, int, int] = Color.WHITE):
         self.screen.fill(color)
 
+    def draw_background(self, map_env: Optional[Map2D] = None,
+                        start: Optional[Tuple[float, float]] = None,
+                        goal: Optional[Tuple[float, float]] = None,
+                        grid: bool = True):
+        """
+        Blit the cached static layer: equivalent to clear(), draw_grid(),
+        draw_map() and draw_start_goal(), but the layer is only redrawn when
+        the map version, start/goal, grid visibility or viewport changes.
+
+        Args:
+            map_env: Map whose obstacles are drawn
+            start: Start marker (drawn together with goal)
+            goal: Goal marker
+            grid: Draw the grid (still subject to show_grid)
+        """
+        markers = tuple(None if p is None else (float(p[0]), float(p[1])) for p in (start, goal))
+        key = (
+            id(map_env), map_env.version if map_env is not None else None,
+            markers, grid and self.show_grid,
+            self.offset_x, self.offset_y, self.scale_x, self.scale_y,
+            self.screen.get_size()
+        )
+        if self._background is None or key != self._background_key:
+            self._background = self._render_background(map_env, start, goal, grid)
+            self._background_key = key
+        self.screen.blit(self._background, (0, 0))
+
+    def invalidate_background(self):
+        """Force the static layer to be redrawn on the next frame."""
+        self._background = None
+
+    def _render_background(self, map_env: Optional[Map2D],
+                           start: Optional[Tuple[float, float]],
+                           goal: Optional[Tuple[float, float]],
+                           grid: bool) -> pygame.Surface:
+        # Draw with the regular helpers, pointed at an off-screen surface
+        background = pygame.Surface(self.screen.get_size()).convert(self.screen)
+        screen = self.screen
+        self.screen = background
+        try:
+            self.clear()
+            if grid:
+                self.draw_grid()
+            if map_env is not None:
+                self.draw_map(map_env)
+            if start is not None and goal is not None:
+                self.draw_start_goal(start, goal)
+        finally:
+            self.screen = screen
+        return background
+
     def draw_grid(self, grid_size: float = 10.0, color: Tuple[int, int, int] = Color.LIGHT_GRAY):
         if not self.show_grid:
             return
 
-        x = 0
-        while x < self.world_width:
+        # Level of detail: coarser grid when zoomed out
+        while grid_size * min(self.scale_x, self.scale_y) < self.grid_min_pixels:
+            grid_size *= 5
+
+        # Only the lines inside the view
+        xmin, ymin, xmax, ymax = self.get_view_bounds()
+        x = max(0.0, np.ceil(xmin / grid_size) * grid_size)
+        while x < self.world_width and x <= xmax:
             start = self.world_to_screen(x, 0)
             end = self.world_to_screen(x, self.world_height)
             pygame.draw.line(self.screen, color, start, end, 1)
             x += grid_size
         
-        y = 0
-        while y <= self.world_height:
+        y = max(0.0, np.ceil(ymin / grid_size) * grid_size)
+        while y <= self.world_height and y <= ymax:
             start = self.world_to_screen(0, y)
             end = self.world_to_screen(self.world_width, y)
             pygame.draw.line(self.screen, color, start, end, 1)
             y += grid_size
         
     def draw_map(self, map_env: Map2D):
-        """Draw map obstacles."""
-        for obstacle in map_env.obstacles:
+        """Draw the obstacles whose bounding boxes intersect the view."""
+        visible = map_env.query_bbox(*self.get_view_bounds())
+        bounds = map_env.get_obstacle_bounds()[visible]
+        
+        # Level of detail: obstacles a few pixels across become filled boxes
+        width_px = (bounds[:, 2] - bounds[:, 0]) * self.scale_x
+        height_px = (bounds[:, 3] - bounds[:, 1]) * self.scale_y
+        small = np.maximum(width_px, height_px) < self.lod_pixels
+        corners = self.world_to_screen_array(bounds[:, [0, 3]])
+        
+        for i, is_small, corner, w, h in zip(visible.tolist(), small.tolist(), corners.tolist(),
+                                             width_px.tolist(), height_px.tolist()):
+            if is_small:
+                pygame.draw.rect(self.screen, Color.DARK_GRAY,
+                                 (corner[0], corner[1], max(int(w), 1), max(int(h), 1)))
+                continue
+            
+            obstacle = map_env.obstacles[i]
             if isinstance(obstacle, CircleObstacle):
                 self._draw_circle_obstacle(obstacle)
             elif isinstance(obstacle, RectangleObstacle):
@@ -129,17 +372,27 @@ class Renderer:
     
     def _draw_rectangle_obstacle(self, obstacle: RectangleObstacle):
         """Draw rectangular obstacle."""
-        corners = obstacle.get_corners()
-        screen_points = [self.world_to_screen(x, y) for x, y in corners]
+        screen_points = self._screen_polygon(obstacle.get_corners())
+        if len(screen_points) < 3:
+            return
         pygame.draw.polygon(self.screen, Color.DARK_GRAY, screen_points)
         pygame.draw.polygon(self.screen, Color.BLACK, screen_points, 2)
     
     def _draw_polygon_obstacle(self, obstacle: PolygonObstacle):
         """Draw polygon obstacle."""
-        screen_points = [self.world_to_screen(x, y) for x, y in obstacle.vertices]
+        screen_points = self._screen_polygon(obstacle.vertices)
+        if len(screen_points) < 3:
+            return
         pygame.draw.polygon(self.screen, Color.DARK_GRAY, screen_points)
         pygame.draw.polygon(self.screen, Color.BLACK, screen_points, 2)
 
+    def _screen_polygon(self, vertices: np.ndarray) -> List[List[int]]:
+        """Screen vertices, with consecutive vertices on the same pixel merged (LOD)."""
+        points = self.world_to_screen_array(vertices)
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = (points[1:] != points[:-1]).any(axis=1)
+        return points[keep].tolist()
+
     def draw_vehicle(self, vehicle: Vehicle, color: Tuple[int, int, int] = Color.BLUE):
         """Draw vehicle as a rectangle with heading indicator."""
         corners = vehicle.get_corners()
@@ -166,9 +419,9 @@ class Renderer:
                        fov_deg: float = 360.0, 
                        color: Tuple[int, int, int] = (0, 255, 255), 
                        alpha: int = 50):
+        """Draw the sensor coverage as a translucent overlay clipped to its bounding rect."""
         if not self.show_sensors:
             return
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
         
         rgba_color = (*color, alpha)
         
@@ -177,11 +430,19 @@ class Renderer:
         
         center_screen = self.world_to_screen(pos[0], pos[1])
         
-        points = [center_screen]
-        
         if fov_deg >= 360:
             radius = int(sensor_range * self.scale_x)
-            pygame.draw.circle(overlay, rgba_color, center_screen, radius)
+            if radius <= 0:
+                return
+            # The disc never changes: draw it once, then only blit
+            key = (radius, rgba_color)
+            overlay = self._get_lidar_overlay(2 * radius + 1, 2 * radius + 1)
+            if self._lidar_key != key:
+                overlay.fill((0, 0, 0, 0))
+                pygame.draw.circle(overlay, rgba_color, (radius, radius), radius)
+                self._lidar_key = key
+            self.screen.blit(overlay, (center_screen[0] - radius, center_screen[1] - radius),
+                             (0, 0, 2 * radius + 1, 2 * radius + 1))
             pygame.draw.circle(self.screen, color, center_screen, radius, 1)
         else:
             fov_rad = np.radians(fov_deg)
@@ -190,20 +451,41 @@ class Renderer:
 
             num_points = int(fov_deg / 5) + 2 
             angles = np.linspace(start_angle, end_angle, num_points)
+            arc = np.column_stack((pos[0] + sensor_range * np.cos(angles),
+                                   pos[1] + sensor_range * np.sin(angles)))
+            points = np.vstack((center_screen, self.world_to_screen_array(arc)))
             
-            for angle in angles:
-                wx = pos[0] + sensor_range * np.cos(angle)
-                wy = pos[1] + sensor_range * np.sin(angle)
-                
-                sx, sy = self.world_to_screen(wx, wy)
-                points.append((sx, sy))
+            top_left = points.min(axis=0)
+            width, height = points.max(axis=0) - top_left + 1
+            overlay = self._get_lidar_overlay(width, height)
+            overlay.fill((0, 0, 0, 0), (0, 0, width, height))
+            pygame.draw.polygon(overlay, rgba_color, (points - top_left).tolist())
+            self._lidar_key = None
             
-            if len(points) > 2:
-                pygame.draw.polygon(overlay, rgba_color, points)
-                
-                pygame.draw.lines(self.screen, color, True, points, 1)
+            self.screen.blit(overlay, top_left.tolist(), (0, 0, width, height))
+            pygame.draw.lines(self.screen, color, True, points.tolist(), 1)
+
+    def _get_lidar_overlay(self, width: int, height: int) -> pygame.Surface:
+        overlay = self._lidar_overlay
+        if overlay is None or overlay.get_width() < width or overlay.get_height() < height:
+            size = (max(int(width), overlay.get_width() if overlay else 0),
+                    max(int(height), overlay.get_height() if overlay else 0))
+            overlay = self._lidar_overlay = pygame.Surface(size, pygame.SRCALPHA)
+            self._lidar_key = None
+        return overlay
 
-        self.screen.blit(overlay, (0, 0))
+    def draw_lidar_rays(self, origin: Tuple[float, float],
+                        angles: np.ndarray, distances: np.ndarray,
+                        color: Tuple[int, int, int] = (0, 200, 200)):
+        """Draw LIDAR rays from origin to their hit points (e.g. from Map2D.raycast)."""
+        if not self.show_sensors:
+            return
+        
+        start = self.world_to_screen(origin[0], origin[1])
+        ends = np.column_stack((origin[0] + distances * np.cos(angles),
+                                origin[1] + distances * np.sin(angles)))
+        for end in self.world_to_screen_array(ends).tolist():
+            pygame.draw.line(self.screen, color, start, end, 1)
 
     def draw_path(self, path: PlannedPath, color: Tuple[int, int, int] = Color.RED):
         """Draw planned path."""
@@ -218,27 +500,85 @@ class Renderer:
             pygame.draw.circle(self.screen, color, point, 3)
 
 
-    def draw_trajectory(self, trajectory: Optional[List[Tuple[float, float]]] = None,
+    def draw_trajectory(self, trajectory: Optional[np.ndarray] = None,
                        color: Tuple[int, int, int] = Color.CYAN):
-        """Draw vehicle trajectory history."""
+        """
+        Draw vehicle trajectory history.
+
+        Args:
+            trajectory: (N, 2) points to draw directly; default is the
+                renderer's own history, drawn through the cached trail
+            color: Line color
+        """
         if not self.show_trajectory:
             return
-        
-        traj = trajectory if trajectory is not None else self.trajectory
-        
-        if len(traj) < 2:
+
+        if trajectory is not None:
+            if len(trajectory) >= 2:
+                points = self.world_to_screen_array(trajectory).tolist()
+                pygame.draw.lines(self.screen, color, False, points, 2)
             return
-        
-        points = [self.world_to_screen(x, y) for x, y in traj]
-        pygame.draw.lines(self.screen, color, False, points, 2)
+
+        if self._traj_count < 2:
+            return
+        self._update_trail(color)
+        if self._trail_rect is not None:
+            self.screen.blit(self._trail, self._trail_rect.topleft, self._trail_rect)
+
+    def _update_trail(self, color: Tuple[int, int, int]):
+        oldest = self._traj_total - self._traj_count
+        key = (color, self.offset_x, self.offset_y, self.scale_x, self.scale_y,
+               self.screen.get_size())
+
+        # Redraw when the viewport changed, or when the points that left the
+        # ring buffer (still visible on the trail) exceed 1/8 of its size
+        stale = oldest - self._trail_first
+        if (self._trail is None or key != self._trail_key
+                or self._trail_drawn < oldest
+                or stale > self.max_trajectory_length // 8):
+            if self._trail is None or self._trail.get_size() != self.screen.get_size():
+                self._trail = pygame.Surface(self.screen.get_size()).convert(self.screen)
+                self._trail.set_colorkey(_TRAIL_COLORKEY)
+            self._trail.fill(_TRAIL_COLORKEY)
+            self._trail_key = key
+            self._trail_first = oldest
+            self._trail_drawn = oldest
+            self._trail_rect = None
+
+        # Newest segment only, starting at the last point already drawn
+        first = max(self._trail_drawn - 1, oldest)
+        if self._traj_total - first < 2:
+            return
+        indices = np.arange(first, self._traj_total) % self.max_trajectory_length
+        points = self.world_to_screen_array(self._traj[indices]).tolist()
+        rect = pygame.draw.lines(self._trail, color, False, points, 2)
+        self._trail_rect = rect if self._trail_rect is None else self._trail_rect.union(rect)
+        self._trail_drawn = self._traj_total
 
     def add_trajectory_point(self, x: float, y: float):
-        """Add point to trajectory history."""
-        self.trajectory.append((x, y))
-        
-        # Limit trajectory length
-        if len(self.trajectory) > self.max_trajectory_length:
-            self.trajectory.pop(0)
+        """Add point to trajectory history (O(1), oldest point is dropped when full)."""
+        self._traj[self._traj_total % self.max_trajectory_length] = (x, y)
+        self._traj_total += 1
+        if self._traj_count < self.max_trajectory_length:
+            self._traj_count += 1
+
+    def clear_trajectory(self):
+        """Drop the trajectory history."""
+        self._traj_total = 0
+        self._traj_count = 0
+        self._trail = None
+
+    @property
+    def trajectory(self) -> np.ndarray:
+        """(N, 2) copy of the trajectory history, oldest first."""
+        indices = np.arange(self._traj_total - self._traj_count, self._traj_total)
+        return self._traj[indices % self.max_trajectory_length]
+
+    @trajectory.setter
+    def trajectory(self, points):
+        self.clear_trajectory()
+        for x, y in np.asarray(points, dtype=float).reshape(-1, 2)[-self.max_trajectory_length:]:
+            self.add_trajectory_point(x, y)
     
     def draw_point(self, x: float, y: float, 
                    color: Tuple[int, int, int] = Color.GREEN,
@@ -250,7 +590,7 @@ class Renderer:
         pygame.draw.circle(self.screen, Color.BLACK, screen_pos, radius, 1)
         
         if label:
-            text = self.font_small.render(label, True, Color.BLACK)
+            text = self.render_text(label, self.font_small, Color.BLACK)
             self.screen.blit(text, (screen_pos[0] + 8, screen_pos[1] - 8))
     
     def draw_start_goal(self, start: Tuple[float, float], 
@@ -264,8 +604,30 @@ class Renderer:
                  font: Optional[pygame.font.Font] = None):
         """Draw text at screen coordinates."""
         font = font or self.font_medium
-        text_surface = font.render(text, True, color)
-        self.screen.blit(text_surface, (x, y))
+        self.screen.blit(self.render_text(text, font, color), (x, y))
+
+    def render_text(self, text: str,
+                    font: pygame.font.Font,
+                    color: Tuple[int, int, int] = Color.BLACK) -> pygame.Surface:
+        """Rendered text surface, re-rendered only for strings not seen before."""
+        key = (id(font), color, text)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            # Changing values (position, FPS, ...) keep adding new strings
+            if len(self._text_cache) >= 2048:
+                self._text_cache.clear()
+            surface = self._text_cache[key] = font.render(text, True, color)
+        return surface
+
+    def _panel(self, width: int, height: int, alpha: int) -> pygame.Surface:
+        """Reused semi-transparent panel background."""
+        key = (width, height, alpha)
+        panel = self._panels.get(key)
+        if panel is None:
+            panel = self._panels[key] = pygame.Surface((width, height))
+            panel.set_alpha(alpha)
+            panel.fill(Color.LIGHT_GRAY)
+        return panel
     
     def draw_info_panel(self, vehicle: Vehicle, 
                        step: int = 0,
@@ -275,20 +637,26 @@ class Renderer:
         if not self.show_info:
             return
         
+        # Text lines are rebuilt at most hud_refresh_rate times per second
+        now = time.perf_counter()
+        if (not self._hud_lines or self.hud_refresh_rate <= 0
+                or now - self._hud_time >= 1.0 / self.hud_refresh_rate):
+            self._hud_time = now
+            self._build_info_lines(vehicle, step, fps, additional_info)
+        
         # Semi-transparent background
-        panel_width = 250
-        panel_height = 200
-        panel = pygame.Surface((panel_width, panel_height))
-        panel.set_alpha(200)
-        panel.fill(Color.LIGHT_GRAY)
-        self.screen.blit(panel, (10, 10))
-        
-        # Draw text
+        self.screen.blit(self._panel(250, self._hud_height, 200), (10, 10))
+        for surface, position in self._hud_lines:
+            self.screen.blit(surface, position)
+
+    def _build_info_lines(self, vehicle: Vehicle, step: int, fps: float,
+                          additional_info: Optional[dict]):
+        lines = []
         y_offset = 20
         line_height = 25
         
         # Title
-        self.draw_text("Vehicle Info", 20, y_offset, Color.BLACK, self.font_large)
+        lines.append((self.render_text("Vehicle Info", self.font_large), (20, y_offset)))
         y_offset += line_height + 10
         
         # Vehicle stats
@@ -303,16 +671,18 @@ class Renderer:
         ]
         
         for line in info_lines:
-            self.draw_text(line, 20, y_offset, Color.BLACK, self.font_small)
+            lines.append((self.render_text(line, self.font_small), (20, y_offset)))
             y_offset += line_height
         
         # Additional info
         if additional_info:
             y_offset += 10
             for key, value in additional_info.items():
-                text = f"{key}: {value}"
-                self.draw_text(text, 20, y_offset, Color.BLACK, self.font_small)
+                lines.append((self.render_text(f"{key}: {value}", self.font_small), (20, y_offset)))
                 y_offset += line_height
+        
+        self._hud_lines = lines
+        self._hud_height = 200 + (len(additional_info) * 25 + 10 if additional_info else 0)
     
     def draw_legend(self):
         """Draw legend explaining colors."""
@@ -329,10 +699,7 @@ class Renderer:
         y_offset = 10
         
         # Background
-        panel = pygame.Surface((140, len(legend_items) * 25 + 20))
-        panel.set_alpha(200)
-        panel.fill(Color.LIGHT_GRAY)
-        self.screen.blit(panel, (x_offset, y_offset))
+        self.screen.blit(self._panel(140, len(legend_items) * 25 + 20, 200), (x_offset, y_offset))
         
         y_offset += 10
         for label, color in legend_items:
@@ -351,10 +718,16 @@ class Renderer:
         """Draw keyboard controls help."""
         help_text = [
             "Controls:",
+            "R - Reset & Replan",
             "G - Toggle Grid",
             "P - Toggle Path",
             "T - Toggle Trajectory",
             "I - Toggle Info",
+            "+/- - Steps per Frame",
+            "F - Free-run Physics",
+            "C - Follow Vehicle",
+            "V - Reset View",
+            "Wheel/Drag - Zoom/Pan",
             "ESC - Quit"
         ]
         
@@ -362,10 +735,7 @@ class Renderer:
         y_offset = self.screen_height - len(help_text) * 20 - 20
         
         # Background
-        panel = pygame.Surface((170, len(help_text) * 20 + 10))
-        panel.set_alpha(180)
-        panel.fill(Color.LIGHT_GRAY)
-        self.screen.blit(panel, (x_offset, y_offset))
+        self.screen.blit(self._panel(170, len(help_text) * 20 + 10, 180), (x_offset, y_offset))
         
         y_offset += 5
         for line in help_text:
@@ -375,7 +745,12 @@ class Renderer:
     
     def update(self):
         """Update display."""
-        pygame.display.flip()
+        if not self.offscreen:
+            pygame.display.flip()
+
+    def get_frame(self) -> np.ndarray:
+        """Current screen contents as an (H, W, 3) uint8 RGB array."""
+        return pygame.surfarray.array3d(self.screen).transpose(1, 0, 2)
     
     def close(self):
         """Close renderer and quit pygame."""
@@ -0,0 +1,202 @@
+import pygame
+import numpy as np
+from typing import Optional
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.core.map import Map2D
+from src.core.vehicle import Vehicle, VehicleConfig
+from src.planning.base_planner import Path as PlannedPath, PathPoint
+from src.simulation.recorder import TrajectoryLog
+from src.simulation.renderer import Renderer, Color
+
+
+class ReplayViewer:
+    """
+    Render a recorded run straight from a TrajectoryLog.
+
+    Nothing is planned or simulated: each frame only sets the vehicle
+    state from the log columns and draws. Supports seeking and variable
+    playback speed.
+    """
+
+    def __init__(self, log: TrajectoryLog,
+                 screen_width: int = 800,
+                 screen_height: int = 800,
+                 renderer: Optional[Renderer] = None,
+                 offscreen: bool = False):
+        """
+        Initialize viewer.
+
+        Args:
+            log: Recorded run
+            screen_width: Window width (ignored if renderer is given)
+            screen_height: Window height (ignored if renderer is given)
+            renderer: Existing renderer to draw into
+            offscreen: Render without a window (video export)
+        """
+        self.log = log
+        meta = log.metadata
+
+        self.map_env = Map2D.from_dict(meta['map']) if meta.get('map') else None
+        path_points = meta.get('path') or []
+        self.path = PlannedPath([PathPoint(x, y) for x, y in path_points]) if path_points else None
+        self.lidar_angles = np.asarray(meta['lidar_angles']) if 'lidar_angles' in meta else None
+
+        vehicle_cfg = meta.get('vehicle')
+        self.vehicle = Vehicle(VehicleConfig(**vehicle_cfg) if vehicle_cfg else None)
+
+        self.renderer = renderer or Renderer(
+            screen_width=screen_width,
+            screen_height=screen_height,
+            world_width=self.map_env.width if self.map_env else 100,
+            world_height=self.map_env.height if self.map_env else 100,
+            caption="Autonomous Car 2D - Replay",
+            offscreen=offscreen
+        )
+
+        self.frame = 0
+        self.speed = 1
+        self.paused = False
+        self._clock = pygame.time.Clock()
+
+    def seek(self, frame: int):
+        """Jump to a frame (clamped to the log)."""
+        self.frame = int(np.clip(frame, 0, max(len(self.log) - 1, 0)))
+
+    def render_frame(self, frame: Optional[int] = None):
+        """Draw one frame of the log onto the renderer's screen."""
+        if frame is not None:
+            self.seek(frame)
+        i = self.frame
+        log = self.log
+        renderer = self.renderer
+
+        state = self.vehicle.state
+        state.x = float(log['x'][i])
+        state.y = float(log['y'][i])
+        state.theta = float(log['theta'][i])
+        state.velocity = float(log['velocity'][i])
+        state.steering_angle = float(log['steering_angle'][i])
+
+        renderer.follow_target(state.x, state.y)
+        map_env = self.map_env
+        renderer.draw_background(map_env,
+                                 map_env.start if map_env else None,
+                                 map_env.goal if map_env else None)
+        if self.path:
+            renderer.draw_path(self.path)
+
+        start = max(0, i + 1 - renderer.max_trajectory_length)
+        renderer.draw_trajectory(np.column_stack((log['x'][start:i + 1], log['y'][start:i + 1])))
+
+        if self.lidar_angles is not None and 'lidar' in log:
+            renderer.draw_lidar_rays(
+                self.vehicle.get_position(), self.lidar_angles,
+                log['lidar'][i] * log.metadata.get('lidar_range', 1.0)
+            )
+
+        renderer.draw_vehicle(self.vehicle)
+
+        if 'target_x' in log and not np.isnan(log['target_x'][i]):
+            renderer.draw_point(float(log['target_x'][i]), float(log['target_y'][i]),
+                                color=Color.ORANGE, radius=6)
+
+        additional_info = {
+            'Frame': f"{i + 1}/{len(log)}",
+            'Time': f"{float(log['time'][i]):.1f}s" if 'time' in log else '-',
+            'Speed': f"{self.speed}x" + (' (paused)' if self.paused else ''),
+        }
+        events = log.events_until(i)
+        if events:
+            additional_info['Event'] = events[-1][1]
+        step = int(log['step'][i]) if 'step' in log else i
+        renderer.draw_info_panel(self.vehicle, step, self._clock.get_fps(), additional_info)
+
+    def save_video(self, filename: str, every: int = 2, fps: int = 20):
+        """
+        Render the log to a video (.mp4, .avi or .gif), streamed frame by
+        frame (no re-simulation, frames are not kept in memory).
+        
+        Args:
+            filename: Output path
+            every: Keep one frame out of every `every`
+            fps: Playback rate
+        """
+        from src.simulation.video import VideoWriter
+        
+        if len(self.log) == 0:
+            print("Error: Empty log, nothing to save")
+            return
+        with VideoWriter(filename, fps=fps) as writer:
+            for i in range(0, len(self.log), max(1, every)):
+                self.render_frame(i)
+                writer.write(self.renderer.get_frame())
+    
+    def save_gif(self, filename: str, every: int = 2, fps: int = 20):
+        """Render the log to an animated GIF (see save_video)."""
+        self.save_video(filename, every=every, fps=fps)
+
+    def run(self, fps: int = 40):
+        """
+        Interactive replay.
+
+        Keys: SPACE pause, LEFT/RIGHT step one frame, PAGE UP/DOWN jump
+        100 frames back/forward, HOME/END first/last frame, +/- playback speed, ESC quit.
+        Camera: mouse wheel zoom, left-drag pan, C follow vehicle, V reset view.
+        """
+        print("Controls: SPACE=Pause, LEFT/RIGHT=Step, PGUP/PGDN=Jump, HOME/END, +/-=Speed, "
+              "Wheel/Drag=Zoom/Pan, C=Follow, V=Reset View, ESC=Quit")
+
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif self.renderer.handle_camera_event(event):
+                    continue
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        running = False
+                    elif event.key == pygame.K_SPACE:
+                        self.paused = not self.paused
+                    elif event.key == pygame.K_RIGHT:
+                        self.paused = True
+                        self.seek(self.frame + 1)
+                    elif event.key == pygame.K_LEFT:
+                        self.paused = True
+                        self.seek(self.frame - 1)
+                    elif event.key == pygame.K_PAGEDOWN:
+                        self.seek(self.frame + 100)
+                    elif event.key == pygame.K_PAGEUP:
+                        self.seek(self.frame - 100)
+                    elif event.key == pygame.K_HOME:
+                        self.seek(0)
+                    elif event.key == pygame.K_END:
+                        self.seek(len(self.log) - 1)
+                    elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                        self.speed *= 2
+                    elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                        self.speed = max(1, self.speed // 2)
+                    elif event.key == pygame.K_g:
+                        self.renderer.show_grid = not self.renderer.show_grid
+                    elif event.key == pygame.K_p:
+                        self.renderer.show_path = not self.renderer.show_path
+                    elif event.key == pygame.K_t:
+                        self.renderer.show_trajectory = not self.renderer.show_trajectory
+                    elif event.key == pygame.K_i:
+                        self.renderer.show_info = not self.renderer.show_info
+
+            self.render_frame()
+            self.renderer.update()
+
+            if not self.paused:
+                if self.frame >= len(self.log) - 1:
+                    self.paused = True
+                else:
+                    self.seek(self.frame + self.speed)
+
+            self._clock.tick(fps)
+
+        self.renderer.close()
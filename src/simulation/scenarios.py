@@ -0,0 +1,440 @@
+import numpy as np
+import contextlib
+import io
+import json
+import csv
+import os
+import random
+import time
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict, replace
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.utils.config_loader import ConfigLoader
+
+
+PLANNERS = ("astar", "rrt", "rrt_star")
+CONTROLLERS = ("pid", "pure_pursuit", "adaptive_pure_pursuit")
+
+# Column order of the result rows
+RESULT_FIELDS = [
+    "map", "planner", "controller", "seed",
+    "success", "collision", "state", "steps", "simulation_time",
+    "planning_time", "path_length", "total_distance",
+    "tracking_error_mean", "tracking_error_max",
+    "wall_time", "error"
+]
+
+
+@dataclass
+class Scenario:
+    """One cell of the planner × controller × map × seed matrix."""
+    map_file: str
+    planner: str
+    controller: str
+    seed: int = 0
+    max_steps: int = 1000
+
+
+def build_scenario_matrix(maps: Sequence[str],
+                          planners: Sequence[str] = PLANNERS,
+                          controllers: Sequence[str] = CONTROLLERS,
+                          seeds: Sequence[int] = (0,),
+                          max_steps: int = 1000) -> List[Scenario]:
+    """
+    Expand the full cartesian product of scenario parameters.
+
+    Args:
+        maps: Map YAML files
+        planners: Planner algorithms (keys of the `planner` config section)
+        controllers: Controller types (keys of the `controller` config section)
+        seeds: Random seeds (RRT sampling)
+        max_steps: Step limit per run
+
+    Returns:
+        List of scenarios
+    """
+    for planner in planners:
+        if planner not in PLANNERS:
+            raise ValueError(f"Unknown planner: {planner}")
+    for controller in controllers:
+        if controller not in CONTROLLERS:
+            raise ValueError(f"Unknown controller: {controller}")
+
+    return [
+        Scenario(str(map_file), planner, controller, int(seed), max_steps)
+        for map_file, planner, controller, seed
+        in itertools.product(maps, planners, controllers, seeds)
+    ]
+
+
+def compute_tracking_error(trajectory: np.ndarray, path_points: np.ndarray,
+                           chunk_size: int = 4096) -> Dict[str, float]:
+    """
+    Distance from every trajectory point to the planned path polyline.
+
+    Args:
+        trajectory: (T, 2) driven positions
+        path_points: (P, 2) planned path vertices
+        chunk_size: Trajectory points processed per vectorized batch
+
+    Returns:
+        Dictionary with mean and max cross-track error
+    """
+    trajectory = np.asarray(trajectory, dtype=float).reshape(-1, 2)
+    path_points = np.asarray(path_points, dtype=float).reshape(-1, 2)
+    if len(trajectory) == 0 or len(path_points) == 0:
+        return {"tracking_error_mean": float("nan"), "tracking_error_max": float("nan")}
+    if len(path_points) == 1:
+        path_points = np.vstack([path_points, path_points])
+
+    a = path_points[:-1]
+    ab = path_points[1:] - a
+    ab_sq = np.maximum(np.einsum("ij,ij->i", ab, ab), 1e-12)
+
+    errors = np.empty(len(trajectory))
+    for i in range(0, len(trajectory), chunk_size):
+        p = trajectory[i:i + chunk_size, None, :]
+        t = np.clip(np.einsum("tsj,sj->ts", p - a, ab) / ab_sq, 0.0, 1.0)
+        closest = a + t[..., None] * ab
+        errors[i:i + chunk_size] = np.sqrt(((p - closest) ** 2).sum(axis=-1)).min(axis=1)
+
+    return {"tracking_error_mean": float(errors.mean()), "tracking_error_max": float(errors.max())}
+
+
+def scenario_name(scenario: Scenario) -> str:
+    """File-friendly name of a scenario, e.g. map1_astar_pid_s0."""
+    return f"{Path(scenario.map_file).stem}_{scenario.planner}_{scenario.controller}_s{scenario.seed}"
+
+
+def run_scenario(config_path: Optional[str], scenario: Scenario,
+                 verbose: bool = False, video: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Run a single scenario headless.
+
+    Args:
+        config_path: Base YAML config (planner/controller parameters)
+        scenario: Scenario to run
+        verbose: Keep the simulator's console output
+        video: VideoSettings; render the run off-screen and stream it to
+            <directory>/<scenario name>.<format>
+
+    Returns:
+        Result row (see RESULT_FIELDS)
+    """
+    from src.simulation.simulator import Simulator
+
+    wall_start = time.perf_counter()
+    row = {
+        "map": scenario.map_file,
+        "planner": scenario.planner,
+        "controller": scenario.controller,
+        "seed": scenario.seed,
+    }
+
+    random.seed(scenario.seed)
+    np.random.seed(scenario.seed)
+
+    config = ConfigLoader(config_path)
+    config.update("map.sim_map_yaml_file", scenario.map_file)
+    config.update("planner.algorithm", scenario.planner)
+    config.update("controller.type", scenario.controller)
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    sim = None
+    try:
+        with output:
+            sim = Simulator(config=config, headless=True)
+            if video is not None:
+                sim.enable_video(video.path_for(scenario_name(scenario)),
+                                 every=video.every, size=video.size)
+            result = sim.run_headless(max_steps=scenario.max_steps)
+            sim.stop_video()
+    except Exception as e:
+        if sim is not None:
+            sim.stop_video()
+        row.update({"success": False, "collision": False, "state": "error",
+                    "error": f"{type(e).__name__}: {e}",
+                    "wall_time": time.perf_counter() - wall_start})
+        return row
+
+    if sim.path is not None:
+        path_points = np.array([p.to_tuple() for p in sim.path.points])
+        tracking = compute_tracking_error(result.trajectory, path_points)
+    else:
+        tracking = {"tracking_error_mean": float("nan"), "tracking_error_max": float("nan")}
+
+    row.update({
+        "success": result.success,
+        "collision": result.collision,
+        "state": result.state,
+        "steps": result.steps,
+        "simulation_time": result.simulation_time,
+        "planning_time": result.timings["planning_time"],
+        "path_length": result.path_length,
+        "total_distance": result.total_distance,
+        **tracking,
+        "wall_time": time.perf_counter() - wall_start,
+        "error": "",
+    })
+    return row
+
+
+def _run_scenario_quiet(config_path: Optional[str], scenario: Scenario,
+                        video: Optional[Any] = None) -> Dict[str, Any]:
+    # Worker entry point; headless (or off-screen when exporting video)
+    return run_scenario(config_path, scenario, verbose=False, video=video)
+
+
+def run_scenario_matrix(config_path: Optional[str], scenarios: Iterable[Scenario],
+                        workers: Optional[int] = None,
+                        video: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """
+    Run scenarios in a process pool.
+
+    Args:
+        config_path: Base YAML config shared by all runs
+        scenarios: Scenarios to run
+        workers: Number of worker processes (None or <= 0 = all cores,
+            1 = run in the current process)
+        video: VideoSettings; export one video per scenario
+
+    Returns:
+        Result rows in scenario order
+    """
+    scenarios = list(scenarios)
+    if workers is None or workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, max(len(scenarios), 1))
+
+    rows: List[Optional[Dict[str, Any]]] = [None] * len(scenarios)
+
+    if workers == 1:
+        for i, scenario in enumerate(scenarios):
+            rows[i] = _run_scenario_quiet(config_path, scenario, video)
+            _print_progress(i + 1, len(scenarios), rows[i])
+        return rows
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_run_scenario_quiet, config_path, scenario, video): i
+            for i, scenario in enumerate(scenarios)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            rows[i] = future.result()
+            _print_progress(done, len(scenarios), rows[i])
+
+    return rows
+
+
+def run_scenario_matrix_adaptive(config_path: Optional[str], scenarios: Iterable[Scenario],
+                                 rule: Any, workers: Optional[int] = None,
+                                 video: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """
+    Run each scenario over seeds 0, 1, 2, ... until its stopping rule is met.
+
+    Seeds go to the cells that are still uncertain (see
+    utils.sequential.run_sequential). Even a cell that always or never
+    succeeds needs about 3.84 / width - 3.84 seeds before a 95% interval
+    is narrow enough (16 at width 0.2); mixed cells need more, up to
+    rule.max_trials.
+
+    Args:
+        config_path: Base YAML config shared by all runs
+        scenarios: One scenario per cell (their seed is ignored)
+        rule: StoppingRule, e.g. Wilson interval on "success"
+        workers: Number of worker processes (None or <= 0 = all cores,
+            1 = run in the current process)
+        video: VideoSettings; export one video per run
+
+    Returns:
+        Kept result rows, grouped by scenario
+    """
+    from src.utils.sequential import run_sequential, completed_future
+
+    scenarios = list(scenarios)
+    if workers is None or workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, max(len(scenarios) * rule.max_trials, 1))
+    cells = list(range(len(scenarios)))
+    completed = []
+    max_total = len(scenarios) * rule.max_trials
+
+    def trial(cell: int, index: int) -> Scenario:
+        return replace(scenarios[cell], seed=index)
+
+    def report(cell: int, row: Dict[str, Any]):
+        completed.append(row)
+        _print_progress(len(completed), f"<={max_total}", row)
+
+    if workers == 1:
+        kept = run_sequential(
+            cells, lambda c, i: completed_future(_run_scenario_quiet, config_path, trial(c, i), video),
+            rule, on_result=report
+        )
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            kept = run_sequential(
+                cells, lambda c, i: pool.submit(_run_scenario_quiet, config_path, trial(c, i), video),
+                rule, max_in_flight=2 * workers, on_result=report
+            )
+
+    rows = [row for cell in cells for row in kept[cell]]
+    print(f"Kept {len(rows)} of {len(completed)} runs (max {max_total})")
+    return rows
+
+
+# (config_path, map_file) -> (map, planner), built once per worker process
+_BRANCH_WORLDS: Dict[tuple, tuple] = {}
+
+
+def _run_branch(config_path: Optional[str], map_file: Optional[str], snapshot: Any,
+                controller: Optional[str], max_steps: int) -> Dict[str, Any]:
+    # Worker entry point: only the (small) snapshot crosses the process
+    # boundary; map and planner are loaded from the config once per worker
+    from src.simulation.simulator import Simulator, CONTROLLER_TYPES
+
+    wall_start = time.perf_counter()
+    controller = controller or CONTROLLER_TYPES.get(snapshot.controller_type)
+    row = {"controller": controller, "from_step": snapshot.step}
+
+    config = ConfigLoader(config_path)
+    if map_file:
+        config.update("map.sim_map_yaml_file", map_file)
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            world = _BRANCH_WORLDS.get((config_path, map_file))
+            if world is None:
+                sim = Simulator(config=config, headless=True)
+                _BRANCH_WORLDS[(config_path, map_file)] = (sim.map_env, sim.planner)
+            else:
+                sim = Simulator(config=config, headless=True, map_env=world[0], planner=world[1])
+            if controller is not None:
+                sim.controller = sim._load_controller(ctrl_type=controller)
+            sim.restore(snapshot)
+            result = sim.run_headless(max_steps=max_steps)
+    except Exception as e:
+        row.update({"success": False, "collision": False, "state": "error",
+                    "error": f"{type(e).__name__}: {e}",
+                    "wall_time": time.perf_counter() - wall_start})
+        return row
+
+    row.update({
+        "success": result.success,
+        "collision": result.collision,
+        "state": result.state,
+        "steps": result.steps,
+        "simulation_time": result.simulation_time,
+        "total_distance": result.total_distance,
+        "wall_time": time.perf_counter() - wall_start,
+        "error": "",
+    })
+    return row
+
+
+def run_branches(config_path: Optional[str], snapshot: Any,
+                 controllers: Sequence[Optional[str]],
+                 map_file: Optional[str] = None,
+                 max_steps: int = 1000,
+                 workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Continue one simulation prefix with several controllers in parallel.
+
+    Args:
+        config_path: YAML config the prefix was simulated with
+        snapshot: SimulationSnapshot taken with Simulator.snapshot()
+        controllers: Controller type per branch (None = same as the prefix)
+        map_file: Map override used for the prefix, if any
+        max_steps: Step limit (counted from the start of the prefix)
+        workers: Number of worker processes (None or <= 0 = all cores,
+            1 = run in the current process)
+
+    Returns:
+        One result row per branch, in order
+    """
+    controllers = list(controllers)
+    if workers is None or workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, max(len(controllers), 1))
+
+    if workers == 1:
+        return [_run_branch(config_path, map_file, snapshot, c, max_steps) for c in controllers]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_branch, config_path, map_file, snapshot, c, max_steps)
+                   for c in controllers]
+        return [future.result() for future in futures]
+
+
+def _print_progress(done: int, total: Any, row: Dict[str, Any]):
+    status = "error" if row.get("error") else ("OK" if row["success"] else row.get("state"))
+    print(f"[{done}/{total}] {Path(row['map']).stem} {row['planner']} "
+          f"{row['controller']} seed={row['seed']}: {status} ({row['wall_time']:.2f}s)")
+
+
+def write_results(rows: List[Dict[str, Any]], output_path: str):
+    """
+    Write result rows; format is chosen from the file extension.
+
+    Args:
+        rows: Result rows
+        output_path: .csv, .jsonl or .parquet file (parquet requires pandas
+            with pyarrow or fastparquet)
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = output_path.suffix.lower()
+
+    if suffix == ".csv":
+        with open(output_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+    elif suffix == ".jsonl":
+        with open(output_path, "w") as f:
+            for row in rows:
+                f.write(json.dumps({k: _to_builtin(row.get(k)) for k in RESULT_FIELDS}) + "\n")
+    elif suffix == ".parquet":
+        import pandas as pd
+        pd.DataFrame(rows, columns=RESULT_FIELDS).to_parquet(output_path, index=False)
+    else:
+        raise ValueError(f"Unknown output format: {suffix}")
+
+    print(f"Results saved to {output_path}")
+
+
+def _to_builtin(value: Any) -> Any:
+    # NaN is not valid JSON
+    if isinstance(value, (float, np.floating)):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def print_matrix_summary(rows: List[Dict[str, Any]]):
+    """Print success rate and mean metrics per planner × controller."""
+    print("\n" + "="*70)
+    print("SCENARIO MATRIX SUMMARY")
+    print("="*70)
+    print(f"{'Planner':<12} {'Controller':<24} {'Runs':>5} {'Success':>8} "
+          f"{'Collision':>10} {'Plan(s)':>8} {'Track(m)':>9}")
+
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault((row["planner"], row["controller"]), []).append(row)
+
+    for (planner, controller), group in groups.items():
+        success = np.mean([bool(r.get("success")) for r in group]) * 100
+        collision = np.mean([bool(r.get("collision")) for r in group]) * 100
+        plan_time = np.nanmean([r.get("planning_time", np.nan) for r in group])
+        tracking = np.nanmean([r.get("tracking_error_mean", np.nan) for r in group])
+        print(f"{planner:<12} {controller:<24} {len(group):>5} {success:>7.1f}% "
+              f"{collision:>9.1f}% {plan_time:>8.3f} {tracking:>9.3f}")
+    print("="*70)
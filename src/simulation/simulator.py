@@ -1,12 +1,15 @@
-import pygame
 import numpy as np
-from typing import Optional, Tuple
+import time
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from src.core.vehicle import Vehicle
+from src.core.vehicle import Vehicle, VehicleState
 from src.core.map import (
     Map2D,
     CircleObstacle,
@@ -16,8 +19,17 @@ from src.core.map import (
 from src.planning.base_planner import BasePlanner, Path as PlannedPath
 from src.control.pid_controller import PathFollowingPID, PIDController
 from src.control.pure_pursuit import PurePursuitController, AdaptivePurePursuitController
-from src.simulation.renderer import Renderer
+from src.simulation.recorder import TrajectoryRecorder
 from src.utils.config_loader import ConfigLoader
+from src.utils.profiler import Profiler
+
+
+# Controller class name -> controller.type config value
+CONTROLLER_TYPES = {
+    'PathFollowingPID': 'pid',
+    'PurePursuitController': 'pure_pursuit',
+    'AdaptivePurePursuitController': 'adaptive_pure_pursuit',
+}
 
 
 class SimulationState(Enum):
@@ -30,6 +42,49 @@ class SimulationState(Enum):
     FAILED = "failed"
 
 
+@dataclass
+class SimulationResult:
+    """Structured outcome of a headless run."""
+    success: bool
+    collision: bool
+    state: str
+    steps: int
+    simulation_time: float
+    total_distance: float
+    path_length: float
+    trajectory: np.ndarray  # (T, 2) vehicle positions, one per step
+    stats: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class SimulationSnapshot:
+    """
+    Mutable simulation state at one step (see Simulator.snapshot()).
+
+    The map is not part of the snapshot and the path is shared by
+    reference (paths are never mutated once planned), so taking one is
+    cheap and the snapshot pickles small enough to ship to worker
+    processes.
+    """
+    step: int
+    simulation_time: float
+    state: str
+    vehicle_state: VehicleState
+    last_control: Tuple[float, float]
+    controller_type: str
+    controller_state: Dict[str, Any]
+    path: Optional[PlannedPath]
+    trajectory: List[Tuple[float, float]]
+    total_distance: float
+    last_position: Optional[Tuple[float, float]]
+    collision_detected: bool
+    goal_reached: bool
+    recorder_size: int = 0
+    recorder_events: int = 0
+    rng_state: Optional[tuple] = None
+
+
 class Simulator:
     """
     Main simulation environment.
@@ -42,12 +97,19 @@ class Simulator:
     - Visualization
     """
     
-    def __init__(self, config: Optional[ConfigLoader] = None):
+    def __init__(self, config: Optional[ConfigLoader] = None, headless: bool = False,
+                 map_env: Optional[Map2D] = None,
+                 planner: Optional[BasePlanner] = None):
         """
         Initialize simulator.
         
         Args:
             config: Configuration loader (uses default if None)
+            headless: Never create a Renderer or initialize pygame.
+                Use run_headless() to simulate.
+            map_env: Existing map to share instead of loading one from
+                the config (used by fork())
+            planner: Existing planner built on map_env to share
         """
         self.config = config or ConfigLoader()
         
@@ -59,9 +121,9 @@ class Simulator:
 
         
         # Initialize components
-        self.map_env: Optional[Map2D] = self._load_map()
+        self.map_env: Optional[Map2D] = map_env if map_env is not None else self._load_map()
         self.vehicle: Optional[Vehicle] = self._load_vehicle()
-        self.planner: Optional[BasePlanner] = self._load_planner()
+        self.planner: Optional[BasePlanner] = planner if planner is not None else self._load_planner()
         self.controller = self._load_controller()
         self.path: Optional[PlannedPath] = None
         
@@ -70,14 +132,34 @@ class Simulator:
         self.step = 0
         self.simulation_time = 0.0
         self.dt = self.sim_params.get('dt', 0.1)
+        self.trajectory: List[Tuple[float, float]] = []
+        self.last_control: Tuple[float, float] = (0.0, 0.0)
+        self.recorder: Optional[TrajectoryRecorder] = None
+        self.video_writer = None
         
-        # Renderer
-        self.renderer = Renderer(
-            screen_width=self.sim_params.get('screen_width', 1200),
-            screen_height=self.sim_params.get('screen_height', 800),
-            world_width=self.map_params.get('width', 100),
-            world_height=self.map_params.get('height', 100)
-        )
+        # Background planning (double-buffered: self.path is only replaced
+        # on the main thread once the new path is complete)
+        self.planning_future: Optional[Future] = None
+        self._planning_started = 0.0
+        self.hold_while_planning = self.sim_params.get('hold_while_planning', False)
+        
+        # Per-phase timers (near-zero cost when disabled)
+        self.profiler = Profiler(enabled=self.sim_params.get('profile', False))
+        
+        # Observers are called with the simulator after every step
+        self.observers: List[Callable[['Simulator'], None]] = []
+        
+        # Renderer (optional observer of the simulation)
+        self.headless = headless
+        self.renderer = None
+        self._clock = None
+        self.steps_per_frame = self.sim_params.get('steps_per_frame', 1)
+        self.free_run = self.sim_params.get('free_run', False)
+        self.real_time_factor = 0.0
+        self.frame_budget_usage = 0.0
+        if not headless:
+            self.renderer = self._create_renderer()
+            self.add_observer(self._renderer_observer)
         
         # Stats
         self.collision_detected = False
@@ -85,6 +167,146 @@ class Simulator:
         self.total_distance = 0.0
         self.last_position: Optional[Tuple[float, float]] = None
     
+    def _create_renderer(self, offscreen: bool = False,
+                         size: Optional[Tuple[int, int]] = None):
+        """Create the pygame renderer (imports pygame lazily)."""
+        from src.simulation.renderer import Renderer
+        
+        width, height = size or (self.sim_params.get('screen_width', 1200),
+                                 self.sim_params.get('screen_height', 800))
+        return Renderer(
+            screen_width=width,
+            screen_height=height,
+            world_width=self.map_params.get('width', 100),
+            world_height=self.map_params.get('height', 100),
+            max_trajectory_length=self.sim_params.get('trail_length', 1000),
+            # Off-screen frames are produced faster than real time, so the
+            # wall-clock HUD throttle would freeze the panel in videos
+            hud_refresh_rate=0.0 if offscreen else self.sim_params.get('hud_refresh_rate', 10.0),
+            offscreen=offscreen
+        )
+    
+    def _renderer_observer(self, sim: 'Simulator'):
+        """Feed the renderer's trajectory history."""
+        self.renderer.add_trajectory_point(*sim.vehicle.get_position())
+    
+    def add_observer(self, observer: Callable[['Simulator'], None]):
+        """Register a callback invoked after every simulation step."""
+        self.observers.append(observer)
+    
+    def remove_observer(self, observer: Callable[['Simulator'], None]):
+        """Unregister a step callback."""
+        if observer in self.observers:
+            self.observers.remove(observer)
+    
+    def enable_recording(self, capacity: int = 4096) -> TrajectoryRecorder:
+        """
+        Record every step (state, controls, target point, events).
+        
+        Args:
+            capacity: Initial number of preallocated rows
+            
+        Returns:
+            The recorder; save it with save_recording()
+        """
+        if self.recorder is None:
+            self.recorder = TrajectoryRecorder(capacity=capacity)
+            self.add_observer(self._record_step)
+        return self.recorder
+    
+    def _record_step(self, sim: 'Simulator'):
+        state = self.vehicle.state
+        target = getattr(self.controller, 'target_point', None) or (None, None)
+        self.recorder.record(
+            step=self.step,
+            time=self.simulation_time + self.dt,
+            x=state.x, y=state.y, theta=state.theta,
+            velocity=state.velocity,
+            steering_angle=state.steering_angle,
+            acceleration_cmd=self.last_control[0],
+            steering_cmd=self.last_control[1],
+            target_x=target[0], target_y=target[1]
+        )
+        if self.collision_detected:
+            self.recorder.add_event("collision")
+        elif self.goal_reached:
+            self.recorder.add_event("goal_reached")
+    
+    def enable_video(self, filename: str, every: int = 1,
+                     size: Optional[Tuple[int, int]] = None,
+                     fps: Optional[float] = None):
+        """
+        Stream rendered frames to a video file (.mp4, .avi or .gif).
+        
+        Works in headless mode: an off-screen renderer (dummy SDL driver)
+        is created if there is no window. Frames are encoded as they are
+        produced; call stop_video() to finish the file.
+        
+        Args:
+            filename: Output path
+            every: Render one frame out of every `every` steps
+            size: Frame (width, height); default is the screen size
+            fps: Playback rate (default: real time, 1 / (dt * every))
+        
+        Returns:
+            The VideoWriter
+        """
+        from src.simulation.video import VideoWriter
+        
+        if self.video_writer is not None:
+            self.stop_video()
+        if self.renderer is None:
+            self.renderer = self._create_renderer(offscreen=True, size=size)
+            self.add_observer(self._renderer_observer)
+        
+        self.video_writer = VideoWriter(
+            filename,
+            fps=fps or 1.0 / (self.dt * max(int(every), 1)),
+            every=every,
+            size=size
+        )
+        self.add_observer(self._video_step)
+        return self.video_writer
+    
+    def _video_step(self, sim: 'Simulator'):
+        writer = self.video_writer
+        if writer.wants_frame():
+            self.render()
+            writer.write(self.renderer.get_frame())
+        else:
+            writer.skip()
+    
+    def stop_video(self):
+        """Finish and close the video started with enable_video()."""
+        if self.video_writer is None:
+            return
+        self.remove_observer(self._video_step)
+        self.video_writer.close()
+        self.video_writer = None
+    
+    def save_recording(self, filename: str):
+        """
+        Save the recorded run to .npz together with everything replay
+        needs (map, planned path, vehicle geometry), so the run can be
+        reviewed without replanning or re-simulating.
+        """
+        if self.recorder is None:
+            print("Error: Recording is not enabled!")
+            return
+        
+        vehicle_config = self.vehicle.config if self.vehicle else None
+        metadata = {
+            'source': 'simulator',
+            'dt': self.dt,
+            'map': self.map_env.to_dict() if self.map_env else None,
+            'path': [p.to_tuple() for p in self.path.points] if self.path else [],
+            'planner': self.planner.__class__.__name__ if self.planner else None,
+            'controller': self.controller.__class__.__name__ if self.controller else None,
+            'vehicle': vars(vehicle_config) if vehicle_config else None,
+            'stats': self.get_stats(),
+        }
+        self.recorder.save(filename, metadata)
+    
     def _load_map(self) -> Map2D:
         """Load map environment from config."""
         if self.map_params.get("map_json") != '':
@@ -113,7 +335,12 @@ class Simulator:
     
     def _load_vehicle(self) -> Vehicle:
         """Set vehicle."""
-        vehicle = Vehicle(self.vehicle_params)
+        vehicle = Vehicle(
+            self.vehicle_params,
+            dt=self.sim_params.get('dt', 0.1),
+            integrator=self.sim_params.get('integrator', 'euler'),
+            substeps=self.sim_params.get('substeps', 1)
+        )
         vehicle.reset(self.map_env.start[0], self.map_env.start[1])
         self.last_position = vehicle.get_position()
         print(f"Vehicle set: {vehicle}")
@@ -170,11 +397,18 @@ class Simulator:
         print(f"[Planner] Using {planner_name}: {planner}")
         return planner
     
-    def _load_controller(self):
-        """Set controller (PID / Pure Pursuit / Adaptive Pure Pursuit)."""
+    def _load_controller(self, vehicle: Optional[Vehicle] = None, ctrl_type: Optional[str] = None):
+        """
+        Set controller (PID / Pure Pursuit / Adaptive Pure Pursuit).
+        
+        Args:
+            vehicle: Vehicle to control (default: self.vehicle)
+            ctrl_type: Controller type (default: controller.type from config)
+        """
 
         ctrl_cfg = self.config.get("controller", {})
-        ctrl_type = ctrl_cfg.get("type", "pid").lower()
+        ctrl_type = (ctrl_type or ctrl_cfg.get("type", "pid")).lower()
+        vehicle = vehicle or self.vehicle
 
         controller = None
 
@@ -193,7 +427,7 @@ class Simulator:
             )
 
             controller = PathFollowingPID(
-                vehicle=self.vehicle,
+                vehicle=vehicle,
                 pid_controller=pid,
                 lookahead_distance=pid_cfg.get("lookahead_distance", 5.0),
                 target_speed=pid_cfg.get("target_speed", 5.0),
@@ -205,7 +439,7 @@ class Simulator:
             pp_cfg = ctrl_cfg.get("pure_pursuit", {})
 
             controller = PurePursuitController(
-                vehicle=self.vehicle,
+                vehicle=vehicle,
                 lookahead_distance=pp_cfg.get("lookahead_distance", 5.0),
                 lookahead_gain=pp_cfg.get("lookahead_gain", 0.5),
                 min_lookahead=pp_cfg.get("min_lookahead", 2.0),
@@ -221,7 +455,7 @@ class Simulator:
             app_cfg = ctrl_cfg.get("adaptive_pure_pursuit", {})
 
             controller = AdaptivePurePursuitController(
-                vehicle=self.vehicle,
+                vehicle=vehicle,
                 lookahead_distance=app_cfg.get("lookahead_distance", 5.0),
                 lookahead_gain=app_cfg.get("lookahead_gain", 0.5),
                 min_lookahead=app_cfg.get("min_lookahead", 2.0),
@@ -272,7 +506,9 @@ class Simulator:
         self.state = SimulationState.PLANNING
         
         # Plan
-        self.path = self.planner.plan(start, goal)
+        with self.profiler.phase("planner"):
+            self.path = self.planner.plan(start, goal)
+        self.profiler.count("plans")
         
         if self.path is None:
             print("Planning failed!")
@@ -285,6 +521,104 @@ class Simulator:
         
         return True
     
+    def plan_path_async(self, start: Optional[Tuple[float, float]] = None,
+                        goal: Optional[Tuple[float, float]] = None) -> Optional[Future]:
+        """
+        Plan path on a background thread.
+        
+        The current path (if any) stays installed while planning; the new
+        one replaces it in poll_planning(), which the run loop calls every
+        frame.
+        
+        Args:
+            start: Start position (uses map start if None)
+            goal: Goal position (uses map goal if None)
+            
+        Returns:
+            Future resolving to the new Path (or None if planning failed)
+        """
+        if self.planner is None:
+            print("Error: No planner set!")
+            return None
+        
+        if self.map_env is None:
+            print("Error: No map loaded!")
+            return None
+        
+        if self.is_planning:
+            print("Planning already in progress")
+            return self.planning_future
+        
+        start = start or self.map_env.start
+        goal = goal or self.map_env.goal
+        
+        if start is None or goal is None:
+            print("Error: Start or goal not specified!")
+            return None
+        
+        print(f"\nPlanning path from {start} to {goal} (background)...")
+        future = Future()
+        future.set_running_or_notify_cancel()
+        
+        def worker():
+            try:
+                with self.profiler.phase("planner"):
+                    future.set_result(self.planner.plan(start, goal))
+            except BaseException as e:
+                future.set_exception(e)
+        
+        self.planning_future = future
+        self._planning_started = time.perf_counter()
+        # Daemon thread: closing the window never waits for a long plan
+        threading.Thread(target=worker, name="planner", daemon=True).start()
+        return future
+    
+    @property
+    def is_planning(self) -> bool:
+        """True while a background plan is running."""
+        return self.planning_future is not None and not self.planning_future.done()
+    
+    def get_planning_progress(self) -> Tuple[float, float]:
+        """Progress (0..1 of the iteration budget) and elapsed seconds of the background plan."""
+        if self.planning_future is None:
+            return 0.0, 0.0
+        return self.planner.get_progress(), time.perf_counter() - self._planning_started
+    
+    def poll_planning(self) -> bool:
+        """
+        Install the result of a finished background plan.
+        
+        Returns:
+            True if a new path replaced the current one
+        """
+        future = self.planning_future
+        if future is None or not future.done():
+            return False
+        
+        self.planning_future = None
+        try:
+            path = future.result()
+        except Exception as e:
+            # Treated like a failed plan; keep the session alive
+            print(f"Planning error: {e}")
+            path = None
+
+        if path is None:
+            print("Planning failed!")
+            if self.path is None:
+                self.state = SimulationState.FAILED
+            elif self.state == SimulationState.PLANNING:
+                self.state = SimulationState.RUNNING
+            return False
+        
+        self.profiler.count("plans")
+        self.path = path
+        if self.controller is not None:
+            self.controller.set_path(path)
+        if self.state == SimulationState.PLANNING:
+            self.state = SimulationState.RUNNING
+        return True
+    
     def reset(self):
         """Reset simulation to initial state."""
         if self.map_env and self.map_env.start:
@@ -297,7 +631,11 @@ class Simulator:
         self.collision_detected = False
         self.goal_reached = False
         self.total_distance = 0.0
-        self.renderer.trajectory.clear()
+        self.trajectory.clear()
+        if self.recorder is not None:
+            self.recorder.clear()
+        if self.renderer is not None:
+            self.renderer.clear_trajectory()
         
         if self.controller:
             if hasattr(self.controller, 'reset'):
@@ -308,6 +646,107 @@ class Simulator:
         self.state = SimulationState.IDLE
         print("Simulation reset")
     
+    def snapshot(self, include_rng: bool = True) -> SimulationSnapshot:
+        """
+        Capture the current simulation state.
+        
+        Covers the vehicle, the controller's internal state (PID
+        integrators, target index, ...), the path and the stats. The map,
+        planner and renderer are not copied.
+        
+        Args:
+            include_rng: Also capture the global NumPy random state, so
+                stochastic branches (RRT replans, noise) are reproducible
+        
+        Returns:
+            SimulationSnapshot that can be passed to restore()
+        """
+        controller = self.controller
+        return SimulationSnapshot(
+            step=self.step,
+            simulation_time=self.simulation_time,
+            state=self.state.value,
+            vehicle_state=replace(self.vehicle.state),
+            last_control=self.last_control,
+            controller_type=type(controller).__name__,
+            controller_state=controller.get_state() if controller is not None else {},
+            path=self.path,
+            trajectory=list(self.trajectory),
+            total_distance=self.total_distance,
+            last_position=self.last_position,
+            collision_detected=self.collision_detected,
+            goal_reached=self.goal_reached,
+            recorder_size=len(self.recorder) if self.recorder is not None else 0,
+            recorder_events=len(self.recorder.events) if self.recorder is not None else 0,
+            rng_state=np.random.get_state() if include_rng else None
+        )
+    
+    def restore(self, snapshot: SimulationSnapshot):
+        """
+        Return to a state captured by snapshot().
+        
+        The snapshot may come from another simulator on the same map (e.g.
+        in a worker process). If the controller type differs, the path is
+        installed but the controller starts from a fresh internal state.
+        A recording is truncated back to the snapshot step.
+        
+        Args:
+            snapshot: State to restore
+        """
+        self.step = snapshot.step
+        self.simulation_time = snapshot.simulation_time
+        self.state = SimulationState(snapshot.state)
+        self.vehicle.state = replace(snapshot.vehicle_state)
+        self.last_control = snapshot.last_control
+        self.total_distance = snapshot.total_distance
+        self.last_position = snapshot.last_position
+        self.collision_detected = snapshot.collision_detected
+        self.goal_reached = snapshot.goal_reached
+        self.trajectory = list(snapshot.trajectory)
+        
+        self.path = snapshot.path
+        if self.controller is not None:
+            if snapshot.path is not None:
+                self.controller.set_path(snapshot.path)
+            if type(self.controller).__name__ == snapshot.controller_type:
+                self.controller.set_state(snapshot.controller_state)
+        
+        if self.recorder is not None:
+            self.recorder.size = min(self.recorder.size, snapshot.recorder_size)
+            del self.recorder.events[snapshot.recorder_events:]
+        if self.renderer is not None:
+            self.renderer.trajectory = self.trajectory
+        if snapshot.rng_state is not None:
+            np.random.set_state(snapshot.rng_state)
+    
+    def fork(self, controller_type: Optional[str] = None, headless: bool = True) -> 'Simulator':
+        """
+        Create an independent simulator starting from the current state.
+        
+        The map and planner are shared (never copied or rebuilt); vehicle,
+        controller and stats are fresh objects, so the branch can be
+        stepped without affecting this simulator. Replanning in a branch
+        reuses the shared planner, so do not plan in several branches
+        concurrently.
+        
+        Args:
+            controller_type: Run the branch with another controller
+                ('pid', 'pure_pursuit', 'adaptive_pure_pursuit');
+                default is the same type as this simulator
+            headless: Create the branch without a renderer
+        
+        Returns:
+            New Simulator restored to this simulator's snapshot
+        """
+        snapshot = self.snapshot(include_rng=False)
+        branch = Simulator(self.config, headless=headless,
+                           map_env=self.map_env, planner=self.planner)
+        controller_type = controller_type or CONTROLLER_TYPES.get(snapshot.controller_type)
+        if controller_type is not None:
+            branch.controller = branch._load_controller(branch.vehicle, controller_type)
+        branch.restore(snapshot)
+        return branch
+    
     def step_simulation(self) -> bool:
         """
         Execute one simulation step.
@@ -321,32 +760,40 @@ class Simulator:
         if self.state != SimulationState.RUNNING:
             return False
         
+        profiler = self.profiler
+        
         # Get control commands
-        acceleration, steering = self.controller.control()
+        with profiler.phase("control"):
+            acceleration, steering = self.controller.control()
         
-        # Update vehicle
-        self.vehicle.update(acceleration, steering)
+        self.last_control = (acceleration, steering)
         
-        # Update stats
-        current_pos = self.vehicle.get_position()
-        if self.last_position:
-            dx = current_pos[0] - self.last_position[0]
-            dy = current_pos[1] - self.last_position[1]
-            self.total_distance += (dx**2 + dy**2)**0.5
-        self.last_position = current_pos
+        # Update vehicle
+        with profiler.phase("vehicle.update"):
+            self.vehicle.update(acceleration, steering)
         
-        # Add to trajectory
-        self.renderer.add_trajectory_point(*current_pos)
+        with profiler.phase("bookkeeping"):
+            # Update stats
+            current_pos = self.vehicle.get_position()
+            if self.last_position:
+                dx = current_pos[0] - self.last_position[0]
+                dy = current_pos[1] - self.last_position[1]
+                self.total_distance += (dx**2 + dy**2)**0.5
+            self.last_position = current_pos
+            
+            # Add to trajectory
+            self.trajectory.append(current_pos)
         
         # Check collision
-        if self.map_env.is_collision(current_pos[0], current_pos[1], 0):
+        with profiler.phase("is_collision"):
+            collision = self.map_env.is_collision(current_pos[0], current_pos[1], 0)
+        if collision:
             self.collision_detected = True
             self.state = SimulationState.FAILED
             print(f"\nCollision detected at step {self.step}!")
-            return False
         
         # Check goal
-        if self.map_env.goal:
+        elif self.map_env.goal:
             dist_to_goal = self.vehicle.distance_to(
                 self.map_env.goal[0], self.map_env.goal[1]
             )
@@ -356,21 +803,70 @@ class Simulator:
                 self.state = SimulationState.COMPLETED
                 print(f"\nGoal reached at step {self.step}!")
                 print(f"Total distance traveled: {self.total_distance:.2f}m")
-                return False
+        
+        # Observers see the final state of the step
+        with profiler.phase("observers"):
+            for observer in self.observers:
+                observer(self)
+        profiler.count("steps")
+        
+        if self.state != SimulationState.RUNNING:
+            return False
         
         self.step += 1
         self.simulation_time += self.dt
         
         return True
     
-    def run(self, max_steps: int = 10000, target_fps: int = 60):
+    def _apply_command(self, command: str):
+        """Apply a run-time command from the keyboard (pause, reset, faster, slower, free_run)."""
+        if command == 'pause':
+            if self.state == SimulationState.RUNNING:
+                self.state = SimulationState.PAUSED
+                print("Paused")
+            elif self.state == SimulationState.PAUSED:
+                self.state = SimulationState.RUNNING
+                print("Resumed")
+        elif command == 'reset':
+            self.reset()
+            self.plan_path_async()
+            # Keep tracking the old path until the new one is
+            # swapped in, or hold the vehicle
+            if self.path is None or self.hold_while_planning:
+                self.state = SimulationState.PLANNING
+            else:
+                self.state = SimulationState.RUNNING
+        elif command == 'faster':
+            self.steps_per_frame *= 2
+        elif command == 'slower':
+            self.steps_per_frame = max(1, self.steps_per_frame // 2)
+        elif command == 'free_run':
+            self.free_run = not self.free_run
+        else:
+            raise ValueError(f"Unknown command: {command}")
+    
+    def run(self, max_steps: int = 10000, target_fps: int = 60,
+            steps_per_frame: Optional[int] = None, free_run: Optional[bool] = None):
         """
         Run simulation with visualization.
         
+        Rendering is decoupled from physics: either a fixed number of
+        physics steps is taken per rendered frame, or (free_run) physics
+        runs as many steps as fit in the frame budget while the display
+        refreshes at target_fps. +/- and F change the mode at runtime.
+        
         Args:
             max_steps: Maximum simulation steps
             target_fps: Target frame rate
+            steps_per_frame: Physics steps per rendered frame
+                (default: simulation.steps_per_frame, 1 = real time at dt * fps)
+            free_run: Run physics as fast as the frame budget allows
+                (default: simulation.free_run)
         """
+        if self.renderer is None:
+            print("Error: Simulator is headless, use run_headless()")
+            return
+        
         if self.vehicle is None:
             print("Error: No vehicle set!")
             return
@@ -384,29 +880,51 @@ class Simulator:
         print("STARTING SIMULATION")
         print("="*70 + "\n")
         
+        if steps_per_frame is None:
+            steps_per_frame = self.sim_params.get('steps_per_frame', 1)
+        if free_run is None:
+            free_run = self.sim_params.get('free_run', False)
+        self.steps_per_frame = max(1, int(steps_per_frame))
+        self.free_run = bool(free_run)
+        frame_budget = 1.0 / target_fps
+        
+        import pygame
         clock = pygame.time.Clock()
+        self._clock = clock
+        key_commands = {
+            pygame.K_SPACE: 'pause',
+            pygame.K_r: 'reset',
+            pygame.K_EQUALS: 'faster',
+            pygame.K_PLUS: 'faster',
+            pygame.K_KP_PLUS: 'faster',
+            pygame.K_MINUS: 'slower',
+            pygame.K_KP_MINUS: 'slower',
+            pygame.K_f: 'free_run',
+        }
         self.state = SimulationState.RUNNING
         running = True
         
+        # Real-time factor / frame budget, refreshed twice per second
+        self.real_time_factor = 0.0
+        self.frame_budget_usage = 0.0
+        window_start = time.perf_counter()
+        window_sim_time = self.simulation_time
+        window_work_time = 0.0
+        window_frames = 0
+        render_time = 0.0
+        
         while running and self.step < max_steps:
             # Handle events
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif self.renderer.handle_camera_event(event):
+                    continue
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         running = False
-                    elif event.key == pygame.K_SPACE:
-                        if self.state == SimulationState.RUNNING:
-                            self.state = SimulationState.PAUSED
-                            print("Paused")
-                        elif self.state == SimulationState.PAUSED:
-                            self.state = SimulationState.RUNNING
-                            print("Resumed")
-                    elif event.key == pygame.K_r:
-                        self.reset()
-                        if self.plan_path():
-                            self.state = SimulationState.RUNNING
+                    elif event.key in key_commands:
+                        self._apply_command(key_commands[event.key])
                     elif event.key == pygame.K_g:
                         self.renderer.show_grid = not self.renderer.show_grid
                     elif event.key == pygame.K_p:
@@ -416,14 +934,40 @@ class Simulator:
                     elif event.key == pygame.K_i:
                         self.renderer.show_info = not self.renderer.show_info
             
+            # Swap in a finished background plan
+            self.poll_planning()
+            
+            frame_start = time.perf_counter()
+            
             # Update simulation
             if self.state == SimulationState.RUNNING:
-                if not self.step_simulation():
-                    # Simulation ended (goal reached or collision)
-                    pass
+                if self.free_run:
+                    # Leave room for the last frame's render time
+                    deadline = frame_start + frame_budget - render_time
+                    while self.step < max_steps and self.step_simulation():
+                        if time.perf_counter() >= deadline:
+                            break
+                else:
+                    for _ in range(self.steps_per_frame):
+                        if self.step >= max_steps or not self.step_simulation():
+                            # Simulation ended (goal reached or collision)
+                            break
             
             # Render
+            render_start = time.perf_counter()
             self.render()
+            render_time = time.perf_counter() - render_start
+            
+            window_work_time += time.perf_counter() - frame_start
+            window_frames += 1
+            elapsed = time.perf_counter() - window_start
+            if elapsed >= 0.5:
+                self.real_time_factor = (self.simulation_time - window_sim_time) / elapsed
+                self.frame_budget_usage = window_work_time / (window_frames * frame_budget) * 100
+                window_start = time.perf_counter()
+                window_sim_time = self.simulation_time
+                window_work_time = 0.0
+                window_frames = 0
             
             # Control frame rate
             clock.tick(target_fps)
@@ -443,49 +987,278 @@ class Simulator:
         
         self.renderer.close()
     
-    def render(self):
-        """Render current simulation state."""
-        self.renderer.clear()
-        self.renderer.draw_grid()
+    def run_render_process(self, max_steps: int = 10000, target_fps: int = 60,
+                           steps_per_frame: Optional[int] = None,
+                           free_run: Optional[bool] = None):
+        """
+        Run simulation with the window drawn by a separate process.
+        
+        Every step is published into a shared-memory ring buffer (see
+        RenderProcess); the render process draws the newest state at
+        target_fps and drops the rest, so slow frames never delay physics.
+        Physics is paced on its own clock: steps_per_frame steps every
+        1/target_fps seconds, or back to back with free_run. Use with a
+        headless simulator (this process never imports pygame).
+        
+        Args:
+            max_steps: Maximum simulation steps
+            target_fps: Render frame rate and physics tick rate
+            steps_per_frame: Physics steps per tick
+                (default: simulation.steps_per_frame)
+            free_run: Step physics as fast as possible
+                (default: simulation.free_run)
+        """
+        from src.simulation.render_process import RenderProcess
+        
+        if self.vehicle is None:
+            print("Error: No vehicle set!")
+            return
+        
+        if self.path is None:
+            print("Warning: No path planned. Planning now...")
+            if not self.plan_path():
+                return
         
-        if self.map_env:
-            self.renderer.draw_map(self.map_env)
-            if self.map_env.start and self.map_env.goal:
-                self.renderer.draw_start_goal(self.map_env.start, self.map_env.goal)
+        if steps_per_frame is None:
+            steps_per_frame = self.sim_params.get('steps_per_frame', 1)
+        if free_run is None:
+            free_run = self.sim_params.get('free_run', False)
+        self.steps_per_frame = max(1, int(steps_per_frame))
+        self.free_run = bool(free_run)
+        tick = 1.0 / target_fps
         
-        if self.path:
-            self.renderer.draw_path(self.path)
+        states = list(SimulationState)
+        view = RenderProcess(
+            self.map_env,
+            self.vehicle.config,
+            screen_width=self.sim_params.get('screen_width', 1200),
+            screen_height=self.sim_params.get('screen_height', 800),
+            target_fps=target_fps,
+            trail_length=self.sim_params.get('trail_length', 1000),
+            hud_refresh_rate=self.sim_params.get('hud_refresh_rate', 10),
+            info_fields=('Distance', 'RTF'),
+            status_labels=[s.value for s in states]
+        )
+        
+        def publish(sim: 'Simulator'):
+            target = None
+            if isinstance(sim.controller, PurePursuitController):
+                target = sim.controller.get_lookahead_point()
+            view.publish(sim.step, sim.simulation_time, sim.vehicle.state,
+                         status=states.index(sim.state), target=target,
+                         info=(sim.total_distance, sim.real_time_factor))
+        
+        print("\n" + "="*70)
+        print("STARTING SIMULATION (render process)")
+        print("="*70 + "\n")
         
-        self.renderer.draw_trajectory()
+        view.start()
+        self.add_observer(publish)
+        self.state = SimulationState.RUNNING
+        running = True
+        shown_path = None
         
-        if self.vehicle:
-            self.renderer.draw_vehicle(self.vehicle)
+        self.real_time_factor = 0.0
+        window_start = time.perf_counter()
+        window_sim_time = self.simulation_time
+        next_tick = time.perf_counter()
+        
+        try:
+            while running and self.step < max_steps:
+                for command in view.poll_commands():
+                    if command == 'quit':
+                        running = False
+                    else:
+                        self._apply_command(command)
+                        if command == 'reset':
+                            view.clear_trajectory()
+                
+                # Swap in a finished background plan
+                self.poll_planning()
+                if self.path is not shown_path:
+                    shown_path = self.path
+                    view.set_path(None if shown_path is None else
+                                  [(p.x, p.y) for p in shown_path.points])
+                
+                tick_start = time.perf_counter()
+                stepped = False
+                if self.state == SimulationState.RUNNING:
+                    if self.free_run:
+                        while self.step < max_steps and self.step_simulation():
+                            stepped = True
+                            if time.perf_counter() >= tick_start + tick:
+                                break
+                    else:
+                        for _ in range(self.steps_per_frame):
+                            stepped = True
+                            if self.step >= max_steps or not self.step_simulation():
+                                break
+                if not stepped:
+                    publish(self)  # paused / planning: still show the state
+                
+                elapsed = time.perf_counter() - window_start
+                if elapsed >= 0.5:
+                    self.real_time_factor = (self.simulation_time - window_sim_time) / elapsed
+                    window_start = time.perf_counter()
+                    window_sim_time = self.simulation_time
+                
+                if not view.is_open:
+                    running = False
+                
+                # Pace physics (a free run only stops to poll commands)
+                next_tick += tick
+                delay = next_tick - time.perf_counter()
+                if (self.free_run and stepped) or delay < -tick:
+                    next_tick = time.perf_counter()
+                elif delay > 0:
+                    time.sleep(delay)
+        finally:
+            self.remove_observer(publish)
+        
+        self.print_stats()
+        
+        if running and view.is_open:
+            print("\nSimulation ended. Close window or press ESC to quit.")
+            view.wait()
+        else:
+            view.close()
+    
+    def run_headless(self, max_steps: int = 10000) -> SimulationResult:
+        """
+        Run simulation without any display, as fast as possible.
+        
+        Plans a path first if none is set. Observers registered with
+        add_observer() are still called after every step.
+        
+        Args:
+            max_steps: Maximum simulation steps
             
-            # Draw lookahead point if using Pure Pursuit
-            if isinstance(self.controller, PurePursuitController):
-                lookahead = self.controller.get_lookahead_point()
-                if lookahead:
-                    self.renderer.draw_point(
-                        lookahead[0], lookahead[1],
-                        color=(255, 165, 0), radius=6
-                    )
-        
-        # Additional info
-        additional_info = {
-            'State': self.state.value,
-            'Distance': f'{self.total_distance:.1f}m'
+        Returns:
+            SimulationResult with trajectory, stats and timings
+        """
+        wall_start = time.perf_counter()
+        
+        planned = self.path is not None
+        if not planned:
+            planned = self.plan_path()
+        planning_wall_time = time.perf_counter() - wall_start
+        
+        step_start = time.perf_counter()
+        if planned and self.vehicle is not None:
+            self.state = SimulationState.RUNNING
+            while self.step < max_steps and self.step_simulation():
+                pass
+        step_wall_time = time.perf_counter() - step_start
+        
+        steps_done = len(self.trajectory)
+        timings = {
+            'planning_time': getattr(self.planner, 'planning_time', 0.0),
+            'planning_wall_time': planning_wall_time,
+            'simulation_wall_time': step_wall_time,
+            'wall_time': time.perf_counter() - wall_start,
+            'step_time_mean': step_wall_time / steps_done if steps_done else 0.0,
+            'steps_per_second': steps_done / step_wall_time if step_wall_time > 0 else 0.0,
         }
         
-        if self.vehicle:
-            self.renderer.draw_info_panel(
-                self.vehicle, self.step,
-                pygame.time.Clock().get_fps(),
-                additional_info
+        return SimulationResult(
+            success=self.goal_reached,
+            collision=self.collision_detected,
+            state=self.state.value,
+            steps=self.step,
+            simulation_time=self.simulation_time,
+            total_distance=self.total_distance,
+            path_length=self.path.length if self.path else 0.0,
+            trajectory=np.array(self.trajectory, dtype=float).reshape(-1, 2),
+            stats=self.get_stats(),
+            timings=timings
+        )
+    
+    def render(self):
+        """Render current simulation state."""
+        if self.renderer is None:
+            return
+        
+        profiler = self.profiler
+        profiler.count("frames")
+        
+        with profiler.phase("render.background"):
+            if self.vehicle:
+                self.renderer.follow_target(*self.vehicle.get_position())
+            map_env = self.map_env
+            self.renderer.draw_background(
+                map_env,
+                map_env.start if map_env else None,
+                map_env.goal if map_env else None
             )
         
-        self.renderer.draw_legend()
-        self.renderer.draw_controls_help()
-        self.renderer.update()
+        with profiler.phase("render.path"):
+            if self.path:
+                self.renderer.draw_path(self.path)
+        
+        with profiler.phase("render.trajectory"):
+            self.renderer.draw_trajectory()
+        
+        with profiler.phase("render.vehicle"):
+            if self.vehicle:
+                self.renderer.draw_vehicle(self.vehicle)
+                
+                # Draw lookahead point if using Pure Pursuit
+                if isinstance(self.controller, PurePursuitController):
+                    lookahead = self.controller.get_lookahead_point()
+                    if lookahead:
+                        self.renderer.draw_point(
+                            lookahead[0], lookahead[1],
+                            color=(255, 165, 0), radius=6
+                        )
+        
+        with profiler.phase("render.hud"):
+            # Additional info
+            additional_info = {
+                'State': self.state.value,
+                'Distance': f'{self.total_distance:.1f}m',
+                'Steps/frame': 'free' if self.free_run else self.steps_per_frame,
+                'RTF': f'{self.real_time_factor:.1f}x',
+                'Frame budget': f'{self.frame_budget_usage:.0f}%'
+            }
+            if self.is_planning:
+                progress, elapsed = self.get_planning_progress()
+                additional_info['Planning'] = f'{progress * 100:.0f}% ({elapsed:.1f}s)'
+        
+            if self.vehicle:
+                self.renderer.draw_info_panel(
+                    self.vehicle, self.step,
+                    self._clock.get_fps() if self._clock else 0.0,
+                    additional_info
+                )
+        
+            self.renderer.draw_legend()
+            if not self.renderer.offscreen:
+                self.renderer.draw_controls_help()
+        
+        with profiler.phase("render.flip"):
+            self.renderer.update()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get simulation statistics."""
+        efficiency = 0.0
+        if self.path and self.goal_reached and self.total_distance > 0:
+            efficiency = self.path.length / self.total_distance * 100
+        
+        return {
+            'state': self.state.value,
+            'steps': self.step,
+            'simulation_time': self.simulation_time,
+            'total_distance': self.total_distance,
+            'path_length': self.path.length if self.path else 0.0,
+            'path_efficiency': efficiency,
+            'goal_reached': self.goal_reached,
+            'collision': self.collision_detected,
+            'planner': self.planner.__class__.__name__ if self.planner else None,
+            'planning_time': getattr(self.planner, 'planning_time', 0.0),
+            'controller': self.controller.__class__.__name__ if self.controller else None,
+            'phases': self.profiler.stats(),
+            'counters': dict(self.profiler.counters),
+        }
     
     def print_stats(self):
         """Print simulation statistics."""
@@ -514,4 +1287,7 @@ class Simulator:
         if self.controller:
             print(f"Controller: {self.controller.__class__.__name__}")
         
-        print("="*70)
\ No newline at end of file
+        print("="*70)
+        
+        if self.profiler.enabled:
+            self.profiler.print_report()
\ No newline at end of file
@@ -0,0 +1,151 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+
+VIDEO_FORMATS = (".mp4", ".avi", ".gif")
+
+
+@dataclass
+class VideoSettings:
+    """Per-run video export options (picklable, shared by scenario workers)."""
+    directory: str
+    format: str = "mp4"
+    every: int = 2
+    size: Optional[Tuple[int, int]] = None
+
+    def path_for(self, name: str) -> str:
+        """Output file for the run called `name`."""
+        return str(Path(self.directory) / f"{name}.{self.format.lstrip('.')}")
+
+
+class VideoWriter:
+    """
+    Streaming frame encoder (mp4/avi through OpenCV, GIF through Pillow).
+
+    Frames are encoded as they arrive, so memory does not grow with the
+    length of the run. GIF frames are quantized to one palette built from
+    the first frame (the scene only has a handful of colors).
+
+    Usage:
+        writer = VideoWriter("run.mp4", fps=20, every=2)
+        for ...:
+            if writer.wants_frame():
+                writer.write(frame)  # (H, W, 3) uint8 RGB
+            else:
+                writer.skip()
+        writer.close()
+    """
+
+    def __init__(self, filename: str, fps: float = 20.0, every: int = 1,
+                 size: Optional[Tuple[int, int]] = None, colors: int = 64):
+        """
+        Initialize writer.
+
+        Args:
+            filename: Output path; format is chosen from the extension
+            fps: Playback frame rate
+            every: Keep one frame out of every `every` (decimation)
+            size: Output (width, height); frames are resized if they differ
+            colors: GIF palette size
+        """
+        self.filename = str(filename)
+        self.suffix = Path(filename).suffix.lower()
+        if self.suffix not in VIDEO_FORMATS:
+            raise ValueError(f"Unknown video format: {self.suffix}")
+
+        self.fps = fps
+        self.every = max(int(every), 1)
+        self.size = tuple(size) if size else None
+        self.colors = colors
+
+        self.frames_seen = 0
+        self.frames_written = 0
+        self._writer = None
+        self._file = None
+        self._palette = None
+
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+
+    def wants_frame(self) -> bool:
+        """True if the next write() will be encoded (lets callers skip rendering)."""
+        return self.frames_seen % self.every == 0
+
+    def skip(self):
+        """Count a frame that was not rendered because wants_frame() was False."""
+        self.frames_seen += 1
+
+    def write(self, frame: np.ndarray):
+        """
+        Add one frame.
+
+        Args:
+            frame: (H, W, 3) uint8 RGB image
+        """
+        keep = self.wants_frame()
+        self.frames_seen += 1
+        if not keep:
+            return
+
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if self.size is not None and (frame.shape[1], frame.shape[0]) != self.size:
+            import cv2
+            frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+
+        if self.suffix == ".gif":
+            self._write_gif(frame)
+        else:
+            self._write_cv2(frame)
+        self.frames_written += 1
+
+    def _write_cv2(self, frame: np.ndarray):
+        import cv2
+
+        if self._writer is None:
+            fourcc = cv2.VideoWriter_fourcc(*("mp4v" if self.suffix == ".mp4" else "MJPG"))
+            height, width = frame.shape[:2]
+            self._writer = cv2.VideoWriter(self.filename, fourcc, self.fps, (width, height))
+            if not self._writer.isOpened():
+                raise RuntimeError(f"Could not open video writer for {self.filename}")
+        self._writer.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+
+    def _write_gif(self, frame: np.ndarray):
+        from PIL import Image, GifImagePlugin
+
+        image = Image.fromarray(frame)
+        if self._palette is None:
+            self._palette = image.quantize(colors=self.colors)
+            self._file = open(self.filename, "wb")
+            header, _ = GifImagePlugin.getheader(
+                self._palette.copy(), info={"loop": 0, "optimize": False}
+            )
+            for chunk in header:
+                self._file.write(chunk)
+
+        image = image.quantize(palette=self._palette, dither=Image.Dither.NONE)
+        for chunk in GifImagePlugin.getdata(image, duration=int(1000 / self.fps), optimize=False):
+            self._file.write(chunk)
+
+    def close(self):
+        """Finish the file."""
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+        if self._file is not None:
+            self._file.write(b";")  # GIF trailer
+            self._file.close()
+            self._file = None
+        if self.frames_written:
+            print(f"Video saved to {self.filename} ({self.frames_written} frames)")
+        else:
+            print(f"Warning: No frames written to {self.filename}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -45,7 +45,15 @@ class ConfigLoader:
                 "fps": 60,
                 "screen_width": 800,
                 "screen_height": 600,
-                "dt": 0.1
+                "dt": 0.1,
+                "integrator": "euler",
+                "substeps": 1,
+                "steps_per_frame": 1,
+                "free_run": False,
+                "hold_while_planning": False,
+                "profile": False,
+                "trail_length": 1000,
+                "hud_refresh_rate": 10
             },
             "vehicle": {
                 "length": 4.0,
@@ -0,0 +1,178 @@
+import numpy as np
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+
+class _PhaseStats:
+    """
+    Running statistics of one phase.
+
+    count, total and max are exact over every sample; percentiles come
+    from a window of the most recent samples, so memory stays bounded
+    however long the run is.
+    """
+    __slots__ = ("count", "total", "max", "recent", "_lock")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+            self.recent.append(seconds)
+
+
+class _PhaseTimer:
+    """
+    Context manager adding its elapsed time to a phase's statistics.
+
+    One instance per phase() call, so the start time is never shared
+    between nested or concurrent (other thread) uses of the same phase.
+    """
+    __slots__ = ("samples", "_start")
+
+    def __init__(self, samples: _PhaseStats):
+        self.samples = samples
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.samples.add(time.perf_counter() - self._start)
+        return False
+
+
+class _NullTimer:
+    """Shared no-op context manager used while profiling is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Profiler:
+    """
+    Named phase timers and counters.
+
+    Usage:
+        with profiler.phase("control"):
+            controller.control()
+        profiler.count("replans")
+
+    When disabled, phase() returns a shared no-op context manager and
+    count() returns immediately, so instrumented code costs about one
+    method call per phase.
+
+    phase() and add_sample() may be used from worker threads (e.g. the
+    background planner) while the main loop times its own phases; count()
+    is not atomic and is meant for the main thread.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 10000):
+        """
+        Initialize profiler.
+
+        Args:
+            enabled: Start collecting immediately
+            window: Recent samples kept per phase for the percentiles
+        """
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.enabled = enabled
+        self.window = int(window)
+        self._samples: Dict[str, _PhaseStats] = {}
+        self.counters: Dict[str, int] = {}
+
+    def phase(self, name: str):
+        """Context manager timing one occurrence of phase `name`."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _PhaseTimer(self._sample_list(name))
+
+    def _sample_list(self, name: str) -> _PhaseStats:
+        samples = self._samples.get(name)
+        if samples is None:
+            # setdefault is atomic, so racing threads end up with the same stats
+            samples = self._samples.setdefault(name, _PhaseStats(self.window))
+        return samples
+
+    def add_sample(self, name: str, seconds: float):
+        """Record an externally measured duration for phase `name`."""
+        if self.enabled:
+            self._sample_list(name).add(seconds)
+
+    def count(self, name: str, n: int = 1):
+        """Increment counter `name`."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        """Drop all samples and counters."""
+        self._samples.clear()
+        self.counters.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-phase statistics.
+
+        Returns:
+            Dictionary phase -> {count, total, mean, p50, p95, max}
+            (times in seconds; p50/p95 over the last `window` samples)
+        """
+        result = {}
+        for name, samples in list(self._samples.items()):
+            with samples._lock:
+                count, total, max_time = samples.count, samples.total, samples.max
+                recent = np.array(samples.recent)
+            if count == 0:
+                continue
+            p50, p95 = np.percentile(recent, [50, 95])
+            result[name] = {
+                'count': count,
+                'total': total,
+                'mean': total / count,
+                'p50': float(p50),
+                'p95': float(p95),
+                'max': max_time,
+            }
+        return result
+
+    def print_report(self):
+        """Print per-phase timings (ms) and counters."""
+        stats = self.stats()
+        if not stats and not self.counters:
+            return
+
+        grand_total = sum(s['total'] for s in stats.values()) or 1.0
+        print("\n" + "="*70)
+        print("PHASE TIMINGS (ms)")
+        print("="*70)
+        print(f"{'Phase':<20} {'Count':>7} {'Total':>9} {'Share':>6} "
+              f"{'p50':>8} {'p95':>8} {'Max':>8}")
+        for name, s in sorted(stats.items(), key=lambda item: -item[1]['total']):
+            print(f"{name:<20} {s['count']:>7} {s['total'] * 1e3:>9.1f} "
+                  f"{s['total'] / grand_total * 100:>5.1f}% "
+                  f"{s['p50'] * 1e3:>8.3f} {s['p95'] * 1e3:>8.3f} {s['max'] * 1e3:>8.3f}")
+
+        if self.counters:
+            print("-"*70)
+            for name, value in self.counters.items():
+                print(f"{name:<20} {value:>7}")
+        print("="*70)
@@ -0,0 +1,143 @@
+import numpy as np
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Sequence
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.utils.stats import beta_interval, mean_interval, wilson_interval
+
+
+STOPPING_METRICS = ("wilson", "bayes", "mean")
+
+
+@dataclass
+class StoppingRule:
+    """
+    When a cell of an evaluation campaign has enough trials.
+
+    A cell stops as soon as its interval is at most `width` wide (after
+    at least min_trials), or after max_trials.
+
+    Metrics:
+        wilson: Wilson score interval on the success rate of `field`
+        bayes: Beta(1, 1)-posterior credible interval on the same rate
+        mean: Student-t interval on the mean of `field` (rows where it is
+            NaN, e.g. errors, are ignored; at least 2 valid values are
+            needed to stop before max_trials)
+
+    A success-rate interval cannot get narrower than about
+    z^2 / (n + z^2) (3.84 / (n + 3.84) at 95%), so max_trials must be
+    large enough for the target width: at least ~16 trials for 0.2.
+    """
+    metric: str = "wilson"
+    width: float = 0.2
+    field: str = "success"
+    min_trials: int = 5
+    max_trials: int = 100
+    confidence: float = 0.95
+
+    def __post_init__(self):
+        if self.metric not in STOPPING_METRICS:
+            raise ValueError(f"Unknown stopping metric: {self.metric}")
+        if self.min_trials > self.max_trials:
+            raise ValueError(f"min_trials ({self.min_trials}) > max_trials ({self.max_trials})")
+
+    def _values(self, rows: Sequence[Dict[str, Any]]) -> np.ndarray:
+        values = np.asarray([row.get(self.field, np.nan) for row in rows], dtype=float)
+        return values[~np.isnan(values)]
+
+    def interval(self, rows: Sequence[Dict[str, Any]]) -> tuple:
+        """(low, high) interval of the rows' metric."""
+        if self.metric == "mean":
+            _, low, high = mean_interval(self._values(rows), self.confidence)
+            return low, high
+        successes = sum(bool(row.get(self.field)) for row in rows)
+        if self.metric == "wilson":
+            return wilson_interval(successes, len(rows), self.confidence)
+        return beta_interval(successes, len(rows), self.confidence)
+
+    def is_done(self, rows: Sequence[Dict[str, Any]]) -> bool:
+        if len(rows) >= self.max_trials:
+            return True
+        if len(rows) < self.min_trials:
+            return False
+        if self.metric == "mean" and len(self._values(rows)) < 2:
+            # One value gives a zero-width interval
+            return False
+        low, high = self.interval(rows)
+        return bool(high - low <= self.width)
+
+
+def run_sequential(cells: Sequence[Hashable],
+                   submit: Callable[[Hashable, int], Future],
+                   rule: StoppingRule,
+                   max_in_flight: int = 1,
+                   on_result: Callable[[Hashable, Dict[str, Any]], None] = None) -> Dict[Hashable, List[Dict[str, Any]]]:
+    """
+    Run trials cell by cell until each cell's stopping rule is met.
+
+    New trials always go to the unfinished cell with the fewest trials
+    started, so compute is spread over the cells that are still
+    uncertain. A cell's rule is checked on its trials in index order, and
+    trials past the stopping point are cancelled or discarded, so which
+    trials are kept does not depend on scheduling (trial i of a cell
+    should be seeded by i).
+
+    Args:
+        cells: Cell keys, e.g. (map, planner, controller)
+        submit: submit(cell, index) -> Future of the trial's result row
+        rule: Stopping rule
+        max_in_flight: Trials running at once (about 2x the worker count
+            keeps a pool busy)
+        on_result: Called with (cell, row) for every completed trial
+
+    Returns:
+        Dictionary cell -> kept result rows, in trial order
+    """
+    kept: Dict[Hashable, List[Dict[str, Any]]] = {cell: [] for cell in cells}
+    arrived: Dict[Hashable, Dict[int, Dict[str, Any]]] = {cell: {} for cell in cells}
+    started = {cell: 0 for cell in cells}
+    done = {cell: False for cell in cells}
+    pending: Dict[Future, tuple] = {}
+
+    def fill():
+        while len(pending) < max_in_flight:
+            open_cells = [c for c in cells if not done[c] and started[c] < rule.max_trials]
+            if not open_cells:
+                return
+            cell = min(open_cells, key=lambda c: started[c])
+            pending[submit(cell, started[cell])] = (cell, started[cell])
+            started[cell] += 1
+
+    fill()
+    while pending:
+        finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        for future in finished:
+            cell, index = pending.pop(future)
+            if future.cancelled() or done[cell]:
+                continue
+            row = future.result()
+            if on_result is not None:
+                on_result(cell, row)
+            arrived[cell][index] = row
+
+            # Extend the in-order prefix, checking the rule at each length
+            while not done[cell] and len(kept[cell]) in arrived[cell]:
+                kept[cell].append(arrived[cell].pop(len(kept[cell])))
+                done[cell] = rule.is_done(kept[cell])
+            if done[cell]:
+                arrived[cell].clear()
+                for other, (other_cell, _) in list(pending.items()):
+                    if other_cell == cell and other.cancel():
+                        pending.pop(other)
+        fill()
+    return kept
+
+
+def completed_future(fn: Callable, *args) -> Future:
+    """Run fn(*args) now and wrap the result in a Future (serial run_sequential)."""
+    future = Future()
+    future.set_result(fn(*args))
+    return future
@@ -0,0 +1,77 @@
+import numpy as np
+from statistics import NormalDist
+from typing import Sequence, Tuple
+
+
+def _z(confidence: float) -> float:
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(successes: int, n: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """
+    Wilson score interval for a success rate.
+
+    Unlike the normal approximation it stays inside [0, 1] and is not
+    degenerate at 0 or n successes, so it is usable after a few episodes.
+
+    Args:
+        successes: Number of successes
+        n: Number of trials
+        confidence: Two-sided confidence level
+
+    Returns:
+        (low, high); (0, 1) when n == 0
+    """
+    if n <= 0:
+        return 0.0, 1.0
+    z = _z(confidence)
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def mean_interval(values: Sequence[float], confidence: float = 0.95) -> Tuple[float, float, float]:
+    """
+    Student-t confidence interval for a mean.
+
+    Args:
+        values: Samples
+        confidence: Two-sided confidence level
+
+    Returns:
+        (mean, low, high); low = high = mean for fewer than 2 samples
+        (nan for none)
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n == 0:
+        return float("nan"), float("nan"), float("nan")
+    mean = float(values.mean())
+    if n < 2:
+        return mean, mean, mean
+    from scipy.stats import t
+    half = float(t.ppf(0.5 + confidence / 2, n - 1) * values.std(ddof=1) / np.sqrt(n))
+    return mean, mean - half, mean + half
+
+
+def beta_interval(successes: int, n: int, confidence: float = 0.95,
+                  prior: Tuple[float, float] = (1.0, 1.0)) -> Tuple[float, float]:
+    """
+    Bayesian (equal-tailed) credible interval for a success rate.
+
+    Args:
+        successes: Number of successes
+        n: Number of trials
+        confidence: Posterior mass inside the interval
+        prior: Beta prior (alpha, beta); (1, 1) is uniform
+
+    Returns:
+        (low, high)
+    """
+    from scipy.stats import beta
+    a = prior[0] + successes
+    b = prior[1] + max(n - successes, 0)
+    tail = (1 - confidence) / 2
+    return float(beta.ppf(tail, a, b)), float(beta.ppf(1 - tail, a, b))
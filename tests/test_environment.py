@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.learning.environment import AutonomousCarEnv
+from src.core.map import Map2D, RectangleObstacle
+
+
+def wall_map(wall_x: float) -> Map2D:
+    """Start at (10, 50) facing a wall whose left face is at wall_x."""
+    map_env = Map2D(100, 100, 0)
+    map_env.add_obstacle(RectangleObstacle(wall_x + 5, 50, 10, 40, 0))
+    map_env.set_start(10, 50)
+    map_env.set_goal(90, 90)
+    return map_env
+
+
+def drive_until_done(env: AutonomousCarEnv, action=(1.0, 0.0)):
+    env.reset()
+    while True:
+        obs, reward, terminated, truncated, info = env.step(np.array(action))
+        if terminated or truncated:
+            return reward, terminated, info
+
+
+@pytest.mark.parametrize("action_repeat", [2, 4, 8])
+def test_collision_step_returns_terminal_reward(action_repeat):
+    env = AutonomousCarEnv(wall_map(16.0), action_repeat=action_repeat)
+    reward, terminated, info = drive_until_done(env)
+
+    assert terminated
+    assert info['substeps'] > 1  # the collision happened after a repeated update
+    assert reward == -50.0
+
+
+def test_action_repeat_collides_on_same_vehicle_update():
+    steps = []
+    for action_repeat in (1, 3, 8):
+        env = AutonomousCarEnv(wall_map(16.0), action_repeat=action_repeat)
+        drive_until_done(env)
+        steps.append(env.steps)
+    assert len(set(steps)) == 1
@@ -0,0 +1,20 @@
+import pytest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.profiler import Profiler
+
+
+def test_samples_are_bounded_but_totals_exact():
+    profiler = Profiler(enabled=True, window=100)
+    for i in range(1000):
+        profiler.add_sample("step", i * 1e-3)
+
+    assert len(profiler._samples["step"].recent) == 100
+    stats = profiler.stats()["step"]
+    assert stats['count'] == 1000
+    assert stats['total'] == pytest.approx(499.5)
+    assert stats['max'] == pytest.approx(0.999)
+    # percentiles only see the last 100 samples (0.900 .. 0.999)
+    assert stats['p50'] == pytest.approx(0.9495)
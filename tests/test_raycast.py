@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.core.map import Map2D, RectangleObstacle
+
+MAPS = sorted((Path(__file__).parent.parent / "maps" / "yaml").glob("*.yaml"))
+MAX_RANGE = 20.0
+STEP = 0.005
+
+
+def march(hit_fn, origin, angles, max_range=MAX_RANGE, step=STEP):
+    """Brute-force LIDAR: first sample along each ray for which hit_fn is True."""
+    t = np.arange(0.0, max_range + step, step)
+    xs = origin[0] + np.cos(angles)[:, None] * t
+    ys = origin[1] + np.sin(angles)[:, None] * t
+    hit = hit_fn(xs, ys)
+    first = np.where(hit.any(axis=1), hit.argmax(axis=1), len(t) - 1)
+    return np.minimum(t[first], max_range)
+
+
+def grid_hit_fn(map_env, resolution):
+    """Point lookup in the map's occupancy grid (outside the grid = hit)."""
+    grid = map_env.get_occupancy_grid(resolution)
+
+    def hit(xs, ys):
+        ix = np.floor(xs / resolution).astype(int)
+        iy = np.floor(ys / resolution).astype(int)
+        inside = (ix >= 0) & (ix < grid.shape[0]) & (iy >= 0) & (iy < grid.shape[1])
+        result = np.ones(xs.shape, dtype=bool)
+        result[inside] = grid[ix[inside], iy[inside]]
+        return result
+    return hit
+
+
+def free_origins(map_env, n, seed=0):
+    rng = np.random.default_rng(seed)
+    xs = rng.uniform(0, map_env.width, 20 * n)
+    ys = rng.uniform(0, map_env.height, 20 * n)
+    free = ~map_env.is_collision_batch(xs, ys, 0)
+    return np.column_stack([xs, ys])[free][:n]
+
+
+@pytest.fixture
+def square_map():
+    # Corners at (30, 30), (40, 30), (40, 40), (30, 40)
+    map_env = Map2D(100, 100, 0)
+    map_env.add_obstacle(RectangleObstacle(35, 35, 10, 10, 0))
+    return map_env
+
+
+@pytest.mark.parametrize("map_file", MAPS, ids=lambda p: p.stem)
+def test_exact_matches_march(map_file):
+    map_env = Map2D.load_from_yaml(str(map_file))
+    angles = np.linspace(0, 2 * np.pi, 48, endpoint=False)
+    hit_fn = lambda xs, ys: map_env.is_collision_batch(xs, ys, 0)
+
+    for origin in free_origins(map_env, 8):
+        expected = march(hit_fn, origin, angles)
+        actual = map_env.raycast(origin, angles, MAX_RANGE, method="exact")
+        np.testing.assert_allclose(actual, expected, atol=STEP + 1e-9)
+
+
+@pytest.mark.parametrize("resolution", [0.5, 0.37])
+@pytest.mark.parametrize("map_file", MAPS, ids=lambda p: p.stem)
+def test_grid_matches_march_over_grid(map_file, resolution):
+    # The DDA must traverse the occupancy grid exactly; the grid itself
+    # approximates the geometry only to within a cell
+    map_env = Map2D.load_from_yaml(str(map_file))
+    angles = np.linspace(0, 2 * np.pi, 48, endpoint=False)
+    hit_fn = grid_hit_fn(map_env, resolution)
+
+    for origin in free_origins(map_env, 8):
+        expected = march(hit_fn, origin, angles)
+        actual = map_env.raycast(origin, angles, MAX_RANGE, method="grid", resolution=resolution)
+        np.testing.assert_allclose(actual, expected, atol=STEP + 1e-9)
+
+
+def test_batched_origins_match_single(square_map):
+    origins = free_origins(square_map, 5)
+    angles = np.linspace(0, 2 * np.pi, 16, endpoint=False)
+    for method in ("exact", "grid"):
+        batch = square_map.raycast(origins, angles, MAX_RANGE, method=method)
+        single = np.array([square_map.raycast(o, angles, MAX_RANGE, method=method) for o in origins])
+        np.testing.assert_array_equal(batch, single)
+
+
+def test_corner_graze(square_map):
+    # The line x + y = 60 touches the square only at its corner (30, 30)
+    origin = np.array([20.0, 40.0])
+    graze = -np.pi / 4
+    corner_distance = 10 * np.sqrt(2)
+    hit_fn = lambda xs, ys: square_map.is_collision_batch(xs, ys, 0)
+
+    # A ray exactly through the corner counts as a hit
+    assert square_map.raycast(origin, np.array([graze]), 50.0)[0] == pytest.approx(corner_distance)
+
+    # Slightly into the square: hit just before the corner; slightly away: miss
+    angles = np.array([graze + 1e-3, graze - 1e-3])
+    expected = march(hit_fn, origin, angles, max_range=50.0)
+    actual = square_map.raycast(origin, angles, 50.0, method="exact")
+    np.testing.assert_allclose(actual, expected, atol=STEP + 1e-9)
+    assert actual[0] < corner_distance
+    assert actual[1] == 50.0
+
+
+def test_ray_along_edge_hits_corner(square_map):
+    # Collinear with the bottom edge: stops at the corner (30, 30)
+    distance = square_map.raycast(np.array([20.0, 30.0]), np.array([0.0]), 50.0)
+    assert distance[0] == pytest.approx(10.0)
+
+
+@pytest.mark.parametrize("method", ["exact", "grid"])
+def test_origin_inside_obstacle(square_map, method):
+    angles = np.linspace(0, 2 * np.pi, 8, endpoint=False)
+    origins = np.array([[35.0, 35.0], [31.0, 39.0], [-1.0, 50.0], [50.0, 50.0]])
+    distances = square_map.raycast(origins, angles, MAX_RANGE, method=method)
+    np.testing.assert_array_equal(distances[:3], 0.0)
+    assert (distances[3] > 0).all()
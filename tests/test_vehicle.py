@@ -0,0 +1,29 @@
+import numpy as np
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.core.vehicle import Vehicle, integrate_bicycle
+
+
+def test_scalar_euler_matches_integrate_bicycle():
+    # Vehicle.update takes a math-module fast path for euler / 1 substep
+    rng = np.random.default_rng(0)
+    vehicle = Vehicle()
+    config = vehicle.config
+    vehicle.reset(10.0, 20.0, 0.3)
+
+    for _ in range(2000):
+        acceleration, steering = rng.uniform(-5, 5), rng.uniform(-1, 1)
+        state = vehicle.state
+        expected = integrate_bicycle(
+            state.x, state.y, state.theta, state.velocity,
+            np.clip(acceleration, config.max_deceleration, config.max_acceleration),
+            np.clip(steering, -config.max_steering_angle, config.max_steering_angle),
+            dt=vehicle.dt, wheelbase=config.wheelbase,
+            min_velocity=-config.max_velocity / 2.0, max_velocity=config.max_velocity
+        )
+        vehicle.update(acceleration, steering)
+        actual = (vehicle.state.x, vehicle.state.y, vehicle.state.theta, vehicle.state.velocity)
+        np.testing.assert_allclose(actual, np.array(expected, dtype=float), rtol=0, atol=1e-12)
+        assert abs(vehicle.state.steering_angle) <= config.max_steering_angle